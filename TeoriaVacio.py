@@ -1,1277 +1,757 @@
+"""Simulaciones de la teoría estructural del vacío desde ε₀.
+
+Importar este módulo no dibuja nada: cada figura se construye con su
+función `crear_<nombre>()` y matplotlib se carga solo en ese momento. Los
+cálculos viven en el paquete `vacio`, que depende únicamente de numpy.
+Ejecutado como script muestra todas las figuras en orden.
+"""
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-
-# Parámetros estructurales
-A = np.radians(30)   # Ángulo de salida (grados → radianes)
-S = 3                # Número de giros (spin estructural)
-W = 2 * np.pi        # Fase (ciclo completo)
-B = 0.2              # Torsión helicoidal (apertura vertical)
-
-# Eje angular para simular el tiempo de proyección
-theta = np.linspace(0, S * 2 * np.pi, 1000)
-
-# Ecuaciones paramétricas para la hélice proyectiva
-x = np.cos(theta + W) * np.cos(A)
-y = np.sin(theta + W) * np.cos(A)
-z = B * theta  # torsión vertical
-
-# Visualización 3D
-fig = plt.figure()
-ax = fig.add_subplot(111, projection='3d')
-ax.plot(x, y, z, color='blue', label="Proyección desde ε₀")
-ax.set_title("Estructura helicoidal proyectiva")
-ax.set_xlabel("X (fase)")
-ax.set_ylabel("Y (giro)")
-ax.set_zlabel("Z (torsión)")
-ax.legend()
-plt.show()
-
-# Visualización interactiva con sliders para proyección helicoidal
-from matplotlib.widgets import Slider
-
-fig_interact1 = plt.figure()
-ax_interact1 = fig_interact1.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales específicos de esa simulación
-A0_1, S0_1, W0_1, B0_1 = np.radians(30), 3, 0, 0.2
-
-def actualizar1(val):
-    ax_interact1.cla()
-    A = slider_A1.val
-    S = slider_S1.val
-    W = slider_W1.val
-    B = slider_B1.val
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-    ax_interact1.plot(x, y, z, color='blue')
-    ax_interact1.set_xlim([-1.5, 1.5])
-    ax_interact1.set_ylim([-1.5, 1.5])
-    ax_interact1.set_zlim([0, 3 * np.pi])
-    ax_interact1.set_title("Proyección estructural interactiva")
-    fig_interact1.canvas.draw_idle()
-
-# Controles
-axcolor = 'lightgoldenrodyellow'
-ax_A1 = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor=axcolor)
-ax_S1 = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor=axcolor)
-ax_W1 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor=axcolor)
-ax_B1 = plt.axes([0.25, 0.00, 0.65, 0.03], facecolor=axcolor)
-
-slider_A1 = Slider(ax_A1, 'Ángulo A', 0, np.pi/2, valinit=A0_1)
-slider_S1 = Slider(ax_S1, 'Spin S', 1, 6, valinit=S0_1)
-slider_W1 = Slider(ax_W1, 'Fase W', 0, 2*np.pi, valinit=W0_1)
-slider_B1 = Slider(ax_B1, 'Torsión B', 0.05, 0.5, valinit=B0_1)
-
-slider_A1.on_changed(actualizar1)
-slider_S1.on_changed(actualizar1)
-slider_W1.on_changed(actualizar1)
-slider_B1.on_changed(actualizar1)
-
-actualizar1(None)
-plt.show()
-
-# Simulación de múltiples proyecciones desde ε₀
-parametros = [
-    (np.radians(20), 2, 0, 0.1),
-    (np.radians(45), 4, np.pi/2, 0.3),
-    (np.radians(60), 1.5, np.pi, 0.15),
-    (np.radians(80), 2.5, 3*np.pi/2, 0.25)
-]
-
-fig2 = plt.figure()
-ax2 = fig2.add_subplot(111, projection='3d')
-colores = ['red', 'green', 'purple', 'orange']
-
-for i, (a, s, w, b) in enumerate(parametros):
-    theta = np.linspace(0, s * 2 * np.pi, 1000)
-    x = np.cos(theta + w) * np.cos(a)
-    y = np.sin(theta + w) * np.cos(a)
-    z = b * theta
-    ax2.plot(x, y, z, color=colores[i], label=f"p{i+1}: A={np.degrees(a):.0f}° S={s} B={b}")
-
-ax2.set_title("Múltiples proyecciones desde ε₀")
-ax2.set_xlabel("X (fase)")
-ax2.set_ylabel("Y (giro)")
-ax2.set_zlabel("Z (torsión)")
-ax2.legend()
-plt.show()
-
-# Visualización interactiva con sliders para múltiples proyecciones
-from matplotlib.widgets import Slider
-
-fig_interact2 = plt.figure()
-ax_interact2 = fig_interact2.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales: toma el primero de la lista
-A0_2, S0_2, W0_2, B0_2 = parametros[0]
-
-def actualizar2(val):
-    ax_interact2.cla()
-    A = slider_A2.val
-    S = slider_S2.val
-    W = slider_W2.val
-    B = slider_B2.val
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-    ax_interact2.plot(x, y, z, color='blue')
-    ax_interact2.set_xlim([-1.5, 1.5])
-    ax_interact2.set_ylim([-1.5, 1.5])
-    ax_interact2.set_zlim([0, 3 * np.pi])
-    ax_interact2.set_title("Simulación interactiva de múltiples proyecciones")
-    fig_interact2.canvas.draw_idle()
-
-# Controles
-ax_A2 = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_S2 = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_W2 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_B2 = plt.axes([0.25, 0.00, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_A2 = Slider(ax_A2, 'Ángulo A', 0, np.pi/2, valinit=A0_2)
-slider_S2 = Slider(ax_S2, 'Spin S', 1, 6, valinit=S0_2)
-slider_W2 = Slider(ax_W2, 'Fase W', 0, 2*np.pi, valinit=W0_2)
-slider_B2 = Slider(ax_B2, 'Torsión B', 0.05, 0.5, valinit=B0_2)
-
-slider_A2.on_changed(actualizar2)
-slider_S2.on_changed(actualizar2)
-slider_W2.on_changed(actualizar2)
-slider_B2.on_changed(actualizar2)
-
-actualizar2(None)
-plt.show()
-
-# Simulación de acoplamiento estructural entre dos proyecciones
-from mpl_toolkits.mplot3d.art3d import juggle_axes
-
-# Parámetros de dos partículas
-a1, s1, w1, b1 = np.radians(30), 3, 0, 0.2
-a2, s2, w2, b2 = np.radians(60), 2, np.pi/2, 0.2
-
-theta = np.linspace(0, 4 * np.pi, 1000)
-x1 = np.cos(theta + w1) * np.cos(a1)
-y1 = np.sin(theta + w1) * np.cos(a1)
-z1 = b1 * theta
-
-x2 = np.cos(theta + w2) * np.cos(a2)
-y2 = np.sin(theta + w2) * np.cos(a2)
-z2 = b2 * theta
-
-# Calcular distancias entre puntos de ambas trayectorias
-distancias = np.sqrt((x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2)
-indice_min = np.argmin(distancias)
-
-# Punto de acoplamiento
-x_acop, y_acop, z_acop = (x1[indice_min] + x2[indice_min]) / 2, (y1[indice_min] + y2[indice_min]) / 2, (z1[indice_min] + z2[indice_min]) / 2
-
-# Graficar ambas trayectorias y el punto de acoplamiento
-fig3 = plt.figure()
-ax3 = fig3.add_subplot(111, projection='3d')
-ax3.plot(x1, y1, z1, label='Proyección 1', color='blue')
-ax3.plot(x2, y2, z2, label='Proyección 2', color='red')
-ax3.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Acoplamiento')
-
-ax3.set_title("Simulación de acoplamiento estructural")
-ax3.set_xlabel("X")
-ax3.set_ylabel("Y")
-ax3.set_zlabel("Z")
-ax3.legend()
-plt.show()
-
-# Visualización interactiva con sliders para acoplamiento estructural
-from matplotlib.widgets import Slider
-
-fig_interact3 = plt.figure()
-ax_interact3 = fig_interact3.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-A0_3, S0_3, W0_3, B0_3 = np.radians(30), 3, 0, 0.2
-A1_3, S1_3, W1_3, B1_3 = np.radians(60), 2, np.pi/2, 0.2
-
-def actualizar3(val):
-    ax_interact3.cla()
-    A1 = slider_A3.val
-    S1 = slider_S3.val
-    W1 = slider_W3.val
-    B1 = slider_B3.val
-    A2 = slider_A3b.val
-    S2 = slider_S3b.val
-    W2 = slider_W3b.val
-    B2 = slider_B3b.val
-    theta = np.linspace(0, 4 * np.pi, 1000)
-    x1 = np.cos(theta + W1) * np.cos(A1)
-    y1 = np.sin(theta + W1) * np.cos(A1)
-    z1 = B1 * theta
-    x2 = np.cos(theta + W2) * np.cos(A2)
-    y2 = np.sin(theta + W2) * np.cos(A2)
-    z2 = B2 * theta
-    distancias = np.sqrt((x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2)
-    indice_min = np.argmin(distancias)
-    x_acop, y_acop, z_acop = (x1[indice_min] + x2[indice_min]) / 2, (y1[indice_min] + y2[indice_min]) / 2, (z1[indice_min] + z2[indice_min]) / 2
-    ax_interact3.plot(x1, y1, z1, label='Proyección 1', color='blue')
-    ax_interact3.plot(x2, y2, z2, label='Proyección 2', color='red')
-    ax_interact3.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Acoplamiento')
-    ax_interact3.set_xlim([-2, 2])
-    ax_interact3.set_ylim([-2, 2])
-    ax_interact3.set_zlim([0, 4 * np.pi * 0.5])
-    ax_interact3.set_title("Acoplamiento estructural interactivo")
-    ax_interact3.legend()
-    fig_interact3.canvas.draw_idle()
-
-# Controles
-ax_A3 = plt.axes([0.25, 0.20, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S3 = plt.axes([0.25, 0.17, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_W3 = plt.axes([0.25, 0.14, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_B3 = plt.axes([0.25, 0.11, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_A3b = plt.axes([0.60, 0.20, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S3b = plt.axes([0.60, 0.17, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_W3b = plt.axes([0.60, 0.14, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_B3b = plt.axes([0.60, 0.11, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-
-slider_A3 = Slider(ax_A3, 'Ángulo A1', 0, np.pi/2, valinit=A0_3)
-slider_S3 = Slider(ax_S3, 'Spin S1', 1, 6, valinit=S0_3)
-slider_W3 = Slider(ax_W3, 'Fase W1', 0, 2*np.pi, valinit=W0_3)
-slider_B3 = Slider(ax_B3, 'Torsión B1', 0.05, 0.5, valinit=B0_3)
-slider_A3b = Slider(ax_A3b, 'Ángulo A2', 0, np.pi/2, valinit=A1_3)
-slider_S3b = Slider(ax_S3b, 'Spin S2', 1, 6, valinit=S1_3)
-slider_W3b = Slider(ax_W3b, 'Fase W2', 0, 2*np.pi, valinit=W1_3)
-slider_B3b = Slider(ax_B3b, 'Torsión B2', 0.05, 0.5, valinit=B1_3)
-
-slider_A3.on_changed(actualizar3)
-slider_S3.on_changed(actualizar3)
-slider_W3.on_changed(actualizar3)
-slider_B3.on_changed(actualizar3)
-slider_A3b.on_changed(actualizar3)
-slider_S3b.on_changed(actualizar3)
-slider_W3b.on_changed(actualizar3)
-slider_B3b.on_changed(actualizar3)
-
-actualizar3(None)
-plt.show()
-
-# Simulación de trayectoria modificada posterior al acoplamiento
-# Supongamos que la partícula 1 cambia su torsión (B) después de acoplarse
-
-# Nueva torsión estructural después del acoplamiento
-B_modificado = 0.35
-theta_post = np.linspace(0, 2 * np.pi, 1000)
-
-# Traza modificada desde el punto de acoplamiento
-x_mod = np.cos(theta_post + w1) * np.cos(a1) + x_acop
-y_mod = np.sin(theta_post + w1) * np.cos(a1) + y_acop
-z_mod = B_modificado * theta_post + z_acop
-
-# Visualización
-fig4 = plt.figure()
-ax4 = fig4.add_subplot(111, projection='3d')
-ax4.plot(x1, y1, z1, '--', color='blue', alpha=0.5, label='Proyección original')
-ax4.plot(x_mod, y_mod, z_mod, color='cyan', label='Trayectoria modificada')
-ax4.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Acoplamiento')
-
-ax4.set_title("Modificación estructural posterior al acoplamiento")
-ax4.set_xlabel("X")
-ax4.set_ylabel("Y")
-ax4.set_zlabel("Z")
-ax4.legend()
-plt.show()
-
-# Visualización interactiva con sliders para modificación estructural posterior al acoplamiento
-from matplotlib.widgets import Slider
-
-fig_interact4 = plt.figure()
-ax_interact4 = fig_interact4.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-A0_4, S0_4, W0_4, B0_4 = a1, 3, w1, 0.2
-Bmod_4 = 0.35
-
-def actualizar4(val):
-    ax_interact4.cla()
-    A = slider_A4.val
-    S = slider_S4.val
-    W = slider_W4.val
-    B = slider_B4.val
-    Bmod = slider_Bmod4.val
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
+
+from vacio import (
+    eje_angular,
+    helice_proyectiva,
+    helices_proyectivas,
+    helice_real,
+    rotacion_doble,
+    trayectoria_modificada,
+    parametros_aleatorios,
+    parametros_dispersion,
+    ramas_dispersion,
+    helice_parametrica,
+    acoplamiento_exacto,
+    red_acoplamientos,
+    SuperficieCampo,
+    hbar_estructural,
+    energia_estructural,
+    lagrangiano_direccional,
+    lagrangiano_estructural,
+    calcular_derivadas,
+    EstadoSimulacion,
+    derivadas_rotacion_doble,
+    eje_adaptativo,
+)
+from vacio.graficos import (
+    RedibujoRapido,
+    curvas_decimadas,
+    escala_pantalla,
+    limitar,
+    linea_coloreada,
+    mover_puntos,
+)
+from vacio.lagrangiano import T_D
+from vacio.memoria import memorizar
+from vacio.perfil import perfilar
+
+# Estado por defecto de la simulación; cada figura puede recibir otro
+ESTADO = EstadoSimulacion()
+
+COLOR_CONTROL = 'lightgoldenrodyellow'
+
+# Intervalo mínimo (s) entre dos redibujos provocados por los sliders
+INTERVALO_REFRESCO = 1 / 30
+
+# Tolerancia relativa de los resultados memorizados para los sliders, por
+# debajo de la resolución de un slider
+TOLERANCIA_CACHE = 1e-4
+_acoplamiento = memorizar(acoplamiento_exacto, tolerancia=TOLERANCIA_CACHE, max_entradas=256)
+_derivadas = memorizar(calcular_derivadas, tolerancia=TOLERANCIA_CACHE)
+
+
+def _figura_3d(**kwargs):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(**kwargs)
+    return fig, fig.add_subplot(111, projection='3d')
+
+
+def _slider(fig, rect, etiqueta, vmin, vmax, valinit, **kwargs):
+    from matplotlib.widgets import Slider
+    eje = fig.add_axes(rect, facecolor=COLOR_CONTROL)
+    return Slider(eje, etiqueta, vmin, vmax, valinit=valinit, **kwargs)
+
+
+def _conectar(fig, nombre, sliders, actualizar, redibujo=None):
+    # Los sliders solo se referencian débilmente desde el canvas
+    fig.sliders = sliders
+    # Con el perfil activo cada callback cuenta como la etapa '<nombre>.actualizar'
+    # (el nombre de FIGURAS: varias figuras comparten el mismo `actualizar`)
+    actualizar = perfilar(f"{nombre}.actualizar")(actualizar)
+    callback = limitar(fig.canvas, actualizar, INTERVALO_REFRESCO)
+    for slider in sliders:
+        # El redibujo lo decide `actualizar`, no cada slider por su cuenta
+        slider.drawon = False
+        slider.on_changed(callback)
+    if redibujo is not None:
+        redibujo.controles.extend(slider.ax for slider in sliders)
+    actualizar(None)
+    return fig
+
+
+def _estado(estado):
+    return ESTADO if estado is None else estado
+
+
+def _etiquetar(ax, titulo, xlabel="X", ylabel="Y", zlabel="Z"):
+    ax.set_title(titulo)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_zlabel(zlabel)
+
+
+def crear_fig(estado=None):
+    # Visualización 3D de la hélice proyectiva
+    estado = _estado(estado)
+    fig, ax = _figura_3d()
+    x, y, z = helices_proyectivas([(estado.A, estado.S, estado.W, estado.B)])[0].T
+    ax.plot(x, y, z, color='blue', label="Proyección desde ε₀")
+    _etiquetar(ax, "Estructura helicoidal proyectiva", "X (fase)", "Y (giro)", "Z (torsión)")
+    ax.legend()
+    return fig
+
+
+def _crear_proyeccion_interactiva(nombre, valores, titulo, limites):
+    # Proyección helicoidal controlada por sliders (A, S, W, B)
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    A0, S0, W0, B0 = valores
+    xlim, zlim = limites
+    linea, = ax.plot([], [], [], color='blue')
+    ax.set_xlim(xlim)
+    ax.set_ylim(xlim)
+    ax.set_zlim(zlim)
+    ax.set_title(titulo)
+    redibujo = RedibujoRapido(fig, [linea])
+
+    def actualizar(val):
+        params = [(slider_A.val, slider_S.val, slider_W.val, slider_B.val)]
+        linea.set_data_3d(*helices_proyectivas(params)[0].T)
+        redibujo.actualizar()
+
+    slider_A = _slider(fig, [0.25, 0.15, 0.65, 0.03], 'Ángulo A', 0, np.pi/2, A0)
+    slider_S = _slider(fig, [0.25, 0.10, 0.65, 0.03], 'Spin S', 1, 6, S0)
+    slider_W = _slider(fig, [0.25, 0.05, 0.65, 0.03], 'Fase W', 0, 2*np.pi, W0)
+    slider_B = _slider(fig, [0.25, 0.00, 0.65, 0.03], 'Torsión B', 0.05, 0.5, B0)
+    return _conectar(fig, nombre, [slider_A, slider_S, slider_W, slider_B], actualizar, redibujo)
+
+
+def crear_fig_interact1(estado=None):
+    return _crear_proyeccion_interactiva(
+        'fig_interact1',
+        (np.radians(30), 3, 0, 0.2), "Proyección estructural interactiva",
+        ([-1.5, 1.5], [0, 3 * np.pi]))
+
+
+def crear_fig2(estado=None):
+    parametros = _estado(estado).parametros
+    fig, ax = _figura_3d()
+    colores = ['red', 'green', 'purple', 'orange']
+    helices = helices_proyectivas(parametros)
+    for i, (a, s, w, b) in enumerate(parametros):
+        ax.plot(*helices[i].T, color=colores[i], label=f"p{i+1}: A={np.degrees(a):.0f}° S={s} B={b}")
+    _etiquetar(ax, "Múltiples proyecciones desde ε₀", "X (fase)", "Y (giro)", "Z (torsión)")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact2(estado=None):
+    # Valores iniciales: toma el primero de la lista
+    return _crear_proyeccion_interactiva(
+        'fig_interact2',
+        _estado(estado).parametros[0], "Simulación interactiva de múltiples proyecciones",
+        ([-1.5, 1.5], [0, 3 * np.pi]))
+
+
+def crear_fig3(estado=None):
+    # Graficar ambas trayectorias y el punto de acoplamiento
+    acoplamiento = _estado(estado).acoplamiento
+    fig, ax = _figura_3d()
+    ax.plot(*acoplamiento.curva1, label='Proyección 1', color='blue')
+    ax.plot(*acoplamiento.curva2, label='Proyección 2', color='red')
+    ax.scatter(*acoplamiento.punto, color='black', s=60, label='Acoplamiento')
+    _etiquetar(ax, "Simulación de acoplamiento estructural")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact3(estado=None):
+    estado = _estado(estado)
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    linea1, = ax.plot([], [], [], label='Proyección 1', color='blue')
+    linea2, = ax.plot([], [], [], label='Proyección 2', color='red')
+    acople = ax.scatter([], [], [], color='black', s=60, label='Acoplamiento')
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([0, 4 * np.pi * 0.5])
+    ax.set_title("Acoplamiento estructural interactivo")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, [linea1, linea2, acople])
+
+    def actualizar(val):
+        theta = np.linspace(0, 4 * np.pi, 1000)
+        A1, W1, B1 = slider_A3.val, slider_W3.val, slider_B3.val
+        A2, W2, B2 = slider_A3b.val, slider_W3b.val, slider_B3b.val
+        _, _, _, punto = _acoplamiento(helice_parametrica(np.cos(A1), W1, B1, theta[-1]),
+                                       helice_parametrica(np.cos(A2), W2, B2, theta[-1]))
+        linea1.set_data_3d(*helice_proyectiva(theta, A1, W1, B1))
+        linea2.set_data_3d(*helice_proyectiva(theta, A2, W2, B2))
+        mover_puntos(acople, *punto)
+        redibujo.actualizar()
+
+    slider_A3 = _slider(fig, [0.25, 0.20, 0.30, 0.02], 'Ángulo A1', 0, np.pi/2, estado.a1)
+    slider_S3 = _slider(fig, [0.25, 0.17, 0.30, 0.02], 'Spin S1', 1, 6, estado.s1)
+    slider_W3 = _slider(fig, [0.25, 0.14, 0.30, 0.02], 'Fase W1', 0, 2*np.pi, estado.w1)
+    slider_B3 = _slider(fig, [0.25, 0.11, 0.30, 0.02], 'Torsión B1', 0.05, 0.5, estado.b1)
+    slider_A3b = _slider(fig, [0.60, 0.20, 0.30, 0.02], 'Ángulo A2', 0, np.pi/2, estado.a2)
+    slider_S3b = _slider(fig, [0.60, 0.17, 0.30, 0.02], 'Spin S2', 1, 6, estado.s2)
+    slider_W3b = _slider(fig, [0.60, 0.14, 0.30, 0.02], 'Fase W2', 0, 2*np.pi, estado.w2)
+    slider_B3b = _slider(fig, [0.60, 0.11, 0.30, 0.02], 'Torsión B2', 0.05, 0.5, estado.b2)
+    return _conectar(fig, 'fig_interact3',
+                     [slider_A3, slider_S3, slider_W3, slider_B3,
+                      slider_A3b, slider_S3b, slider_W3b, slider_B3b],
+                     actualizar, redibujo)
+
+
+def crear_fig4(estado=None):
+    # La partícula 1 cambia su torsión (B) después de acoplarse
+    estado = _estado(estado)
+    acoplamiento = estado.acoplamiento
+    fig, ax = _figura_3d()
     theta_post = np.linspace(0, 2 * np.pi, 1000)
-    # Trayectoria original
-    x1 = np.cos(theta + W) * np.cos(A)
-    y1 = np.sin(theta + W) * np.cos(A)
-    z1 = B * theta
-    # Acoplamiento
-    A2 = a2
-    S2 = 2
-    W2 = w2
-    B2 = 0.2
-    x2 = np.cos(theta + W2) * np.cos(A2)
-    y2 = np.sin(theta + W2) * np.cos(A2)
-    z2 = B2 * theta
-    distancias = np.sqrt((x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2)
-    indice_min = np.argmin(distancias)
-    x_acop = (x1[indice_min] + x2[indice_min]) / 2
-    y_acop = (y1[indice_min] + y2[indice_min]) / 2
-    z_acop = (z1[indice_min] + z2[indice_min]) / 2
-    # Trayectoria modificada
-    x_mod = np.cos(theta_post + W) * np.cos(A) + x_acop
-    y_mod = np.sin(theta_post + W) * np.cos(A) + y_acop
-    z_mod = Bmod * theta_post + z_acop
-    ax_interact4.plot(x1, y1, z1, '--', color='blue', alpha=0.5, label='Proyección original')
-    ax_interact4.plot(x_mod, y_mod, z_mod, color='cyan', label='Trayectoria modificada')
-    ax_interact4.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Acoplamiento')
-    ax_interact4.set_xlim([-2, 2])
-    ax_interact4.set_ylim([-2, 2])
-    ax_interact4.set_zlim([0, 4 * np.pi * 0.5])
-    ax_interact4.set_title("Modificación estructural interactiva")
-    ax_interact4.legend()
-    fig_interact4.canvas.draw_idle()
-
-# Controles
-ax_A4 = plt.axes([0.25, 0.15, 0.65, 0.02], facecolor='lightgoldenrodyellow')
-ax_S4 = plt.axes([0.25, 0.12, 0.65, 0.02], facecolor='lightgoldenrodyellow')
-ax_W4 = plt.axes([0.25, 0.09, 0.65, 0.02], facecolor='lightgoldenrodyellow')
-ax_B4 = plt.axes([0.25, 0.06, 0.65, 0.02], facecolor='lightgoldenrodyellow')
-ax_Bmod4 = plt.axes([0.25, 0.03, 0.65, 0.02], facecolor='lightgoldenrodyellow')
-
-slider_A4 = Slider(ax_A4, 'Ángulo A', 0, np.pi/2, valinit=A0_4)
-slider_S4 = Slider(ax_S4, 'Spin S', 1, 6, valinit=S0_4)
-slider_W4 = Slider(ax_W4, 'Fase W', 0, 2*np.pi, valinit=W0_4)
-slider_B4 = Slider(ax_B4, 'Torsión B', 0.05, 0.5, valinit=B0_4)
-slider_Bmod4 = Slider(ax_Bmod4, 'Torsión Modificada', 0.05, 0.5, valinit=Bmod_4)
-
-slider_A4.on_changed(actualizar4)
-slider_S4.on_changed(actualizar4)
-slider_W4.on_changed(actualizar4)
-slider_B4.on_changed(actualizar4)
-slider_Bmod4.on_changed(actualizar4)
-
-actualizar4(None)
-plt.show()
-
-# Simulación de espacio proyectivo completo desde ε₀
-num_particulas = 12
-fig5 = plt.figure()
-ax5 = fig5.add_subplot(111, projection='3d')
-
-np.random.seed(42)  # reproducibilidad
-
-for i in range(num_particulas):
-    A = np.radians(np.random.uniform(10, 80))     # ángulo de salida
-    S = np.random.uniform(1, 4)                    # spin (giros)
-    W = np.random.uniform(0, 2 * np.pi)            # fase
-    B = np.random.uniform(0.1, 0.35)               # torsión helicoidal
-    color = plt.cm.viridis(i / num_particulas)    # color distinto
-
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-
-    ax5.plot(x, y, z, color=color, alpha=0.7)
-
-ax5.set_title("Espacio proyectivo estructurado desde ε₀")
-ax5.set_xlabel("X")
-ax5.set_ylabel("Y")
-ax5.set_zlabel("Z")
-plt.show()
-
-# Visualización interactiva con sliders para espacio proyectivo estructurado
-from matplotlib.widgets import Slider
-
-fig_interact5 = plt.figure()
-ax_interact5 = fig_interact5.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-A0_5, S0_5, W0_5, B0_5 = np.radians(45), 2.5, 0, 0.2
-
-def actualizar5(val):
-    ax_interact5.cla()
-    A = slider_A5.val
-    S = slider_S5.val
-    W = slider_W5.val
-    B = slider_B5.val
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-    ax_interact5.plot(x, y, z, color='blue')
-    ax_interact5.set_xlim([-1.5, 1.5])
-    ax_interact5.set_ylim([-1.5, 1.5])
-    ax_interact5.set_zlim([0, 3 * np.pi])
-    ax_interact5.set_title("Espacio proyectivo interactivo")
-    fig_interact5.canvas.draw_idle()
-
-# Controles
-ax_A5 = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_S5 = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_W5 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_B5 = plt.axes([0.25, 0.00, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_A5 = Slider(ax_A5, 'Ángulo A', 0, np.pi/2, valinit=A0_5)
-slider_S5 = Slider(ax_S5, 'Spin S', 1, 6, valinit=S0_5)
-slider_W5 = Slider(ax_W5, 'Fase W', 0, 2*np.pi, valinit=W0_5)
-slider_B5 = Slider(ax_B5, 'Torsión B', 0.05, 0.5, valinit=B0_5)
-
-slider_A5.on_changed(actualizar5)
-slider_S5.on_changed(actualizar5)
-slider_W5.on_changed(actualizar5)
-slider_B5.on_changed(actualizar5)
-
-actualizar5(None)
-plt.show()
-
-# Visualización estructural radial desde ε₀ (forma proyectiva real)
-fig6 = plt.figure()
-ax6 = fig6.add_subplot(111, projection='3d')
-
-# Ángulos esféricos
-phi = np.linspace(0, np.pi, 60)       # inclinación (0: polo norte, π: sur)
-theta = np.linspace(0, 2 * np.pi, 60) # azimut (0 → 2π)
-phi, theta = np.meshgrid(phi, theta)
-
-# Parámetros de deformación estructural
-torsion = 0.3 * np.sin(3 * phi)       # simula oscilaciones de presión/torsión
-spin_mod = 0.2 * np.cos(2 * theta)    # simula variación por giro proyectado
-
-# Radio proyectivo: unidad + variación estructural
-R = 1 + torsion + spin_mod
-
-# Coordenadas proyectadas desde el centro
-X = R * np.sin(phi) * np.cos(theta)
-Y = R * np.sin(phi) * np.sin(theta)
-Z = R * np.cos(phi)
-
-ax6.plot_surface(X, Y, Z, cmap='viridis', alpha=0.85, edgecolor='k', linewidth=0.3)
-ax6.set_title("Campo estructural proyectivo desde ε₀ (visualización radial)")
-ax6.set_xlabel("X")
-ax6.set_ylabel("Y")
-ax6.set_zlabel("Z")
-
-# Visualización interactiva con sliders para campo estructural radial
-from matplotlib.widgets import Slider
-
-fig_interact6 = plt.figure()
-ax_interact6 = fig_interact6.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-Torsion0_6, Spinmod0_6 = 0.3, 0.2
-
-def actualizar6(val):
-    ax_interact6.cla()
-    torsion_amp = slider_Torsion6.val
-    spinmod_amp = slider_Spinmod6.val
-    phi = np.linspace(0, np.pi, 60)
-    theta = np.linspace(0, 2 * np.pi, 60)
-    phi, theta = np.meshgrid(phi, theta)
-    torsion = torsion_amp * np.sin(3 * phi)
-    spin_mod = spinmod_amp * np.cos(2 * theta)
-    R = 1 + torsion + spin_mod
-    X = R * np.sin(phi) * np.cos(theta)
-    Y = R * np.sin(phi) * np.sin(theta)
-    Z = R * np.cos(phi)
-    ax_interact6.plot_surface(X, Y, Z, cmap='viridis', alpha=0.85, edgecolor='k', linewidth=0.3)
-    ax_interact6.set_xlim([-2, 2])
-    ax_interact6.set_ylim([-2, 2])
-    ax_interact6.set_zlim([-2, 2])
-    ax_interact6.set_title("Campo estructural radial interactivo")
-    fig_interact6.canvas.draw_idle()
-
-# Controles
-ax_Torsion6 = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_Spinmod6 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_Torsion6 = Slider(ax_Torsion6, 'Torsión', 0.05, 0.5, valinit=Torsion0_6)
-slider_Spinmod6 = Slider(ax_Spinmod6, 'Spin Mod', 0.05, 0.5, valinit=Spinmod0_6)
-
-slider_Torsion6.on_changed(actualizar6)
-slider_Spinmod6.on_changed(actualizar6)
-
-actualizar6(None)
-plt.show()
-
- # Simulación de dispersión estructural posterior al acoplamiento
-fig7 = plt.figure()
-ax7 = fig7.add_subplot(111, projection='3d')
-
-# Parámetros originales en el punto de acoplamiento
-A1_new = a1 + np.radians(10)
-A2_new = a2 - np.radians(15)
-B1_new = 0.4
-B2_new = 0.25
-S1_new = 2.5
-S2_new = 3
-
-theta_disp = np.linspace(0, 2 * np.pi, 1000)
-
-# Trayectorias dispersas desde el punto de acoplamiento
-x1_disp = np.cos(theta_disp + w1) * np.cos(A1_new) + x_acop
-y1_disp = np.sin(theta_disp + w1) * np.cos(A1_new) + y_acop
-z1_disp = B1_new * theta_disp + z_acop
-
-x2_disp = np.cos(theta_disp + w2) * np.cos(A2_new) + x_acop
-y2_disp = np.sin(theta_disp + w2) * np.cos(A2_new) + y_acop
-z2_disp = B2_new * theta_disp + z_acop
-
-# Visualización
-ax7.plot(x1_disp, y1_disp, z1_disp, color='darkblue', label='Dispersión p1')
-ax7.plot(x2_disp, y2_disp, z2_disp, color='darkred', label='Dispersión p2')
-ax7.scatter(x_acop, y_acop, z_acop, color='black', s=50, label='Punto de acoplamiento')
-
-ax7.set_title("Dispersión estructural posterior al acoplamiento")
-ax7.set_xlabel("X")
-ax7.set_ylabel("Y")
-ax7.set_zlabel("Z")
-ax7.legend()
-plt.show()
-
-# Visualización interactiva con sliders para dispersión estructural posterior al acoplamiento
-from matplotlib.widgets import Slider
-
-fig_interact7 = plt.figure()
-ax_interact7 = fig_interact7.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-A1n7, A2n7 = A1_new, A2_new
-B1n7, B2n7 = B1_new, B2_new
-S1n7, S2n7 = S1_new, S2_new
-
-def actualizar7(val):
-    ax_interact7.cla()
-    A1 = slider_A1n7.val
-    S1 = slider_S1n7.val
-    B1 = slider_B1n7.val
-    A2 = slider_A2n7.val
-    S2 = slider_S2n7.val
-    B2 = slider_B2n7.val
+    x_mod, y_mod, z_mod = trayectoria_modificada(theta_post, estado.a1, estado.w1,
+                                                 estado.B_modificado, acoplamiento.punto)
+    ax.plot(*acoplamiento.curva1, '--', color='blue', alpha=0.5, label='Proyección original')
+    ax.plot(x_mod, y_mod, z_mod, color='cyan', label='Trayectoria modificada')
+    ax.scatter(*acoplamiento.punto, color='black', s=60, label='Acoplamiento')
+    _etiquetar(ax, "Modificación estructural posterior al acoplamiento")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact4(estado=None):
+    estado = _estado(estado)
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    original, = ax.plot([], [], [], '--', color='blue', alpha=0.5, label='Proyección original')
+    modificada, = ax.plot([], [], [], color='cyan', label='Trayectoria modificada')
+    acople = ax.scatter([], [], [], color='black', s=60, label='Acoplamiento')
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([0, 4 * np.pi * 0.5])
+    ax.set_title("Modificación estructural interactiva")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, [original, modificada, acople])
+
+    def actualizar(val):
+        A, W, B = slider_A4.val, slider_W4.val, slider_B4.val
+        theta = eje_angular(slider_S4.val)
+        theta_post = np.linspace(0, 2 * np.pi, 1000)
+        # Acoplamiento con la segunda partícula fija
+        _, _, _, punto = _acoplamiento(
+            helice_parametrica(np.cos(A), W, B, theta[-1]),
+            helice_parametrica(np.cos(estado.a2), estado.w2, 0.2, theta[-1]))
+        original.set_data_3d(*helice_proyectiva(theta, A, W, B))
+        modificada.set_data_3d(*trayectoria_modificada(theta_post, A, W, slider_Bmod4.val, punto))
+        mover_puntos(acople, *punto)
+        redibujo.actualizar()
+
+    slider_A4 = _slider(fig, [0.25, 0.15, 0.65, 0.02], 'Ángulo A', 0, np.pi/2, estado.a1)
+    slider_S4 = _slider(fig, [0.25, 0.12, 0.65, 0.02], 'Spin S', 1, 6, 3)
+    slider_W4 = _slider(fig, [0.25, 0.09, 0.65, 0.02], 'Fase W', 0, 2*np.pi, estado.w1)
+    slider_B4 = _slider(fig, [0.25, 0.06, 0.65, 0.02], 'Torsión B', 0.05, 0.5, 0.2)
+    slider_Bmod4 = _slider(fig, [0.25, 0.03, 0.65, 0.02], 'Torsión Modificada', 0.05, 0.5,
+                           estado.B_modificado)
+    return _conectar(fig, 'fig_interact4',
+                     [slider_A4, slider_S4, slider_W4, slider_B4, slider_Bmod4],
+                     actualizar, redibujo)
+
+
+def crear_fig5(estado=None):
+    # Espacio proyectivo completo desde ε₀
+    import matplotlib.pyplot as plt
+    fig, ax = _figura_3d()
+    num_particulas = 12
+    helices = helices_proyectivas(parametros_aleatorios(num_particulas, seed=42))
+    for i, helice in enumerate(helices):
+        ax.plot(*helice.T, color=plt.cm.viridis(i / num_particulas), alpha=0.7)
+    _etiquetar(ax, "Espacio proyectivo estructurado desde ε₀")
+    return fig
+
+
+def crear_fig_interact5(estado=None):
+    return _crear_proyeccion_interactiva(
+        'fig_interact5',
+        (np.radians(45), 2.5, 0, 0.2), "Espacio proyectivo interactivo",
+        ([-1.5, 1.5], [0, 3 * np.pi]))
+
+
+def crear_fig6(estado=None):
+    # Visualización estructural radial desde ε₀ (forma proyectiva real)
+    fig, ax = _figura_3d()
+    campo = SuperficieCampo()
+    X, Y, Z = campo.evaluar()
+    ax.plot_surface(X, Y, Z, rstride=1, cstride=1, cmap='viridis', alpha=0.85,
+                    edgecolor='k', linewidth=0.3)
+    _etiquetar(ax, "Campo estructural proyectivo desde ε₀ (visualización radial)")
+    return fig
+
+
+def crear_fig_interact6(estado=None):
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    campo = SuperficieCampo()
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([-2, 2])
+    ax.set_title("Campo estructural radial interactivo")
+    # La malla es fija: cada tick solo recombina las bases y mueve los polígonos
+    superficie = ax.plot_surface(*campo.evaluar(), rstride=1, cstride=1, cmap='viridis',
+                                 alpha=0.85, edgecolor='k', linewidth=0.3)
+    redibujo = RedibujoRapido(fig, [superficie])
+
+    def actualizar(val):
+        poligonos = campo.poligonos(slider_Torsion6.val, slider_Spinmod6.val)
+        superficie.set_verts(poligonos)
+        superficie.set_array(poligonos[..., 2].mean(axis=1))
+        superficie.autoscale()
+        redibujo.actualizar()
+
+    slider_Torsion6 = _slider(fig, [0.25, 0.10, 0.65, 0.03], 'Torsión', 0.05, 0.5, 0.3)
+    slider_Spinmod6 = _slider(fig, [0.25, 0.05, 0.65, 0.03], 'Spin Mod', 0.05, 0.5, 0.2)
+    return _conectar(fig, 'fig_interact6', [slider_Torsion6, slider_Spinmod6], actualizar, redibujo)
+
+
+def crear_fig7(estado=None):
+    # Dispersión estructural posterior al acoplamiento
+    estado = _estado(estado)
+    punto = estado.acoplamiento.punto
+    A1_new, A2_new = estado.angulos_dispersion()
+    fig, ax = _figura_3d()
     theta_disp = np.linspace(0, 2 * np.pi, 1000)
-    x1_disp = np.cos(theta_disp + w1) * np.cos(A1) + x_acop
-    y1_disp = np.sin(theta_disp + w1) * np.cos(A1) + y_acop
-    z1_disp = B1 * theta_disp + z_acop
-    x2_disp = np.cos(theta_disp + w2) * np.cos(A2) + x_acop
-    y2_disp = np.sin(theta_disp + w2) * np.cos(A2) + y_acop
-    z2_disp = B2 * theta_disp + z_acop
-    ax_interact7.plot(x1_disp, y1_disp, z1_disp, color='darkblue', label='Dispersión p1')
-    ax_interact7.plot(x2_disp, y2_disp, z2_disp, color='darkred', label='Dispersión p2')
-    ax_interact7.scatter(x_acop, y_acop, z_acop, color='black', s=50, label='Punto de acoplamiento')
-    ax_interact7.set_xlim([-2, 2])
-    ax_interact7.set_ylim([-2, 2])
-    ax_interact7.set_zlim([0, 4 * np.pi * 0.5])
-    ax_interact7.set_title("Dispersión estructural interactiva")
-    ax_interact7.legend()
-    fig_interact7.canvas.draw_idle()
-
-# Controles
-ax_A1n7 = plt.axes([0.25, 0.18, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S1n7 = plt.axes([0.25, 0.15, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_B1n7 = plt.axes([0.25, 0.12, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_A2n7 = plt.axes([0.60, 0.18, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S2n7 = plt.axes([0.60, 0.15, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_B2n7 = plt.axes([0.60, 0.12, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-
-slider_A1n7 = Slider(ax_A1n7, 'Ángulo A1', 0, np.pi/2, valinit=A1n7)
-slider_S1n7 = Slider(ax_S1n7, 'Spin S1', 1, 6, valinit=S1n7)
-slider_B1n7 = Slider(ax_B1n7, 'Torsión B1', 0.05, 0.5, valinit=B1n7)
-slider_A2n7 = Slider(ax_A2n7, 'Ángulo A2', 0, np.pi/2, valinit=A2n7)
-slider_S2n7 = Slider(ax_S2n7, 'Spin S2', 1, 6, valinit=S2n7)
-slider_B2n7 = Slider(ax_B2n7, 'Torsión B2', 0.05, 0.5, valinit=B2n7)
-
-slider_A1n7.on_changed(actualizar7)
-slider_S1n7.on_changed(actualizar7)
-slider_B1n7.on_changed(actualizar7)
-slider_A2n7.on_changed(actualizar7)
-slider_S2n7.on_changed(actualizar7)
-slider_B2n7.on_changed(actualizar7)
-
-actualizar7(None)
-plt.show()
-
-# Simulación estructural de dispersión coherente desde ε₀ en forma toroidal
-fig8 = plt.figure()
-ax8 = fig8.add_subplot(111, projection='3d')
-
-np.random.seed(123)
-num_ramas = 30
-longitud = 1000
-theta_vals = np.linspace(0, 2 * np.pi, longitud)
-
-for i in range(num_ramas):
-    phi_dir = np.radians(np.random.uniform(10, 170))   # dirección polar
-    theta_dir = np.random.uniform(0, 2 * np.pi)         # dirección azimutal
-    torsion = np.random.uniform(0.15, 0.35)
-    spin = np.random.uniform(1, 4)
-
-    # Dirección vectorial de salida proyectiva
-    dir_x = np.sin(phi_dir) * np.cos(theta_dir)
-    dir_y = np.sin(phi_dir) * np.sin(theta_dir)
-    dir_z = np.cos(phi_dir)
-
-    # Trayectoria helicoidal en esa dirección
-    x_disp = dir_x * np.cos(spin * theta_vals + i) + x_acop
-    y_disp = dir_y * np.sin(spin * theta_vals + i) + y_acop
-    z_disp = dir_z * torsion * theta_vals + z_acop
-
-    color = plt.cm.coolwarm(i / num_ramas)
-    ax8.plot(x_disp, y_disp, z_disp, color=color, alpha=0.8)
-
-ax8.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Nodo inicial (ε₀)')
-ax8.set_title("Dispersión estructurada en espacio toroidal desde ε₀")
-ax8.set_xlabel("X")
-ax8.set_ylabel("Y")
-ax8.set_zlabel("Z")
-ax8.legend()
-plt.show()
-
-# Visualización interactiva con sliders para dispersión toroidal
-from matplotlib.widgets import Slider
-
-fig_interact8 = plt.figure()
-ax_interact8 = fig_interact8.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-Nramas8, Spin8, Torsion8 = 10, 2.0, 0.2
-
-def actualizar8(val):
-    ax_interact8.cla()
-    num_ramas = int(slider_Nramas8.val)
-    spin = slider_Spin8.val
-    torsion = slider_Torsion8.val
-    longitud = 1000
-    theta_vals = np.linspace(0, 2 * np.pi, longitud)
-    np.random.seed(123)
-    for i in range(num_ramas):
-        phi_dir = np.radians(np.random.uniform(10, 170))
-        theta_dir = np.random.uniform(0, 2 * np.pi)
-        dir_x = np.sin(phi_dir) * np.cos(theta_dir)
-        dir_y = np.sin(phi_dir) * np.sin(theta_dir)
-        dir_z = np.cos(phi_dir)
-        x_disp = dir_x * np.cos(spin * theta_vals + i) + x_acop
-        y_disp = dir_y * np.sin(spin * theta_vals + i) + y_acop
-        z_disp = dir_z * torsion * theta_vals + z_acop
-        color = plt.cm.coolwarm(i / max(1, num_ramas))
-        ax_interact8.plot(x_disp, y_disp, z_disp, color=color, alpha=0.8)
-    ax_interact8.scatter(x_acop, y_acop, z_acop, color='black', s=60, label='Nodo inicial (ε₀)')
-    ax_interact8.set_xlim([-2, 2])
-    ax_interact8.set_ylim([-2, 2])
-    ax_interact8.set_zlim([0, 4 * np.pi * 0.5])
-    ax_interact8.set_title("Dispersión toroidal interactiva")
-    ax_interact8.legend()
-    fig_interact8.canvas.draw_idle()
-
-# Controles
-ax_Nramas8 = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_Spin8 = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_Torsion8 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_Nramas8 = Slider(ax_Nramas8, 'Nº Ramas', 1, 30, valinit=Nramas8, valstep=1)
-slider_Spin8 = Slider(ax_Spin8, 'Spin', 1, 6, valinit=Spin8)
-slider_Torsion8 = Slider(ax_Torsion8, 'Torsión', 0.05, 0.5, valinit=Torsion8)
-
-slider_Nramas8.on_changed(actualizar8)
-slider_Spin8.on_changed(actualizar8)
-slider_Torsion8.on_changed(actualizar8)
-
-actualizar8(None)
-plt.show()
-
-# Simulación de proyección y acoplamiento con trayectorias helicoidales reales
-fig9 = plt.figure()
-ax9 = fig9.add_subplot(111, projection='3d')
-
-# Parámetros base
-r1, r2 = 1.0, 1.0  # radio de giro helicoidal
-b1, b2 = 0.2, 0.3  # paso de hélice (torsión)
-S1, S2 = 3, 2.5    # cantidad de giros
-w1, w2 = 0, np.pi/3  # fases
-
-theta_h = np.linspace(0, 2 * np.pi * S1, 1000)
-phi_h = np.linspace(0, 2 * np.pi * S2, 1000)
-
-# Trayectoria helicoidal 1
-x1_h = r1 * np.cos(theta_h)
-y1_h = r1 * np.sin(theta_h)
-z1_h = b1 * theta_h
-
-# Trayectoria helicoidal 2
-x2_h = r2 * np.cos(phi_h + w2)
-y2_h = r2 * np.sin(phi_h + w2)
-z2_h = b2 * phi_h + 1.5  # desplazada en Z
-
-# Calcular acoplamiento como mínima distancia
-z1_interp = np.interp(np.linspace(0, 1, 1000), np.linspace(0, 1, len(z1_h)), z1_h)
-z2_interp = np.interp(np.linspace(0, 1, 1000), np.linspace(0, 1, len(z2_h)), z2_h)
-dist_h = np.sqrt((x1_h - x2_h)**2 + (y1_h - y2_h)**2 + (z1_interp - z2_interp)**2)
-i_acop = np.argmin(dist_h)
-
-x_acop_h = (x1_h[i_acop] + x2_h[i_acop]) / 2
-y_acop_h = (y1_h[i_acop] + y2_h[i_acop]) / 2
-z_acop_h = (z1_interp[i_acop] + z2_interp[i_acop]) / 2
-
-# Graficar
-ax9.plot(x1_h, y1_h, z1_h, label="Hélice 1", color='blue')
-ax9.plot(x2_h, y2_h, z2_h, label="Hélice 2", color='red')
-ax9.scatter(x_acop_h, y_acop_h, z_acop_h, s=60, color='black', label="Acoplamiento")
-
-ax9.set_title("Acoplamiento con trayectorias helicoidales reales")
-ax9.set_xlabel("X")
-ax9.set_ylabel("Y")
-ax9.set_zlabel("Z")
-
-ax9.legend()
-plt.show()
-
-# Visualización interactiva con sliders para acoplamiento de hélices reales
-from matplotlib.widgets import Slider
-
-fig_interact9 = plt.figure()
-ax_interact9 = fig_interact9.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-r10_9, r20_9 = 1.0, 1.0
-b10_9, b20_9 = 0.2, 0.3
-S10_9, S20_9 = 3, 2.5
-w10_9, w20_9 = 0, np.pi/3
-
-def actualizar9(val):
-    ax_interact9.cla()
-    r1 = slider_r1_9.val
-    r2 = slider_r2_9.val
-    b1 = slider_b1_9.val
-    b2 = slider_b2_9.val
-    S1 = slider_S1_9.val
-    S2 = slider_S2_9.val
-    w1 = slider_w1_9.val
-    w2 = slider_w2_9.val
-    theta_h = np.linspace(0, 2 * np.pi * S1, 1000)
-    phi_h = np.linspace(0, 2 * np.pi * S2, 1000)
-    x1_h = r1 * np.cos(theta_h)
-    y1_h = r1 * np.sin(theta_h)
-    z1_h = b1 * theta_h
-    x2_h = r2 * np.cos(phi_h + w2)
-    y2_h = r2 * np.sin(phi_h + w2)
-    z2_h = b2 * phi_h + 1.5
-    z1_interp = np.interp(np.linspace(0, 1, 1000), np.linspace(0, 1, len(z1_h)), z1_h)
-    z2_interp = np.interp(np.linspace(0, 1, 1000), np.linspace(0, 1, len(z2_h)), z2_h)
-    dist_h = np.sqrt((x1_h - x2_h)**2 + (y1_h - y2_h)**2 + (z1_interp - z2_interp)**2)
-    i_acop = np.argmin(dist_h)
-    x_acop_h = (x1_h[i_acop] + x2_h[i_acop]) / 2
-    y_acop_h = (y1_h[i_acop] + y2_h[i_acop]) / 2
-    z_acop_h = (z1_interp[i_acop] + z2_interp[i_acop]) / 2
-    ax_interact9.plot(x1_h, y1_h, z1_h, label="Hélice 1", color='blue')
-    ax_interact9.plot(x2_h, y2_h, z2_h, label="Hélice 2", color='red')
-    ax_interact9.scatter(x_acop_h, y_acop_h, z_acop_h, s=60, color='black', label="Acoplamiento")
-    ax_interact9.set_xlim([-2, 2])
-    ax_interact9.set_ylim([-2, 2])
-    ax_interact9.set_zlim([-1, 5])
-    ax_interact9.set_title("Acoplamiento de hélices real interactivo")
-    ax_interact9.legend()
-    fig_interact9.canvas.draw_idle()
-
-# Controles
-ax_r1_9 = plt.axes([0.25, 0.20, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_r2_9 = plt.axes([0.25, 0.17, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_b1_9 = plt.axes([0.25, 0.14, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_b2_9 = plt.axes([0.25, 0.11, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S1_9 = plt.axes([0.60, 0.20, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_S2_9 = plt.axes([0.60, 0.17, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_w1_9 = plt.axes([0.60, 0.14, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-ax_w2_9 = plt.axes([0.60, 0.11, 0.30, 0.02], facecolor='lightgoldenrodyellow')
-
-slider_r1_9 = Slider(ax_r1_9, 'Radio 1', 0.5, 2, valinit=r10_9)
-slider_r2_9 = Slider(ax_r2_9, 'Radio 2', 0.5, 2, valinit=r20_9)
-slider_b1_9 = Slider(ax_b1_9, 'Torsión 1', 0.05, 0.5, valinit=b10_9)
-slider_b2_9 = Slider(ax_b2_9, 'Torsión 2', 0.05, 0.5, valinit=b20_9)
-slider_S1_9 = Slider(ax_S1_9, 'Spin 1', 1, 6, valinit=S10_9)
-slider_S2_9 = Slider(ax_S2_9, 'Spin 2', 1, 6, valinit=S20_9)
-slider_w1_9 = Slider(ax_w1_9, 'Fase 1', 0, 2*np.pi, valinit=w10_9)
-slider_w2_9 = Slider(ax_w2_9, 'Fase 2', 0, 2*np.pi, valinit=w20_9)
-
-slider_r1_9.on_changed(actualizar9)
-slider_r2_9.on_changed(actualizar9)
-slider_b1_9.on_changed(actualizar9)
-slider_b2_9.on_changed(actualizar9)
-slider_S1_9.on_changed(actualizar9)
-slider_S2_9.on_changed(actualizar9)
-slider_w1_9.on_changed(actualizar9)
-slider_w2_9.on_changed(actualizar9)
-
-actualizar9(None)
-plt.show()
-
-# Simulación de acoplamiento con rotación doble (spin estructural + giro propio)
-fig10 = plt.figure()
-ax10 = fig10.add_subplot(111, projection='3d')
-
-# Parámetros principales del movimiento toroidal helicoidal
-r = 1.0          # radio principal de giro
-b = 0.05         # torsión helicoidal
-S = 10           # número de vueltas toroidales
-subspin = 5      # subgiros sobre el eje (giro interno)
-
-theta_spin = np.linspace(0, 2 * np.pi * S, 2000)
-
-# Trayectoria 1: giro toroidal + pequeño giro sobre su propio eje
-x_spin1 = (r + 0.1 * np.cos(subspin * theta_spin)) * np.cos(theta_spin)
-y_spin1 = (r + 0.1 * np.cos(subspin * theta_spin)) * np.sin(theta_spin)
-z_spin1 = b * theta_spin + 0.05 * np.sin(subspin * theta_spin)
-
-# Trayectoria 2: mismo patrón, desfasado ligeramente
-x_spin2 = (r + 0.1 * np.cos(subspin * theta_spin + np.pi/2)) * np.cos(theta_spin)
-y_spin2 = (r + 0.1 * np.cos(subspin * theta_spin + np.pi/2)) * np.sin(theta_spin)
-z_spin2 = b * theta_spin + 0.05 * np.sin(subspin * theta_spin + np.pi/2)
-
-# Visualización
-ax10.plot(x_spin1, y_spin1, z_spin1, label="Partícula 1", color='blue')
-ax10.plot(x_spin2, y_spin2, z_spin2, label="Partícula 2", color='red')
-ax10.set_title("Acoplamiento con doble rotación (spin visible)")
-ax10.set_xlabel("X")
-ax10.set_ylabel("Y")
-ax10.set_zlabel("Z")
-
-ax10.legend()
-plt.show()
-
-# Visualización interactiva con sliders para acoplamiento con doble rotación
-from matplotlib.widgets import Slider
-
-fig_interact10 = plt.figure()
-ax_interact10 = fig_interact10.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-r0_10, b0_10, S0_10, subspin0_10 = 1.0, 0.05, 10, 5
-
-def actualizar10(val):
-    ax_interact10.cla()
-    r = slider_r10.val
-    b = slider_b10.val
-    S = slider_S10.val
-    subspin = int(slider_subspin10.val)
-    theta_spin = np.linspace(0, 2 * np.pi * S, 2000)
-    x_spin1 = (r + 0.1 * np.cos(subspin * theta_spin)) * np.cos(theta_spin)
-    y_spin1 = (r + 0.1 * np.cos(subspin * theta_spin)) * np.sin(theta_spin)
-    z_spin1 = b * theta_spin + 0.05 * np.sin(subspin * theta_spin)
-    x_spin2 = (r + 0.1 * np.cos(subspin * theta_spin + np.pi/2)) * np.cos(theta_spin)
-    y_spin2 = (r + 0.1 * np.cos(subspin * theta_spin + np.pi/2)) * np.sin(theta_spin)
-    z_spin2 = b * theta_spin + 0.05 * np.sin(subspin * theta_spin + np.pi/2)
-    ax_interact10.plot(x_spin1, y_spin1, z_spin1, label="Partícula 1", color='blue')
-    ax_interact10.plot(x_spin2, y_spin2, z_spin2, label="Partícula 2", color='red')
-    ax_interact10.set_xlim([-2, 2])
-    ax_interact10.set_ylim([-2, 2])
-    ax_interact10.set_zlim([-1, 7])
-    ax_interact10.set_title("Acoplamiento doble rotación interactivo")
-    ax_interact10.legend()
-    fig_interact10.canvas.draw_idle()
-
-# Controles
-ax_r10 = plt.axes([0.25, 0.14, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_b10 = plt.axes([0.25, 0.11, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_S10 = plt.axes([0.25, 0.08, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_subspin10 = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_r10 = Slider(ax_r10, 'Radio', 0.5, 2, valinit=r0_10)
-slider_b10 = Slider(ax_b10, 'Torsión', 0.01, 0.2, valinit=b0_10)
-slider_S10 = Slider(ax_S10, 'Spin', 2, 20, valinit=S0_10)
-slider_subspin10 = Slider(ax_subspin10, 'Subspin', 1, 15, valinit=subspin0_10, valstep=1)
-
-slider_r10.on_changed(actualizar10)
-slider_b10.on_changed(actualizar10)
-slider_S10.on_changed(actualizar10)
-slider_subspin10.on_changed(actualizar10)
-
-actualizar10(None)
-plt.show()
-
-# Cálculo estructural de ħ desde hélice proyectada
-import matplotlib.animation as animation
-
-fig11 = plt.figure()
-ax11 = fig11.add_subplot(111, projection='3d')
-
-# Parámetros de partícula tipo electrón
-masa = 9.11e-31  # kg
-r = 1e-11        # m (radio helicoidal aproximado)
-b = 1e-13        # paso helicoidal (distancia entre vueltas)
-S = 1            # 1 giro completo
-N = 1000         # resolución
-
-theta_hbar = np.linspace(0, 2 * np.pi * S, N)
-x_hbar = r * np.cos(theta_hbar)
-y_hbar = r * np.sin(theta_hbar)
-z_hbar = b * theta_hbar
-
-# Cálculo de momento angular estructural
-I = (2/5) * masa * r**2                  # momento de inercia de una esfera uniforme
-omega = 2 * np.pi / (1e-15)             # frecuencia angular (~1 femtosegundo)
-L = I * omega                           # momento angular
-h_bar_estructural = L                   # nuestra interpretación de ħ estructural
-
-# Mostrar valor calculado
-print(f"ħ estructural aproximado: {h_bar_estructural:.2e} J·s")
-
-# Simular energía estructural como variación
-E_p = 0.5 * masa * omega**2 * r**2 * (1 + 0.1 * np.sin(3 * theta_hbar))
-
-# Graficar hélice con energía codificada como color
-for i in range(N - 1):
-    ax11.plot([x_hbar[i], x_hbar[i+1]],
-              [y_hbar[i], y_hbar[i+1]],
-              [z_hbar[i], z_hbar[i+1]],
-              color=plt.cm.plasma(E_p[i] / max(E_p)))
-
-# Parámetros de segunda partícula para resonancia
-fase2 = np.pi / 12
-x2 = r * np.cos(theta_hbar + fase2)
-y2 = r * np.sin(theta_hbar + fase2)
-z2 = b * theta_hbar + 2e-11
-
-# Condición de resonancia (fases cercanas)
-delta_fase = np.abs(fase2)
-resonante = delta_fase < np.pi / 8
-
-if resonante:
-    ax11.plot(x2, y2, z2, color='lime', label="Partícula resonante")
-else:
-    ax11.plot(x2, y2, z2, color='gray', label="Partícula no acoplada")
-
-ax11.set_title("Cálculo estructural de ħ y resonancia proyectiva")
-ax11.set_xlabel("X (m)")
-ax11.set_ylabel("Y (m)")
-ax11.set_zlabel("Z (m)")
-ax11.legend()
-plt.show()
-
-# Lagrangiano estructural derivado de curvatura helicoidal
-fig12 = plt.figure()
-ax12 = fig12.add_subplot(111)
-
-# Parámetros estructurales del modelo
-masa = 9.11e-31      # kg
-r = 1e-11            # m
-b = 5e-13            # paso helicoidal (más realista)
-omega = 2 * np.pi / 1e-15  # rad/s
-
-# Tiempo real
-t = np.linspace(0, 1e-15, 1000)
-
-# Posición helicoidal
-x = r * np.cos(omega * t)
-y = r * np.sin(omega * t)
-z = b * omega * t
-
-# Derivadas
-vx = -r * omega * np.sin(omega * t)
-vy =  r * omega * np.cos(omega * t)
-vz = b * omega * np.ones_like(t)
-
-# Energía cinética real
-T = 0.5 * masa * (vx**2 + vy**2 + vz**2)
-
-# Energía potencial estructural basada en curvatura local
-# Curvatura = cambio en dirección = torsión proyectiva estructural
-curvatura = np.abs(np.gradient(np.arctan2(vy, vx)))
-curvatura_norm = (curvatura - min(curvatura)) / (max(curvatura) - min(curvatura))
-
-# V es alta donde hay más cambio de dirección → más torsión
-V = T.max() * curvatura_norm**2  # energía estructural asociada a deformación proyectiva
-
-# Lagrangiano
-L = T - V
-
-# Gráfico
-ax12.plot(t * 1e15, T, label="Energía cinética T", color='blue')
-ax12.plot(t * 1e15, V, label="Estructura proyectiva V", color='orange')
-ax12.plot(t * 1e15, L, label="Lagrangiano estructural L = T - V", color='green', linewidth=2)
-
-ax12.set_title("Lagrangiano desde curvatura helicoidal estructural")
-ax12.set_xlabel("Tiempo (fs)")
-ax12.set_ylabel("Energía (J)")
-ax12.legend()
-ax12.grid(True)
-plt.tight_layout()
-plt.show()
-
-# Rotación automática para visualizaciones 3D
-from matplotlib.animation import FuncAnimation
+    ax.plot(*trayectoria_modificada(theta_disp, A1_new, estado.w1, estado.B1_new, punto),
+            color='darkblue', label='Dispersión p1')
+    ax.plot(*trayectoria_modificada(theta_disp, A2_new, estado.w2, estado.B2_new, punto),
+            color='darkred', label='Dispersión p2')
+    ax.scatter(*punto, color='black', s=50, label='Punto de acoplamiento')
+    _etiquetar(ax, "Dispersión estructural posterior al acoplamiento")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact7(estado=None):
+    estado = _estado(estado)
+    punto = estado.acoplamiento.punto
+    A1_new, A2_new = estado.angulos_dispersion()
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    disp1, = ax.plot([], [], [], color='darkblue', label='Dispersión p1')
+    disp2, = ax.plot([], [], [], color='darkred', label='Dispersión p2')
+    ax.scatter(*punto, color='black', s=50, label='Punto de acoplamiento')
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([0, 4 * np.pi * 0.5])
+    ax.set_title("Dispersión estructural interactiva")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, [disp1, disp2])
+
+    def actualizar(val):
+        theta_disp = np.linspace(0, 2 * np.pi, 1000)
+        disp1.set_data_3d(*trayectoria_modificada(theta_disp, slider_A1n7.val, estado.w1,
+                                                  slider_B1n7.val, punto))
+        disp2.set_data_3d(*trayectoria_modificada(theta_disp, slider_A2n7.val, estado.w2,
+                                                  slider_B2n7.val, punto))
+        redibujo.actualizar()
+
+    slider_A1n7 = _slider(fig, [0.25, 0.18, 0.30, 0.02], 'Ángulo A1', 0, np.pi/2, A1_new)
+    slider_S1n7 = _slider(fig, [0.25, 0.15, 0.30, 0.02], 'Spin S1', 1, 6, estado.S1_new)
+    slider_B1n7 = _slider(fig, [0.25, 0.12, 0.30, 0.02], 'Torsión B1', 0.05, 0.5, estado.B1_new)
+    slider_A2n7 = _slider(fig, [0.60, 0.18, 0.30, 0.02], 'Ángulo A2', 0, np.pi/2, A2_new)
+    slider_S2n7 = _slider(fig, [0.60, 0.15, 0.30, 0.02], 'Spin S2', 1, 6, estado.S2_new)
+    slider_B2n7 = _slider(fig, [0.60, 0.12, 0.30, 0.02], 'Torsión B2', 0.05, 0.5, estado.B2_new)
+    return _conectar(fig, 'fig_interact7',
+                     [slider_A1n7, slider_S1n7, slider_B1n7,
+                      slider_A2n7, slider_S2n7, slider_B2n7],
+                     actualizar, redibujo)
+
+
+def crear_fig8(estado=None):
+    # Dispersión coherente desde ε₀ en forma toroidal
+    import matplotlib.pyplot as plt
+    fig, ax = _figura_3d()
+    num_ramas = 30
+    theta_vals = np.linspace(0, 2 * np.pi, 1000)
+    punto = _estado(estado).acoplamiento.punto
+    ramas = ramas_dispersion(theta_vals, parametros_dispersion(num_ramas, seed=123), punto)
+    for i, rama in enumerate(ramas):
+        ax.plot(*rama.T, color=plt.cm.coolwarm(i / num_ramas), alpha=0.8)
+    ax.scatter(*punto, color='black', s=60, label='Nodo inicial (ε₀)')
+    _etiquetar(ax, "Dispersión estructurada en espacio toroidal desde ε₀")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact8(estado=None):
+    import matplotlib.pyplot as plt
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    theta_vals = np.linspace(0, 2 * np.pi, 1000)
+    max_ramas = 30
+    # Una línea por rama posible; las que sobran se ocultan
+    lineas = [ax.plot([], [], [], alpha=0.8)[0] for _ in range(max_ramas)]
+    punto = _estado(estado).acoplamiento.punto
+    ax.scatter(*punto, color='black', s=60, label='Nodo inicial (ε₀)')
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([0, 4 * np.pi * 0.5])
+    ax.set_title("Dispersión toroidal interactiva")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, lineas)
+    # Con spin y torsión fijados solo se sortean las direcciones, y las de
+    # las primeras n ramas no dependen de n: se sortean una vez
+    params = parametros_dispersion(max_ramas, seed=123, spin=0, torsion=0)
+
+    def actualizar(val):
+        num_ramas = int(slider_Nramas8.val)
+        params[:, 2], params[:, 3] = slider_Torsion8.val, slider_Spin8.val
+        ramas = ramas_dispersion(theta_vals, params[:num_ramas], punto)
+        for i, linea in enumerate(lineas):
+            linea.set_visible(i < num_ramas)
+            if i < num_ramas:
+                linea.set_data_3d(*ramas[i].T)
+                linea.set_color(plt.cm.coolwarm(i / max(1, num_ramas)))
+        redibujo.actualizar()
+
+    slider_Nramas8 = _slider(fig, [0.25, 0.15, 0.65, 0.03], 'Nº Ramas', 1, max_ramas, 10, valstep=1)
+    slider_Spin8 = _slider(fig, [0.25, 0.10, 0.65, 0.03], 'Spin', 1, 6, 2.0)
+    slider_Torsion8 = _slider(fig, [0.25, 0.05, 0.65, 0.03], 'Torsión', 0.05, 0.5, 0.2)
+    return _conectar(fig, 'fig_interact8', [slider_Nramas8, slider_Spin8, slider_Torsion8],
+                     actualizar, redibujo)
+
+
+def _helices_reales(r1, r2, b1, b2, S1, S2, w1, w2):
+    # Hélice 2 desplazada en Z; la fase 1 se conserva solo como parámetro
+    c1 = helice_real(eje_angular(S1), r1, b1)
+    c2 = helice_real(eje_angular(S2), r2, b2, fase=w2, z0=1.5)
+    # Acoplamiento como mínima distancia real entre ambas hélices
+    _, _, _, punto = _acoplamiento(helice_parametrica(r1, 0, b1, 2 * np.pi * S1),
+                                   helice_parametrica(r2, w2, b2, 2 * np.pi * S2, z0=1.5))
+    return c1, c2, punto
+
+
+def crear_fig9(estado=None):
+    # Proyección y acoplamiento con trayectorias helicoidales reales
+    estado = _estado(estado)
+    fig, ax = _figura_3d()
+    c1, c2, punto = _helices_reales(estado.r1_h, estado.r2_h, estado.b1_h, estado.b2_h,
+                                    estado.S1_h, estado.S2_h, estado.w1_h, estado.w2_h)
+    ax.plot(*c1, label="Hélice 1", color='blue')
+    ax.plot(*c2, label="Hélice 2", color='red')
+    ax.scatter(*punto, s=60, color='black', label="Acoplamiento")
+    _etiquetar(ax, "Acoplamiento con trayectorias helicoidales reales")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact9(estado=None):
+    estado = _estado(estado)
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    helice1, = ax.plot([], [], [], label="Hélice 1", color='blue')
+    helice2, = ax.plot([], [], [], label="Hélice 2", color='red')
+    acople = ax.scatter([], [], [], s=60, color='black', label="Acoplamiento")
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([-1, 5])
+    ax.set_title("Acoplamiento de hélices real interactivo")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, [helice1, helice2, acople])
+
+    def actualizar(val):
+        c1, c2, punto = _helices_reales(*(s.val for s in fig.sliders))
+        helice1.set_data_3d(*c1)
+        helice2.set_data_3d(*c2)
+        mover_puntos(acople, *punto)
+        redibujo.actualizar()
+
+    return _conectar(fig, 'fig_interact9', [
+        _slider(fig, [0.25, 0.20, 0.30, 0.02], 'Radio 1', 0.5, 2, estado.r1_h),
+        _slider(fig, [0.25, 0.17, 0.30, 0.02], 'Radio 2', 0.5, 2, estado.r2_h),
+        _slider(fig, [0.25, 0.14, 0.30, 0.02], 'Torsión 1', 0.05, 0.5, estado.b1_h),
+        _slider(fig, [0.25, 0.11, 0.30, 0.02], 'Torsión 2', 0.05, 0.5, estado.b2_h),
+        _slider(fig, [0.60, 0.20, 0.30, 0.02], 'Spin 1', 1, 6, estado.S1_h),
+        _slider(fig, [0.60, 0.17, 0.30, 0.02], 'Spin 2', 1, 6, estado.S2_h),
+        _slider(fig, [0.60, 0.14, 0.30, 0.02], 'Fase 1', 0, 2*np.pi, estado.w1_h),
+        _slider(fig, [0.60, 0.11, 0.30, 0.02], 'Fase 2', 0, 2*np.pi, estado.w2_h),
+    ], actualizar, redibujo)
+
+
+def _rotacion_doble_visible(escala, r, b, S, subspin, desfase=0.0):
+    # Tantos puntos como pidan la curvatura y el tamaño en pantalla: pocos
+    # con subspin 1, muchos más con subspin alto. La densidad se estima con
+    # 16 muestras por giro propio
+    theta_spin = eje_adaptativo(lambda t: derivadas_rotacion_doble(t, r, b, subspin, desfase),
+                                0, 2 * np.pi * S, escala, muestras=max(1024, int(16 * S * subspin)))
+    return rotacion_doble(theta_spin, r, b, subspin, desfase)
+
+
+def crear_fig10(estado=None):
+    # Acoplamiento con rotación doble (spin estructural + giro propio)
+    fig, ax = _figura_3d()
+    r, b, S, subspin = 1.0, 0.05, 10, 5
+    escala = escala_pantalla(ax, (2 * (r + 0.1), 2 * (r + 0.1), 2 * np.pi * S * b + 0.1))
+    ax.plot(*_rotacion_doble_visible(escala, r, b, S, subspin), label="Partícula 1", color='blue')
+    ax.plot(*_rotacion_doble_visible(escala, r, b, S, subspin, np.pi/2),
+            label="Partícula 2", color='red')
+    _etiquetar(ax, "Acoplamiento con doble rotación (spin visible)")
+    ax.legend()
+    return fig
+
+
+def crear_fig_interact10(estado=None):
+    fig, ax = _figura_3d()
+    fig.subplots_adjust(left=0.25, bottom=0.25)
+    particula1, = ax.plot([], [], [], label="Partícula 1", color='blue')
+    particula2, = ax.plot([], [], [], label="Partícula 2", color='red')
+    ax.set_xlim([-2, 2])
+    ax.set_ylim([-2, 2])
+    ax.set_zlim([-1, 7])
+    ax.set_title("Acoplamiento doble rotación interactivo")
+    ax.legend()
+    redibujo = RedibujoRapido(fig, [particula1, particula2])
+
+    def actualizar(val):
+        r, b, S = slider_r10.val, slider_b10.val, slider_S10.val
+        subspin = int(slider_subspin10.val)
+        escala = escala_pantalla(ax)
+        particula1.set_data_3d(*_rotacion_doble_visible(escala, r, b, S, subspin))
+        particula2.set_data_3d(*_rotacion_doble_visible(escala, r, b, S, subspin, np.pi/2))
+        redibujo.actualizar()
+
+    slider_r10 = _slider(fig, [0.25, 0.14, 0.65, 0.03], 'Radio', 0.5, 2, 1.0)
+    slider_b10 = _slider(fig, [0.25, 0.11, 0.65, 0.03], 'Torsión', 0.01, 0.2, 0.05)
+    slider_S10 = _slider(fig, [0.25, 0.08, 0.65, 0.03], 'Spin', 2, 20, 10)
+    slider_subspin10 = _slider(fig, [0.25, 0.05, 0.65, 0.03], 'Subspin', 1, 15, 5, valstep=1)
+    return _conectar(fig, 'fig_interact10',
+                     [slider_r10, slider_b10, slider_S10, slider_subspin10],
+                     actualizar, redibujo)
+
+
+def crear_fig11(estado=None):
+    # Cálculo estructural de ħ desde hélice proyectada
+    fig, ax = _figura_3d()
+
+    # Parámetros de partícula tipo electrón
+    masa = 9.11e-31            # kg
+    r = 1e-11                  # m (radio helicoidal aproximado)
+    b = 1e-13                  # paso helicoidal (distancia entre vueltas)
+    N = 1000                   # resolución
+    omega = 2 * np.pi / 1e-15  # frecuencia angular (~1 femtosegundo)
+
+    theta_hbar = eje_angular(1, N)
+    x_hbar, y_hbar, z_hbar = helice_real(theta_hbar, r, b)
+    print(f"ħ estructural aproximado: {hbar_estructural(masa, r, omega):.2e} J·s")
+
+    # Graficar hélice con energía codificada como color
+    E_p = energia_estructural(masa, r, omega, theta_hbar)
+    linea_coloreada(ax, x_hbar, y_hbar, z_hbar, E_p, cmap='plasma', vmin=0, vmax=E_p.max())
+
+    # Segunda partícula: resonante si las fases son cercanas
+    fase2 = np.pi / 12
+    x2, y2, z2 = helice_real(theta_hbar, r, b, fase=fase2, z0=2e-11)
+    if np.abs(fase2) < np.pi / 8:
+        ax.plot(x2, y2, z2, color='lime', label="Partícula resonante")
+    else:
+        ax.plot(x2, y2, z2, color='gray', label="Partícula no acoplada")
+
+    _etiquetar(ax, "Cálculo estructural de ħ y resonancia proyectiva", "X (m)", "Y (m)", "Z (m)")
+    ax.legend()
+    return fig
+
+
+def _grafico_lagrangiano(ax, t, T, V, L, etiqueta_V, colores):
+    ax.plot(t * 1e15, T, label="Energía cinética T", color=colores[0])
+    ax.plot(t * 1e15, V, label=etiqueta_V, color=colores[1])
+    ax.plot(t * 1e15, L, label="Lagrangiano total L = T - V", color=colores[2], linewidth=2)
+    ax.set_xlabel("Tiempo (fs)")
+    ax.set_ylabel("Energía (J)")
+    ax.legend()
+
+
+def crear_fig12(estado=None):
+    # Lagrangiano estructural derivado de curvatura helicoidal
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    t = np.linspace(0, 1e-15, 1000)
+    T, V, L = lagrangiano_direccional(9.11e-31, 1e-11, 5e-13, 2 * np.pi / 1e-15, t)
+    _grafico_lagrangiano(ax, t, T, V, L, "Estructura proyectiva V", ('blue', 'orange', 'green'))
+    ax.set_title("Lagrangiano desde curvatura helicoidal estructural")
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+def crear_fig_int(estado=None):
+    return _crear_proyeccion_interactiva(
+        'fig_int',
+        (np.radians(30), 3, 0, 0.2), "Proyección estructural interactiva",
+        ([-1, 1], [0, 2 * np.pi]))
+
+
+def crear_fig_lag(estado=None):
+    # Derivación estructural completa del Lagrangiano desde ε₀:
+    # - T (azul): energía cinética estructural de la proyección helicoidal real.
+    # - V (naranja): energía estructural debida a la curvatura local de la
+    #   trayectoria, la "resistencia" estructural a deformaciones.
+    # - L (verde): Lagrangiano total, que gobierna la dinámica proyectiva.
+    import matplotlib.pyplot as plt
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    t = np.linspace(0, 1.5e-15, 1200)
+    T, V, L = lagrangiano_estructural(4.2e-31, 7e-12, 2.2e-13, 2 * np.pi / 1.5e-15, t,
+                                      fase=np.pi / 7)
+    _grafico_lagrangiano(ax, t, T, V, L, "Energía estructural V (curvatura)",
+                         ('royalblue', 'darkorange', 'forestgreen'))
+    ax.set_title("Derivación estructural completa del Lagrangiano desde ε₀")
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
+
+
+def crear_fig13(estado=None):
+    # Campo dinámico de acoplamientos estructurales en red
+    import matplotlib.pyplot as plt
+    fig, ax = _figura_3d()
+    num_particulas = 15
+    helices = helices_proyectivas(parametros_aleatorios(num_particulas, seed=2025, rango_A=(15, 75)))
+    particulas = [tuple(helice.T) for helice in helices]
+    # La red usa las hélices completas; solo el dibujo se simplifica
+    curvas_decimadas(ax, helices, plt.cm.viridis(np.arange(num_particulas) / num_particulas),
+                     alpha=0.8)
+
+    for punto_i, punto_j in red_acoplamientos(particulas, threshold=0.3):
+        ax.plot([punto_i[0], punto_j[0]],
+                [punto_i[1], punto_j[1]],
+                [punto_i[2], punto_j[2]],
+                color='black', linestyle='--', alpha=0.5)
+    _etiquetar(ax, "Red dinámica de acoplamientos estructurales")
+    return fig
+
+
+def crear_fig_der(estado=None):
+    # Derivadas estructurales fundamentales del modelo
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(10, 6))
+    ax = fig.add_subplot(111)
+    fig.subplots_adjust(left=0.25, bottom=0.35)
+    vacias = ([], [])
+    lineas = [
+        ax.plot(*vacias, label='T (Energía Cinética)', color='royalblue')[0],
+        ax.plot(*vacias, label='V (Estructural)', color='darkorange')[0],
+        ax.plot(*vacias, label='L = T - V', color='green')[0],
+        ax.plot(*vacias, '--', label='dx/dt', alpha=0.4)[0],
+        ax.plot(*vacias, '--', label='dy/dt', alpha=0.4)[0],
+        ax.plot(*vacias, '--', label='dz/dt', alpha=0.4)[0],
+        ax.plot(*vacias, ':', label='d²x/dt²', alpha=0.3)[0],
+        ax.plot(*vacias, ':', label='d²y/dt²', alpha=0.3)[0],
+        ax.plot(*vacias, ':', label='d²z/dt²', alpha=0.3)[0],
+    ]
+    ax.set_title("Derivadas estructurales fundamentales desde ε₀")
+    ax.set_xlabel("Tiempo (fs)")
+    ax.set_ylabel("Magnitud")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    tiempo_fs = T_D * 1e15
+
+    def actualizar(val):
+        curvas = _derivadas(slider_r_d.val, slider_b_d.val, slider_omega_d.val)
+        for linea, curva in zip(lineas, curvas):
+            linea.set_data(tiempo_fs, curva)
+        # La escala vertical cambia con los sliders: hace falta un dibujo completo
+        ax.relim()
+        ax.autoscale_view()
+        fig.canvas.draw_idle()
+
+    slider_r_d = _slider(fig, [0.25, 0.23, 0.65, 0.03], 'Radio r (m)', 1e-12, 2e-11, 7e-12)
+    slider_b_d = _slider(fig, [0.25, 0.18, 0.65, 0.03], 'Torsión b (m)', 1e-13, 5e-13, 2.2e-13)
+    slider_omega_d = _slider(fig, [0.25, 0.13, 0.65, 0.03], 'Frecuencia ω (rad/s)', 2e15, 6e15,
+                             2 * np.pi / 1.5e-15)
+    return _conectar(fig, 'fig_der', [slider_r_d, slider_b_d, slider_omega_d], actualizar)
+
+
+# Vuelta completa de las figuras giratorias: acimut de cada cuadro (grados),
+# elevación fija y milisegundos entre cuadros
+AZIMUTS_GIRO = np.arange(0, 360, 2)
+ELEVACION_GIRO = 30
+INTERVALO_GIRO = 50
+
 
 def rotar(figura, eje):
+    # Rotación automática para visualizaciones 3D
+    from matplotlib.animation import FuncAnimation
+
     def update(frame):
-        eje.view_init(elev=30, azim=frame)
+        eje.view_init(elev=ELEVACION_GIRO, azim=frame)
         return figura,
-    return FuncAnimation(figura, update, frames=np.arange(0, 360, 2), interval=50)
-
-# Aplicar rotación a figuras seleccionadas
-rotar(fig6, ax6)
-rotar(fig8, ax8)
-rotar(fig9, ax9)
-rotar(fig10, ax10)
-
-# Visualización interactiva con sliders (proyección helicoidal)
-from matplotlib.widgets import Slider
-
-fig_int = plt.figure()
-ax_int = fig_int.add_subplot(111, projection='3d')
-plt.subplots_adjust(left=0.25, bottom=0.25)
-
-# Valores iniciales
-A0, S0, W0, B0 = np.radians(30), 3, 0, 0.2
-
-def actualizar(val):
-    ax_int.cla()
-    A = slider_A.val
-    S = slider_S.val
-    W = slider_W.val
-    B = slider_B.val
-    theta = np.linspace(0, S * 2 * np.pi, 1000)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-    ax_int.plot(x, y, z, color='blue')
-    ax_int.set_xlim([-1, 1])
-    ax_int.set_ylim([-1, 1])
-    ax_int.set_zlim([0, 2 * np.pi])
-    ax_int.set_title("Proyección estructural interactiva")
-    fig_int.canvas.draw_idle()
-
-# Controles
-axcolor = 'lightgoldenrodyellow'
-ax_A = plt.axes([0.25, 0.15, 0.65, 0.03], facecolor=axcolor)
-ax_S = plt.axes([0.25, 0.10, 0.65, 0.03], facecolor=axcolor)
-ax_W = plt.axes([0.25, 0.05, 0.65, 0.03], facecolor=axcolor)
-ax_B = plt.axes([0.25, 0.00, 0.65, 0.03], facecolor=axcolor)
-
-slider_A = Slider(ax_A, 'Ángulo A', 0, np.pi/2, valinit=A0)
-slider_S = Slider(ax_S, 'Spin S', 1, 6, valinit=S0)
-slider_W = Slider(ax_W, 'Fase W', 0, 2*np.pi, valinit=W0)
-slider_B = Slider(ax_B, 'Torsión B', 0.05, 0.5, valinit=B0)
-
-slider_A.on_changed(actualizar)
-slider_S.on_changed(actualizar)
-slider_W.on_changed(actualizar)
-slider_B.on_changed(actualizar)
-
-actualizar(None)
-plt.show()
-###############################################################################
-# NUEVA SIMULACIÓN: Derivación estructural completa del Lagrangiano desde ε₀
-###############################################################################
-
-# En esta simulación derivamos el Lagrangiano L = T - V partiendo de una proyección
-# helicoidal real desde ε₀, mostrando paso a paso sus componentes:
-# - T: energía cinética estructural
-# - V: energía estructural basada en la curvatura local de la trayectoria
-# - L: Lagrangiano total estructural
-# Se visualiza la evolución de cada término con el tiempo.
-
-import numpy as np
-import matplotlib.pyplot as plt
-
-# Parámetros estructurales nuevos (independientes)
-masa = 4.2e-31           # kg (valor arbitrario, distinto de los anteriores)
-r = 7e-12                # m (radio helicoidal)
-b = 2.2e-13              # m (paso helicoidal)
-omega = 2 * np.pi / 1.5e-15  # rad/s (frecuencia angular diferente)
-fase = np.pi / 7         # fase de salida
-S = 2.6                  # número de giros estructurales
-
-# Tiempo simulado
-t = np.linspace(0, 1.5e-15, 1200)
-
-# Trayectoria helicoidal proyectiva real desde ε₀
-theta = omega * t + fase
-x = r * np.cos(theta)
-y = r * np.sin(theta)
-z = b * theta
-
-# Derivadas respecto al tiempo
-vx = -r * omega * np.sin(theta)
-vy =  r * omega * np.cos(theta)
-vz = b * omega * np.ones_like(t)
-
-# 1. Energía cinética T
-T = 0.5 * masa * (vx**2 + vy**2 + vz**2)
-
-# 2. Energía estructural V asociada a la curvatura local
-# Curvatura estructural: cambio de dirección local de la trayectoria
-dx = np.gradient(x, t)
-dy = np.gradient(y, t)
-dz = np.gradient(z, t)
-ddx = np.gradient(dx, t)
-ddy = np.gradient(dy, t)
-ddz = np.gradient(dz, t)
-vel = np.sqrt(dx**2 + dy**2 + dz**2)
-acel = np.sqrt(ddx**2 + ddy**2 + ddz**2)
-# Curvatura de Frenet: |v x a| / |v|^3
-num = np.sqrt((dy*ddz - dz*ddy)**2 + (dz*ddx - dx*ddz)**2 + (dx*ddy - dy*ddx)**2)
-curvatura = num / (vel**3 + 1e-25)  # evitar división por cero
-
-# Normalización y energía estructural (asociada a la deformación por curvatura)
-curvatura_norm = (curvatura - np.min(curvatura)) / (np.max(curvatura) - np.min(curvatura) + 1e-25)
-V = T.max() * (curvatura_norm**2)
-
-# 3. Lagrangiano total
-L = T - V
-
-# --- Visualización ---
-fig_lag = plt.figure()
-ax_lag = fig_lag.add_subplot(111)
-
-# Curvas principales
-ax_lag.plot(t * 1e15, T, label="Energía cinética T", color='royalblue')
-ax_lag.plot(t * 1e15, V, label="Energía estructural V (curvatura)", color='darkorange')
-ax_lag.plot(t * 1e15, L, label="Lagrangiano total L = T - V", color='forestgreen', linewidth=2)
-
-# Explicaciones de las curvas (comentarios):
-# - T (azul): Energía cinética estructural de la proyección helicoidal real.
-# - V (naranja): Energía estructural debida a la curvatura local de la trayectoria,
-#                representa la "resistencia" estructural a deformaciones.
-# - L (verde): Lagrangiano total estructural, que gobierna la dinámica proyectiva.
-
-ax_lag.set_title("Derivación estructural completa del Lagrangiano desde ε₀")
-ax_lag.set_xlabel("Tiempo (fs)")
-ax_lag.set_ylabel("Energía (J)")
-ax_lag.legend()
-ax_lag.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-# Simulación de campo dinámico de acoplamientos estructurales en red
-fig13 = plt.figure()
-ax13 = fig13.add_subplot(111, projection='3d')
-
-np.random.seed(2025)
-num_particulas = 15
-longitud = 1000
-theta_vals = np.linspace(0, 2 * np.pi, longitud)
-particulas = []
-
-# Generar partículas proyectadas
-for i in range(num_particulas):
-    A = np.radians(np.random.uniform(15, 75))
-    S = np.random.uniform(1, 4)
-    W = np.random.uniform(0, 2 * np.pi)
-    B = np.random.uniform(0.1, 0.35)
-
-    theta = np.linspace(0, S * 2 * np.pi, longitud)
-    x = np.cos(theta + W) * np.cos(A)
-    y = np.sin(theta + W) * np.cos(A)
-    z = B * theta
-
-    particulas.append((x, y, z))
-    color = plt.cm.viridis(i / num_particulas)
-    ax13.plot(x, y, z, color=color, alpha=0.8)
-
-# Calcular acoplamientos (conexiones si hay cercanía estructural)
-threshold = 0.3  # umbral de acoplamiento (ajustable)
-acoplamientos = []
-
-for i in range(num_particulas):
-    for j in range(i + 1, num_particulas):
-        xi, yi, zi = particulas[i]
-        xj, yj, zj = particulas[j]
-        dists = np.sqrt((xi - xj)**2 + (yi - yj)**2 + (zi - zj)**2)
-        min_dist = np.min(dists)
-        if min_dist < threshold:
-            idx = np.argmin(dists)
-            punto_i = (xi[idx], yi[idx], zi[idx])
-            punto_j = (xj[idx], yj[idx], zj[idx])
-            acoplamientos.append((punto_i, punto_j))
-            ax13.plot([punto_i[0], punto_j[0]],
-                      [punto_i[1], punto_j[1]],
-                      [punto_i[2], punto_j[2]],
-                      color='black', linestyle='--', alpha=0.5)
-
-ax13.set_title("Red dinámica de acoplamientos estructurales")
-ax13.set_xlabel("X")
-ax13.set_ylabel("Y")
-ax13.set_zlabel("Z")
-plt.show()
-###############################################################################
-# Simulación interactiva: derivadas estructurales fundamentales del modelo
-###############################################################################
-
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider
-
-# Valores iniciales
-r0_d, b0_d, omega0_d = 7e-12, 2.2e-13, 2 * np.pi / 1.5e-15
-masa_d = 4.2e-31
-t_d = np.linspace(0, 1.5e-15, 1200)
-
-def calcular_derivadas(r, b, omega):
-    theta = omega * t_d
-    x = r * np.cos(theta)
-    y = r * np.sin(theta)
-    z = b * theta
-    dx = np.gradient(x, t_d)
-    dy = np.gradient(y, t_d)
-    dz = np.gradient(z, t_d)
-    ddx = np.gradient(dx, t_d)
-    ddy = np.gradient(dy, t_d)
-    ddz = np.gradient(dz, t_d)
-    vx = dx
-    vy = dy
-    vz = dz
-    T = 0.5 * masa_d * (vx**2 + vy**2 + vz**2)
-    vel = np.sqrt(dx**2 + dy**2 + dz**2)
-    acel = np.sqrt(ddx**2 + ddy**2 + ddz**2)
-    num = np.sqrt((dy*ddz - dz*ddy)**2 + (dz*ddx - dx*ddz)**2 + (dx*ddy - dy*ddx)**2)
-    curvatura = num / (vel**3 + 1e-25)
-    curvatura_norm = (curvatura - np.min(curvatura)) / (np.max(curvatura) - np.min(curvatura) + 1e-25)
-    V = T.max() * (curvatura_norm**2)
-    L = T - V
-    return T, V, L, vx, vy, vz, ddx, ddy, ddz
-
-fig_der = plt.figure(figsize=(10, 6))
-ax_der = fig_der.add_subplot(111)
-plt.subplots_adjust(left=0.25, bottom=0.35)
-
-def actualizar_der(val):
-    ax_der.cla()
-    r = slider_r_d.val
-    b = slider_b_d.val
-    omega = slider_omega_d.val
-    T, V, L, vx, vy, vz, axx, ayy, azz = calcular_derivadas(r, b, omega)
-    tiempo_fs = t_d * 1e15
-    ax_der.plot(tiempo_fs, T, label='T (Energía Cinética)', color='royalblue')
-    ax_der.plot(tiempo_fs, V, label='V (Estructural)', color='darkorange')
-    ax_der.plot(tiempo_fs, L, label='L = T - V', color='green')
-    ax_der.plot(tiempo_fs, vx, '--', label='dx/dt', alpha=0.4)
-    ax_der.plot(tiempo_fs, vy, '--', label='dy/dt', alpha=0.4)
-    ax_der.plot(tiempo_fs, vz, '--', label='dz/dt', alpha=0.4)
-    ax_der.plot(tiempo_fs, axx, ':', label='d²x/dt²', alpha=0.3)
-    ax_der.plot(tiempo_fs, ayy, ':', label='d²y/dt²', alpha=0.3)
-    ax_der.plot(tiempo_fs, azz, ':', label='d²z/dt²', alpha=0.3)
-    ax_der.set_title("Derivadas estructurales fundamentales desde ε₀")
-    ax_der.set_xlabel("Tiempo (fs)")
-    ax_der.set_ylabel("Magnitud")
-    ax_der.legend()
-    ax_der.grid(True, alpha=0.3)
-    fig_der.canvas.draw_idle()
-
-# Sliders
-ax_r_d = plt.axes([0.25, 0.23, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_b_d = plt.axes([0.25, 0.18, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-ax_omega_d = plt.axes([0.25, 0.13, 0.65, 0.03], facecolor='lightgoldenrodyellow')
-
-slider_r_d = Slider(ax_r_d, 'Radio r (m)', 1e-12, 2e-11, valinit=r0_d)
-slider_b_d = Slider(ax_b_d, 'Torsión b (m)', 1e-13, 5e-13, valinit=b0_d)
-slider_omega_d = Slider(ax_omega_d, 'Frecuencia ω (rad/s)', 2e15, 6e15, valinit=omega0_d)
-
-slider_r_d.on_changed(actualizar_der)
-slider_b_d.on_changed(actualizar_der)
-slider_omega_d.on_changed(actualizar_der)
-
-actualizar_der(None)
-plt.show()
\ No newline at end of file
+    return FuncAnimation(figura, update, frames=AZIMUTS_GIRO, interval=INTERVALO_GIRO)
+
+
+# Parámetros que `configurar` permite sustituir
+PARAMETROS = EstadoSimulacion.parametros_validos()
+
+
+def configurar(**valores):
+    """Sustituye parámetros del estado por defecto antes de construir las figuras.
+
+    Los ángulos van en radianes. El acoplamiento se recalcula con las
+    partículas resultantes; las figuras que reciben su propio `estado` no
+    se ven afectadas.
+    """
+    global ESTADO
+    ESTADO = ESTADO.con(**valores)
+
+
+# Figuras en el orden original del script
+FIGURAS = {
+    'fig': crear_fig,
+    'fig_interact1': crear_fig_interact1,
+    'fig2': crear_fig2,
+    'fig_interact2': crear_fig_interact2,
+    'fig3': crear_fig3,
+    'fig_interact3': crear_fig_interact3,
+    'fig4': crear_fig4,
+    'fig_interact4': crear_fig_interact4,
+    'fig5': crear_fig5,
+    'fig_interact5': crear_fig_interact5,
+    'fig6': crear_fig6,
+    'fig_interact6': crear_fig_interact6,
+    'fig7': crear_fig7,
+    'fig_interact7': crear_fig_interact7,
+    'fig8': crear_fig8,
+    'fig_interact8': crear_fig_interact8,
+    'fig9': crear_fig9,
+    'fig_interact9': crear_fig_interact9,
+    'fig10': crear_fig10,
+    'fig_interact10': crear_fig_interact10,
+    'fig11': crear_fig11,
+    'fig12': crear_fig12,
+    'fig_int': crear_fig_int,
+    'fig_lag': crear_fig_lag,
+    'fig13': crear_fig13,
+    'fig_der': crear_fig_der,
+}
+
+# Figuras 3D que se muestran girando
+ROTATORIAS = ('fig6', 'fig8', 'fig9', 'fig10')
+
+
+def main():
+    import matplotlib.pyplot as plt
+    for nombre, crear in FIGURAS.items():
+        fig = crear()
+        # La animación debe seguir referenciada mientras se muestra la figura
+        animacion = rotar(fig, fig.axes[0]) if nombre in ROTATORIAS else None
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
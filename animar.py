@@ -0,0 +1,205 @@
+"""Exportación de las vistas giratorias de TeoriaVacio como vídeo o GIF.
+
+Cada cuadro es la figura con uno de los acimuts de `rotar`
+(`TeoriaVacio.AZIMUTS_GIRO`). Los cuadros se dibujan con Agg en varios
+procesos, cada uno con su propia copia de la figura, y se envían en orden,
+sin PNG intermedios, a ffmpeg (mp4), al escritor de GIF de Pillow o a un
+archivo de vídeo crudo RGB24 que ffmpeg lee con `-f rawvideo`. Al terminar
+cada figura se informa de los cuadros por segundo.
+
+Uso: python animar.py [figura ...] [-f mp4|gif|raw] [-o DIR]
+                      [-p PARAMETROS.json] [-j PROCESOS] [--dpi N] [--paso GRADOS]
+"""
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from renderizar import cargar_estado
+
+FORMATOS = {'mp4': 'mp4', 'gif': 'gif', 'raw': 'rgb'}
+
+# Figuras ya construidas en este proceso y el estado con que se construyen
+_figuras = {}
+_estado = None
+
+
+def _iniciar(estado):
+    # Se ejecuta una vez por proceso, antes de importar pyplot
+    global _estado
+    import matplotlib
+    matplotlib.use('Agg')
+    _estado = estado
+
+
+def cuadro(nombre, azimut, dpi=None):
+    """Cuadro RGB (alto, ancho, 3) de la figura `nombre` vista desde `azimut`.
+
+    La figura se construye la primera vez y se reutiliza en los cuadros
+    siguientes que dibuje este mismo proceso.
+    """
+    import TeoriaVacio
+
+    fig = _figuras.get(nombre)
+    if fig is None:
+        fig = _figuras[nombre] = TeoriaVacio.FIGURAS[nombre](_estado)
+        if dpi:
+            fig.set_dpi(dpi)
+    fig.axes[0].view_init(elev=TeoriaVacio.ELEVACION_GIRO, azim=azimut)
+    fig.canvas.draw()
+    return np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[..., :3])
+
+
+def _en_orden(pool, nombre, azimuts, dpi, ventana):
+    # Como pool.map, pero con a lo sumo `ventana` cuadros pendientes: no se
+    # encargan (ni se guardan) todos de golpe
+    azimuts = iter(azimuts)
+    pendientes = deque(pool.submit(cuadro, nombre, azimut, dpi)
+                       for azimut in islice(azimuts, ventana))
+    try:
+        while pendientes:
+            imagen = pendientes.popleft().result()
+            for azimut in islice(azimuts, 1):
+                pendientes.append(pool.submit(cuadro, nombre, azimut, dpi))
+            yield imagen
+    finally:
+        for futuro in pendientes:
+            futuro.cancel()
+
+
+def _ffmpeg(ruta, cuadros, fps):
+    primero = next(cuadros, None)
+    if primero is None:
+        return 0
+    alto, ancho, _ = primero.shape
+    # libx264 con yuv420p exige dimensiones pares
+    orden = ['ffmpeg', '-loglevel', 'error', '-y',
+             '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{ancho}x{alto}', '-r', str(fps),
+             '-i', '-', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+             '-c:v', 'libx264', '-pix_fmt', 'yuv420p', ruta]
+    n = 0
+    with subprocess.Popen(orden, stdin=subprocess.PIPE) as proceso:
+        try:
+            for n, imagen in enumerate(chain([primero], cuadros), start=1):
+                proceso.stdin.write(imagen.tobytes())
+        finally:
+            proceso.stdin.close()
+    if proceso.returncode:
+        raise RuntimeError(f"ffmpeg terminó con código {proceso.returncode}")
+    return n
+
+
+def _gif(ruta, cuadros, fps):
+    from PIL import Image
+
+    contador = [0]
+
+    def imagenes():
+        for imagen in cuadros:
+            contador[0] += 1
+            yield Image.fromarray(imagen)
+
+    primero = next(cuadros, None)
+    if primero is None:
+        return 0
+    primero = Image.fromarray(primero)
+    primero.save(ruta, save_all=True, append_images=imagenes(),
+                 duration=round(1000 / fps), loop=0)
+    return 1 + contador[0]
+
+
+def _crudo(ruta, cuadros, fps):
+    n = 0
+    with open(ruta, 'wb') as archivo:
+        for n, imagen in enumerate(cuadros, start=1):
+            archivo.write(imagen.tobytes())
+    if not n:
+        return 0
+    alto, ancho, _ = imagen.shape
+    print(f"{ruta}: ffmpeg -f rawvideo -pix_fmt rgb24 -s {ancho}x{alto} -r {fps} -i {ruta} ...",
+          file=sys.stderr)
+    return n
+
+
+_ESCRITORES = {'mp4': _ffmpeg, 'gif': _gif, 'raw': _crudo}
+
+
+def exportar(nombre, ruta, formato='mp4', azimuts=None, dpi=None, pool=None, fps=None,
+             ventana=None):
+    """Escribe la vuelta completa de la figura `nombre` en `ruta`.
+
+    Los cuadros se dibujan con `pool` (un `ProcessPoolExecutor` iniciado
+    con `_iniciar`) o, sin él, en este proceso; con `pool` solo hay
+    `ventana` cuadros encargados a la vez (por defecto, dos por CPU).
+    Devuelve los cuadros escritos y los segundos empleados.
+    """
+    import TeoriaVacio
+
+    azimuts = TeoriaVacio.AZIMUTS_GIRO if azimuts is None else azimuts
+    fps = fps or 1000 / TeoriaVacio.INTERVALO_GIRO
+    inicio = time.perf_counter()
+    # Los cuadros llegan en orden aunque se dibujen en paralelo
+    if pool is None:
+        cuadros = (cuadro(nombre, azimut, dpi) for azimut in azimuts)
+    else:
+        cuadros = _en_orden(pool, nombre, azimuts, dpi, ventana or 2 * (os.cpu_count() or 1))
+    n = _ESCRITORES[formato](ruta, cuadros, fps)
+    return n, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    import TeoriaVacio
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('figuras', nargs='*',
+                        help="figuras a exportar (por defecto, las giratorias)")
+    parser.add_argument('-f', '--formato', choices=FORMATOS, default='mp4',
+                        help="mp4 (requiere ffmpeg), gif o raw (RGB24 sin cabecera)")
+    parser.add_argument('-o', '--salida', default='animaciones', help="directorio de salida")
+    parser.add_argument('-p', '--parametros', help="archivo JSON con parámetros a sustituir")
+    parser.add_argument('-j', '--procesos', type=int, default=os.cpu_count(),
+                        help="procesos que dibujan cuadros (1 = en este mismo proceso)")
+    parser.add_argument('--dpi', type=float, help="resolución de los cuadros")
+    parser.add_argument('--paso', type=float,
+                        help="grados entre cuadros (por defecto, los de `rotar`)")
+    args = parser.parse_args(argv)
+
+    nombres = args.figuras or list(TeoriaVacio.ROTATORIAS)
+    desconocidas = [n for n in nombres if n not in TeoriaVacio.FIGURAS]
+    if desconocidas:
+        parser.error(f"figuras desconocidas: {', '.join(desconocidas)}")
+    if args.formato == 'mp4' and shutil.which('ffmpeg') is None:
+        parser.error("no se encuentra ffmpeg; use -f gif o -f raw")
+    try:
+        estado = cargar_estado(args.parametros)
+    except ValueError as error:
+        parser.error(str(error))
+    azimuts = None if args.paso is None else np.arange(0, 360, args.paso)
+    os.makedirs(args.salida, exist_ok=True)
+
+    pool = None
+    if args.procesos > 1:
+        pool = ProcessPoolExecutor(args.procesos, initializer=_iniciar, initargs=(estado,))
+    else:
+        _iniciar(estado)
+    try:
+        for nombre in nombres:
+            ruta = os.path.join(args.salida, f"{nombre}.{FORMATOS[args.formato]}")
+            n, segundos = exportar(nombre, ruta, args.formato, azimuts, args.dpi, pool,
+                                   ventana=2 * args.procesos)
+            print(f"{ruta}: {n} cuadros en {segundos:.1f} s ({n / segundos:.1f} cuadros/s)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
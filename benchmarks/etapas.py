@@ -0,0 +1,216 @@
+"""Tiempos de cada etapa de la simulación a varios tamaños, guardados en JSON.
+
+Cada etapa se mide por separado: se prepara su entrada fuera del
+cronómetro, se ejecuta una vez para calentar (importaciones, cachés de
+matplotlib, compilación de Numba) y después se cronometra
+`--repeticiones` veces. Se guardan el mínimo y la mediana en segundos.
+
+Etapas (y qué mide su tamaño):
+
+- helices: hélices proyectivas de N partículas con 1000 puntos;
+- acoplamiento: mínima distancia real de N pares de hélices (fig3, fig9);
+- acoplamiento_lote: acoplamiento por índice de N pares en una llamada;
+- red: red de acoplamientos de N partículas (fig13);
+- dispersion: N ramas de dispersión toroidal de 1000 puntos (fig8);
+- derivadas: `calcular_derivadas` sobre N instantes;
+- campo: `SuperficieCampo` en una malla N × N: evaluarla (fig6) y sacar sus
+  polígonos (cada tick de fig_interact6);
+- render: construir y dibujar con Agg las figuras de `FIGURAS_RENDER` a N dpi.
+
+Con `--comparar` se contrasta con un JSON anterior y se termina con código
+1 si alguna medida es más lenta que `--umbral` veces la anterior.
+
+Uso: python -m benchmarks.etapas [etapa ...] [-o SALIDA.json]
+                                 [--tamanos N ...] [--repeticiones R]
+                                 [--comparar ANTERIOR.json] [--umbral 1.2]
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import platform
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+import TeoriaVacio
+from vacio import (
+    acoplamiento_exacto,
+    acoplamientos_indice,
+    backend,
+    calcular_derivadas,
+    helice_parametrica,
+    helices_proyectivas,
+    parametros_aleatorios,
+    parametros_dispersion,
+    ramas_dispersion,
+    red_acoplamientos_indexada,
+    SuperficieCampo,
+)
+
+FIGURAS_RENDER = ('fig3', 'fig8', 'fig13')
+
+
+def _helices(n):
+    params = parametros_aleatorios(n, seed=2025)
+    return lambda: helices_proyectivas(params)
+
+
+def _acoplamiento(n):
+    params = parametros_aleatorios(2 * n, seed=2025)
+    helices = [helice_parametrica(np.cos(A), W, B, 4 * np.pi) for A, _, W, B in params]
+
+    def medir():
+        for k in range(n):
+            acoplamiento_exacto(helices[2 * k], helices[2 * k + 1])
+    return medir
+
+
+def _acoplamiento_lote(n):
+    A, _, W, B = parametros_aleatorios(2 * n, seed=2025).T
+    helices = np.stack([np.cos(A), W, B, np.zeros_like(B)], axis=-1)
+    theta = np.linspace(0, 4 * np.pi, 1000)
+    return lambda: acoplamientos_indice(helices[0::2], helices[1::2], theta)
+
+
+def _red(n):
+    trayectorias = helices_proyectivas(parametros_aleatorios(n, seed=2025, rango_A=(15, 75)))
+    return lambda: red_acoplamientos_indexada(trayectorias, threshold=0.3)
+
+
+def _dispersion(n):
+    theta_vals = np.linspace(0, 2 * np.pi, 1000)
+    params = parametros_dispersion(n, seed=123)
+    origen = TeoriaVacio.ESTADO.acoplamiento.punto
+    return lambda: ramas_dispersion(theta_vals, params, origen)
+
+
+def _derivadas(n):
+    t = np.linspace(0, 1.5e-15, n)
+    return lambda: calcular_derivadas(7e-12, 2.2e-13, 4e15, t)
+
+
+def _campo(n):
+    # Con n nodos iniciales y como máximo la malla queda fija en n × n; las
+    # bases se calculan al construirla, una vez por figura
+    campo = SuperficieCampo(n_inicial=n, max_nodos=n)
+
+    def medir():
+        campo.evaluar()
+        campo.poligonos()
+    return medir
+
+
+def _render(dpi, figuras=FIGURAS_RENDER):
+    import matplotlib.pyplot as plt
+
+    def medir():
+        for nombre in figuras:
+            fig = TeoriaVacio.FIGURAS[nombre]()
+            fig.set_dpi(dpi)
+            fig.canvas.draw()
+            plt.close(fig)
+    return medir
+
+
+# Etapa: (preparar(tamaño) -> función a cronometrar, tamaños por defecto, unidad)
+ETAPAS = {
+    'helices': (_helices, (100, 1000, 10000), 'partículas'),
+    'acoplamiento': (_acoplamiento, (1, 10, 100), 'pares'),
+    'acoplamiento_lote': (_acoplamiento_lote, (10_000, 100_000, 1_000_000), 'pares'),
+    'red': (_red, (15, 100, 400), 'partículas'),
+    'dispersion': (_dispersion, (30, 300, 3000), 'ramas'),
+    'derivadas': (_derivadas, (1200, 100_000, 1_000_000), 'instantes'),
+    'campo': (_campo, (60, 200, 600), 'nodos por lado'),
+    'render': (_render, (50, 100, 200), 'dpi'),
+}
+
+
+def cronometrar(funcion, repeticiones):
+    """Segundos de cada una de `repeticiones` llamadas, tras una de calentamiento."""
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def medir(etapas, tamanos=None, repeticiones=5):
+    """Lista de resultados {'etapa', 'tamano', 'unidad', 'minimo', 'mediana', ...}."""
+    resultados = []
+    for nombre in etapas:
+        preparar, por_defecto, unidad = ETAPAS[nombre]
+        for tamano in tamanos or por_defecto:
+            tiempos = cronometrar(preparar(tamano), repeticiones)
+            resultados.append({'etapa': nombre, 'tamano': tamano, 'unidad': unidad,
+                               'minimo': min(tiempos), 'mediana': float(np.median(tiempos)),
+                               'repeticiones': repeticiones})
+            print(f"{nombre:<17} {tamano:>9} {unidad:<15} {min(tiempos):10.4f} s", flush=True)
+    return resultados
+
+
+def entorno():
+    """Metadatos de la máquina y las versiones con que se mide."""
+    return {'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__, 'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+            'nucleos': os.cpu_count(), 'backend': backend()}
+
+
+def comparar(actuales, anteriores, umbral=1.2):
+    """Imprime la razón actual / anterior de cada medida común; devuelve las regresiones."""
+    previos = {(r['etapa'], r['tamano']): r for r in anteriores}
+    regresiones = []
+    for r in actuales:
+        previo = previos.get((r['etapa'], r['tamano']))
+        if previo is None:
+            continue
+        razon = r['minimo'] / previo['minimo']
+        marca = ''
+        if razon > umbral:
+            regresiones.append(r)
+            marca = '  REGRESIÓN'
+        print(f"{r['etapa']:<17} {r['tamano']:>9} {previo['minimo']:10.4f} s -> "
+              f"{r['minimo']:10.4f} s  x{razon:5.2f}{marca}")
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('etapas', nargs='*', help="etapas a medir (por defecto, todas)")
+    parser.add_argument('-o', '--salida', default='etapas.json', help="archivo JSON de resultados")
+    parser.add_argument('--tamanos', type=int, nargs='+',
+                        help="tamaños a medir en cada etapa (por defecto, los de cada una)")
+    parser.add_argument('--repeticiones', type=int, default=5, help="mediciones por tamaño")
+    parser.add_argument('--comparar', help="JSON de una ejecución anterior")
+    parser.add_argument('--umbral', type=float, default=1.2,
+                        help="razón de tiempos a partir de la cual hay regresión")
+    args = parser.parse_args(argv)
+
+    desconocidas = [e for e in args.etapas if e not in ETAPAS]
+    if desconocidas:
+        parser.error(f"etapas desconocidas: {', '.join(desconocidas)}")
+    anteriores = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            anteriores = json.load(archivo)['resultados']
+
+    resultados = medir(args.etapas or list(ETAPAS), args.tamanos, args.repeticiones)
+    with open(args.salida, 'w', encoding='utf-8') as archivo:
+        json.dump({'entorno': entorno(), 'resultados': resultados}, archivo,
+                  indent=2, ensure_ascii=False)
+    print(f"resultados en {args.salida}")
+    if anteriores is not None and comparar(resultados, anteriores, args.umbral):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
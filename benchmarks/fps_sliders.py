@@ -0,0 +1,50 @@
+"""Fotogramas por segundo de los callbacks de sliders, sin pantalla.
+
+Cada figura interactiva se dibuja una vez con el backend Agg y después se
+recorre su primer slider de extremo a extremo; cada cambio de valor cuenta
+como un fotograma (cálculo + actualización de artistas + redibujo).
+
+Uso: python -m benchmarks.fps_sliders [--ticks N] [figura ...]
+"""
+import argparse
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+import TeoriaVacio
+
+
+def medir_fps(crear, ticks):
+    import matplotlib.pyplot as plt
+    fig = crear()
+    fig.canvas.draw()
+    slider = fig.sliders[0]
+    valores = np.linspace(slider.valmin, slider.valmax, ticks)
+    inicio = time.perf_counter()
+    for valor in valores:
+        slider.set_val(valor)
+    fps = ticks / (time.perf_counter() - inicio)
+    plt.close(fig)
+    return fps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('figuras', nargs='*', help="figuras a medir (por defecto, todas las interactivas)")
+    parser.add_argument('--ticks', type=int, default=50, help="cambios de slider por figura")
+    args = parser.parse_args(argv)
+
+    # Sin límite de refresco: se mide cada tick
+    TeoriaVacio.INTERVALO_REFRESCO = 0
+    nombres = args.figuras or [n for n in TeoriaVacio.FIGURAS
+                               if 'interact' in n or n in ('fig_int', 'fig_der')]
+    for nombre in nombres:
+        fps = medir_fps(TeoriaVacio.FIGURAS[nombre], args.ticks)
+        print(f"{nombre:<16} {fps:8.1f} fps")
+
+
+if __name__ == '__main__':
+    main()
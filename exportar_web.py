@@ -0,0 +1,118 @@
+"""Exportación de conjuntos grandes a un visor WebGL autónomo (sin red).
+
+Genera `n` partículas aleatorias como en fig5/fig13 (en varios procesos),
+busca su red de acoplamientos, añade la dispersión toroidal de fig8 desde
+el acoplamiento del estado y la superficie del campo radial de fig6, y lo
+escribe todo con `vacio.escena.EscenaWeb`: búferes binarios más un
+`index.html` que se abre sin conexión y gira la escena en el navegador.
+Las trayectorias se simplifican antes (`vacio.detalle.decimar`) sin
+apartarse más de `--tolerancia` píxeles en una ventana de 1000 píxeles.
+
+Uso: python exportar_web.py [-n PARTICULAS] [-o DIR] [-p PARAMETROS.json]
+                            [--puntos N] [--umbral U] [--max-aristas K]
+                            [--ramas K] [--sin-campo] [--tolerancia PX]
+                            [--seed S] [-j PROCESOS]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from renderizar import cargar_estado
+from vacio import (
+    EscenaWeb,
+    SuperficieCampo,
+    decimar,
+    generar_conjunto,
+    parametros_dispersion,
+    ramas_dispersion,
+    red_acoplamientos_indexada,
+)
+
+# Lado de la ventana del visor con que se fija la tolerancia, en píxeles
+PIXELES_VISOR = 1000
+
+
+def _mapa(nombre, n):
+    # Colores (n, 4) de un mapa de matplotlib, como en las figuras
+    import matplotlib
+    return matplotlib.colormaps[nombre](np.arange(n) / max(n, 1))
+
+
+def construir_escena(n, estado, seed=2025, n_puntos=1000, umbral=0.02, max_aristas=200_000,
+                     ramas=30, campo=True, tolerancia=0.5, procesos=None):
+    """`EscenaWeb` con las trayectorias, la red, la dispersión y el campo."""
+    escena = EscenaWeb(f"Espacio proyectivo desde ε₀: {n:,} partículas")
+    conjunto = generar_conjunto(n, seed=seed, n_puntos=n_puntos, procesos=procesos,
+                                dtype=np.float32, rango_A=(15, 75))
+    trayectorias = conjunto.trayectorias
+    try:
+        escala = PIXELES_VISOR / max(np.ptp(trayectorias.reshape(-1, 3), axis=0).max(), 1e-9)
+        colores = _mapa('viridis', n)
+        colores[:, 3] = 0.8
+        escena.curvas(decimar(trayectorias, tolerancia / escala), colores, nombre='trayectorias')
+
+        # Los pares más cercanos si la red supera `max_aristas`
+        pares, indices, distancias = red_acoplamientos_indexada(trayectorias, umbral)
+        if len(pares) > max_aristas:
+            elegidos = np.argpartition(distancias, max_aristas)[:max_aristas]
+            pares, indices = pares[elegidos], indices[elegidos]
+        escena.aristas(trayectorias[pares[:, 0], indices], trayectorias[pares[:, 1], indices],
+                       (0, 0, 0, 0.5), nombre='acoplamientos')
+    finally:
+        # La memoria compartida no se libera mientras queden vistas de ella
+        trayectorias = None
+        conjunto.cerrar()
+
+    if ramas:
+        theta_vals = np.linspace(0, 2 * np.pi, n_puntos)
+        dispersion = ramas_dispersion(theta_vals, parametros_dispersion(ramas, seed=123),
+                                      estado.acoplamiento.punto)
+        escena.curvas(decimar(dispersion, tolerancia / escala), _mapa('coolwarm', ramas),
+                      nombre='dispersión')
+    if campo:
+        vertices, indices = SuperficieCampo().buferes()
+        z = vertices.reshape(-1, 3)[:, 2]
+        colores = _mapa('viridis', 256)[np.round((z - z.min()) / np.ptp(z) * 255).astype(int)]
+        colores[:, 3] = 0.5
+        escena.superficie(vertices, indices, colores, nombre='campo radial')
+    return escena
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--particulas', type=int, default=10_000, help="partículas a exportar")
+    parser.add_argument('-o', '--salida', default='escena_web', help="directorio de salida")
+    parser.add_argument('-p', '--parametros', help="archivo JSON con parámetros a sustituir")
+    parser.add_argument('--puntos', type=int, default=1000, help="puntos por trayectoria")
+    # Con miles de partículas el 0.3 de fig13 acopla casi todo cerca de ε₀
+    parser.add_argument('--umbral', type=float, default=0.02, help="distancia de acoplamiento")
+    parser.add_argument('--max-aristas', type=int, default=200_000,
+                        help="acoplamientos como máximo (los más cercanos)")
+    parser.add_argument('--ramas', type=int, default=30, help="ramas de dispersión (0 = ninguna)")
+    parser.add_argument('--sin-campo', action='store_true', help="omite la superficie del campo")
+    parser.add_argument('--tolerancia', type=float, default=0.5,
+                        help="desvío máximo de las trayectorias simplificadas, en píxeles")
+    parser.add_argument('--seed', type=int, default=2025, help="semilla de las partículas")
+    parser.add_argument('-j', '--procesos', type=int, default=os.cpu_count(),
+                        help="procesos que generan las trayectorias")
+    args = parser.parse_args(argv)
+
+    try:
+        estado = cargar_estado(args.parametros)
+    except ValueError as error:
+        parser.error(str(error))
+    inicio = time.perf_counter()
+    escena = construir_escena(args.particulas, estado, args.seed, args.puntos, args.umbral,
+                              args.max_aristas, args.ramas, not args.sin_campo,
+                              args.tolerancia, args.procesos)
+    ruta = escena.guardar(args.salida)
+    tamano = os.path.getsize(os.path.join(args.salida, 'escena.bin'))
+    print(f"{ruta}: {tamano / 2**20:.1f} MB de búferes en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Renderizado sin pantalla de las figuras de TeoriaVacio.
+
+Cada figura se construye con el backend Agg (las interactivas con los
+valores iniciales de sus sliders) y se guarda como PNG, SVG o PDF. Las
+figuras se reparten entre procesos. Un archivo JSON opcional sustituye
+parámetros del estado de la simulación (ver `TeoriaVacio.PARAMETROS`),
+por ejemplo {"B_modificado": 0.4, "a1": 0.6}.
+
+Con `--perfil` se activa `vacio.perfil` en todos los procesos y al final
+se imprime el tiempo de cada etapa: cálculos de `vacio`, construcción de
+cada figura (`<figura>.construir`, cuyo tiempo propio es el de crear los
+artistas) y su dibujo y escritura (`<figura>.guardar_<formato>`). Si se
+da una ruta, allí se escribe además la traza de Chrome.
+
+Uso: python renderizar.py [figura ...] [-f png|svg|pdf] [-o DIR]
+                          [-p PARAMETROS.json] [-j PROCESOS] [--dpi N]
+                          [--perfil [TRAZA.json]] [--perfil-memoria]
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from vacio import perfil
+
+FORMATOS = ('png', 'svg', 'pdf')
+
+
+def cargar_estado(ruta=None):
+    """Estado por defecto de TeoriaVacio con los parámetros del JSON `ruta`.
+
+    Lanza ValueError si el archivo no es JSON válido o nombra parámetros
+    desconocidos.
+    """
+    import TeoriaVacio
+
+    estado = TeoriaVacio.ESTADO
+    if ruta:
+        with open(ruta, encoding='utf-8') as archivo:
+            estado = estado.con(**json.load(archivo))
+    # El acoplamiento se calcula aquí una vez y viaja con el estado a cada proceso
+    estado.acoplamiento
+    return estado
+
+
+def _iniciar():
+    # Se ejecuta una vez por proceso, antes de importar pyplot
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def renderizar(nombre, directorio, formatos=('png',), dpi=None, estado=None):
+    """Construye la figura `nombre` y la guarda en cada formato; devuelve las rutas.
+
+    `estado` es el `EstadoSimulacion` de la figura (por defecto, el del módulo).
+    """
+    import matplotlib.pyplot as plt
+    import TeoriaVacio
+
+    with perfil.seccion(f"{nombre}.construir"):
+        fig = TeoriaVacio.FIGURAS[nombre](estado)
+    rutas = []
+    try:
+        for formato in formatos:
+            ruta = os.path.join(directorio, f"{nombre}.{formato}")
+            with perfil.seccion(f"{nombre}.guardar_{formato}"):
+                fig.savefig(ruta, dpi=dpi)
+            rutas.append(ruta)
+    finally:
+        plt.close(fig)
+    return rutas
+
+
+def _renderizar_con_perfil(memoria, *args):
+    # En cada proceso: perfila una figura y devuelve su registro
+    perfil.reiniciar()
+    perfil.activar(memoria)
+    try:
+        return renderizar(*args), perfil.registro()
+    finally:
+        perfil.desactivar()
+
+
+def _informar_perfil(traza):
+    print(perfil.resumen(), file=sys.stderr)
+    if traza:
+        perfil.guardar_traza(traza)
+        print(f"traza en {traza}", file=sys.stderr)
+
+
+def main(argv=None):
+    import TeoriaVacio
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('figuras', nargs='*', help="figuras a guardar (por defecto, todas)")
+    parser.add_argument('-f', '--formato', action='append', choices=FORMATOS,
+                        help="formato de salida; puede repetirse (por defecto, png)")
+    parser.add_argument('-o', '--salida', default='figuras', help="directorio de salida")
+    parser.add_argument('-p', '--parametros', help="archivo JSON con parámetros a sustituir")
+    parser.add_argument('-j', '--procesos', type=int, default=os.cpu_count(),
+                        help="procesos en paralelo (1 = en este mismo proceso)")
+    parser.add_argument('--dpi', type=float, help="resolución de las imágenes PNG")
+    parser.add_argument('--perfil', nargs='?', const='', metavar='TRAZA.json',
+                        help="mide cada etapa; con ruta, guarda también la traza de Chrome")
+    parser.add_argument('--perfil-memoria', action='store_true',
+                        help="con --perfil, mide además el pico de memoria (más lento)")
+    args = parser.parse_args(argv)
+
+    nombres = args.figuras or list(TeoriaVacio.FIGURAS)
+    desconocidas = [n for n in nombres if n not in TeoriaVacio.FIGURAS]
+    if desconocidas:
+        parser.error(f"figuras desconocidas: {', '.join(desconocidas)}")
+    try:
+        estado = cargar_estado(args.parametros)
+    except ValueError as error:
+        parser.error(str(error))
+    formatos = tuple(dict.fromkeys(args.formato or ['png']))
+    os.makedirs(args.salida, exist_ok=True)
+
+    perfilar = args.perfil is not None
+    if args.procesos <= 1:
+        _iniciar()
+        if perfilar:
+            perfil.activar(args.perfil_memoria)
+        for nombre in nombres:
+            for ruta in renderizar(nombre, args.salida, formatos, args.dpi, estado):
+                print(ruta)
+        if perfilar:
+            perfil.desactivar()
+            _informar_perfil(args.perfil)
+        return 0
+
+    fallidas = 0
+    with ProcessPoolExecutor(min(args.procesos, len(nombres)), initializer=_iniciar) as pool:
+        tareas = {}
+        for nombre in nombres:
+            argumentos = (nombre, args.salida, formatos, args.dpi, estado)
+            if perfilar:
+                tarea = pool.submit(_renderizar_con_perfil, args.perfil_memoria, *argumentos)
+            else:
+                tarea = pool.submit(renderizar, *argumentos)
+            tareas[tarea] = nombre
+        for tarea in as_completed(tareas):
+            try:
+                rutas = tarea.result()
+            except Exception as error:
+                fallidas += 1
+                print(f"{tareas[tarea]}: {error!r}", file=sys.stderr)
+                continue
+            if perfilar:
+                rutas, registro = rutas
+                perfil.combinar(registro)
+            print(*rutas, sep='\n')
+    if perfilar:
+        _informar_perfil(args.perfil)
+    return 1 if fallidas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
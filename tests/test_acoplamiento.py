@@ -0,0 +1,75 @@
+import numpy as np
+
+from vacio.acoplamiento import (
+    acoplamiento_exacto,
+    acoplamiento_indice,
+    acoplamientos_indice,
+    helice_parametrica,
+)
+
+
+def _curva(helice, theta):
+    radio, fase, paso, z0 = helice
+    return (radio * np.cos(theta + fase), radio * np.sin(theta + fase), paso * theta + z0)
+
+
+def test_acoplamientos_indice_coincide_par_a_par():
+    rng = np.random.default_rng(0)
+    m = 400
+    theta = np.linspace(0, 4 * np.pi, 1000)
+    helices1 = np.column_stack([rng.uniform(0.2, 1, m), rng.uniform(0, 2 * np.pi, m),
+                                rng.uniform(0.1, 0.35, m), rng.uniform(-1, 1, m)])
+    helices2 = np.column_stack([rng.uniform(0.2, 1, m), rng.uniform(0, 2 * np.pi, m),
+                                rng.uniform(0.1, 0.35, m), rng.uniform(-1, 1, m)])
+    # Un cuarto de los pares con el mismo paso: distancia constante en t
+    mismo_paso = np.arange(m) % 4 == 0
+    helices2[mismo_paso, 2] = helices1[mismo_paso, 2]
+
+    indices, distancias, puntos = acoplamientos_indice(helices1, helices2, theta)
+    for k in range(m):
+        indice, distancia, punto = acoplamiento_indice(_curva(helices1[k], theta),
+                                                       _curva(helices2[k], theta))
+        assert np.isclose(distancias[k], distancia, rtol=1e-9, atol=1e-12)
+        if mismo_paso[k]:
+            # El lote toma el índice 0; la referencia, el que deje el redondeo
+            assert indices[k] == 0
+            c1, c2 = _curva(helices1[k], theta[:1]), _curva(helices2[k], theta[:1])
+            punto = [(a[0] + b[0]) / 2 for a, b in zip(c1, c2)]
+        else:
+            assert indices[k] == indice
+        np.testing.assert_allclose(puntos[k], punto, atol=1e-12)
+
+
+def _minimo_malla(helice1, helice2, n=2000):
+    s = np.linspace(0, helice1[4], n)
+    t = np.linspace(0, helice2[4], n)
+    p1 = np.stack(_curva(helice1[:4], s), axis=-1)
+    p2 = np.stack(_curva(helice2[:4], t), axis=-1)
+    return np.sqrt(((p1[:, None] - p2[None])**2).sum(-1).min())
+
+
+def test_acoplamiento_exacto_en_esquina():
+    # El mínimo está en la esquina s = s_fin, t = 0
+    helice1 = helice_parametrica(0.5157408430885313, 1.9584722455443706, 0.5462469723501512,
+                                 2.407518506474062, z0=-0.8452938678377855)
+    helice2 = helice_parametrica(1.6970628883940584, 4.721868058387361, 0.5518632910123107,
+                                 1.7491198974970386)
+    s, t, distancia, _ = acoplamiento_exacto(helice1, helice2)
+    assert (s, t) == (helice1[4], 0.0)
+    assert distancia <= _minimo_malla(helice1, helice2)
+
+
+def test_acoplamiento_exacto_no_supera_la_malla():
+    rng = np.random.default_rng(1)
+    for _ in range(40):
+        helice1 = helice_parametrica(rng.uniform(-1, 2), rng.uniform(0, 2 * np.pi),
+                                     rng.uniform(-0.5, 0.5), rng.uniform(0.5, 15),
+                                     z0=rng.uniform(-3, 3))
+        helice2 = helice_parametrica(rng.uniform(-1, 2), rng.uniform(0, 2 * np.pi),
+                                     rng.uniform(-0.5, 0.5), rng.uniform(0.5, 15))
+        s, t, distancia, punto = acoplamiento_exacto(helice1, helice2)
+        p1 = np.array(_curva(helice1[:4], s))
+        p2 = np.array(_curva(helice2[:4], t))
+        assert np.isclose(distancia, np.linalg.norm(p1 - p2))
+        np.testing.assert_allclose(punto, (p1 + p2) / 2)
+        assert distancia <= _minimo_malla(helice1, helice2) + 1e-12
@@ -0,0 +1,70 @@
+import numpy as np
+
+from vacio.acoplamiento import red_acoplamientos_indexada
+from vacio.dinamica import DinamicaAcoplamientos
+from vacio.trayectorias import helices_proyectivas, parametros_aleatorios
+
+
+def _fuerza_bruta(params, threshold, dt, B_modificado, origen, pasos):
+    # Todos los pares en cada paso, con el mismo modelo que DinamicaAcoplamientos
+    radio, S, fase = np.cos(params[:, 0]), params[:, 1], params[:, 2]
+    ascenso = params[:, 3] * S
+    origen = origen.copy()
+    dentro = np.zeros((len(params), len(params)), dtype=bool)
+    eventos = []
+    for paso in range(pasos + 1):
+        t = paso * dt
+        posiciones = np.stack([radio * np.cos(S * t + fase), radio * np.sin(S * t + fase),
+                               ascenso * t], axis=1) + origen
+        ahora = np.sqrt(((posiciones[:, None] - posiciones[None])**2).sum(-1)) < threshold
+        i, j = np.nonzero(np.triu(ahora & ~dentro, 1))
+        eventos += [(paso, a, b) for a, b in zip(i.tolist(), j.tolist())]
+        dentro = ahora
+        if B_modificado is not None and len(i):
+            acopladas = np.unique(np.r_[i, j])
+            ascenso[acopladas] = B_modificado * S[acopladas]
+            origen[acopladas, 2] = posiciones[acopladas, 2] - ascenso[acopladas] * t
+    return eventos
+
+
+def _eventos(dinamica):
+    eventos = dinamica.eventos()
+    return list(zip(eventos['paso'].tolist(), eventos['i'].tolist(), eventos['j'].tolist()))
+
+
+def test_coincide_con_fuerza_bruta():
+    rng = np.random.default_rng(0)
+    params = parametros_aleatorios(50, seed=0)
+    origen = np.zeros((50, 3))
+    origen[:, 2] = rng.uniform(-1, 1, 50)
+    for B_modificado in (0.35, None):
+        dinamica = DinamicaAcoplamientos(params, threshold=0.3, dt=0.02,
+                                         B_modificado=B_modificado, origen=origen)
+        dinamica.avanzar(300)
+        assert _eventos(dinamica) == _fuerza_bruta(params, 0.3, 0.02, B_modificado, origen, 300)
+
+
+def test_acoplamientos_repartidos_en_el_tiempo():
+    # Con alturas iniciales distintas y cada partícula a su ritmo S, los
+    # pares se cruzan en instantes distintos, no todos al empezar
+    rng = np.random.default_rng(1)
+    params = parametros_aleatorios(200, seed=1)
+    origen = np.zeros((200, 3))
+    origen[:, 2] = rng.uniform(-3, 3, 200)
+    dinamica = DinamicaAcoplamientos(params, threshold=0.3, dt=0.02, origen=origen)
+    dinamica.avanzar(500)
+    pasos = dinamica.eventos()['paso']
+    assert len(np.unique(pasos)) > 100
+    assert np.mean(pasos > 250) > 0.2
+
+
+def test_pares_de_la_red_de_fig13():
+    # Sin cambio de torsión, el paso k es el punto k de `helices_proyectivas`
+    n = 200
+    params = parametros_aleatorios(300, seed=3)
+    pares, _, _ = red_acoplamientos_indexada(helices_proyectivas(params, n), threshold=0.3)
+    dinamica = DinamicaAcoplamientos(params, threshold=0.3, dt=2 * np.pi / (n - 1),
+                                     B_modificado=None)
+    dinamica.avanzar(n - 1)
+    eventos = dinamica.eventos()
+    assert set(zip(eventos['i'].tolist(), eventos['j'].tolist())) == set(map(tuple, pares.tolist()))
@@ -0,0 +1,70 @@
+"""Motor numérico de la teoría estructural del vacío.
+
+Todo el paquete depende únicamente de numpy; las figuras viven en
+TeoriaVacio.py y, junto con `vacio.graficos`, cargan matplotlib solo
+cuando se dibujan.
+"""
+from .trayectorias import (
+    eje_angular,
+    helice_proyectiva,
+    helices_proyectivas,
+    helice_real,
+    rotacion_doble,
+    trayectoria_modificada,
+    parametros_aleatorios,
+    dispersion_toroidal,
+    parametros_dispersion,
+    ramas_dispersion,
+)
+from .acoplamiento import (
+    helice_parametrica,
+    acoplamiento_exacto,
+    acoplamiento_indice,
+    acoplamientos_indice,
+    red_acoplamientos,
+    red_acoplamientos_indexada,
+)
+from .campo import malla_esferica, campo_radial, SuperficieCampo, CampoArmonico, campo_armonico
+from .lagrangiano import (
+    hbar_estructural,
+    energia_estructural,
+    lagrangiano_direccional,
+    lagrangiano_estructural,
+    calcular_derivadas,
+    barrido_lagrangiano,
+)
+from .geometria import (
+    derivadas_helice,
+    derivadas_rotacion_doble,
+    derivadas_rama,
+    derivadas_numericas,
+    curvatura,
+    torsion,
+    curvatura_helice,
+    torsion_helice,
+)
+from .memoria import CacheLRU, cuantizar, memorizar
+from .estado import Acoplamiento, EstadoSimulacion, acoplar
+from .flujo import (
+    lotes_parejas,
+    parejas_aleatorias,
+    etapa,
+    flujo,
+    etapa_acoplamiento,
+    etapa_modificacion,
+    etapa_dispersion,
+    etapa_ramificacion,
+)
+from .paralelo import ConjuntoCompartido, generar_conjunto
+from .almacen import AlmacenTrayectorias
+from .dinamica import DinamicaAcoplamientos
+from .nucleos import (
+    usar_backend,
+    backend,
+    helices,
+    distancia_minima,
+    curvatura_frenet,
+    verificar,
+)
+from .detalle import TOLERANCIA_PX, puntos_helices, eje_adaptativo, rdp, decimar
+from .escena import EscenaWeb
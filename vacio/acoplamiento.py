@@ -0,0 +1,382 @@
+"""Acoplamiento estructural entre trayectorias (solo numpy)."""
+import numpy as np
+
+from .perfil import perfilar
+
+
+@perfilar
+def acoplamiento_indice(curva1, curva2):
+    """Acoplamiento como mínima distancia entre puntos del mismo índice.
+
+    Devuelve el índice del acoplamiento, la distancia en ese índice y el
+    punto medio entre ambas curvas.
+    """
+    x1, y1, z1 = curva1
+    x2, y2, z2 = curva2
+    distancias = np.sqrt((x1 - x2)**2 + (y1 - y2)**2 + (z1 - z2)**2)
+    indice_min = np.argmin(distancias)
+    punto = ((x1[indice_min] + x2[indice_min]) / 2,
+             (y1[indice_min] + y2[indice_min]) / 2,
+             (z1[indice_min] + z2[indice_min]) / 2)
+    return indice_min, distancias[indice_min], punto
+
+
+@perfilar
+def acoplamientos_indice(helices1, helices2, theta, chunk=1 << 20):
+    """`acoplamiento_indice` de M pares de hélices muestreadas en el mismo `theta`.
+
+    `helices1` y `helices2` son arreglos (M, 4) o (M, 5) de tuplas de
+    `helice_parametrica` (t_fin no se usa) y `theta` es el eje creciente
+    común. Con el mismo t en ambas hélices
+
+        |c1(t) - c2(t)|² = (r1 - r2)² + 4·r1·r2·sin²((f1 - f2) / 2) + (Δpaso·t + Δz0)²,
+
+    cuya parte en XY no depende de t y cuya parte en z es una parábola con
+    el mínimo en t* = -Δz0 / Δpaso. El índice del acoplamiento es, por
+    tanto, el de la mejor de las dos muestras que rodean t*, y no hace
+    falta generar las curvas: cada par cuesta unas pocas operaciones. Los
+    pares se procesan en pasadas de `chunk`.
+
+    Devuelve `(indices, distancias, puntos)` de formas (M,), (M,) y (M, 3).
+    Las distancias son las que daría `acoplamiento_indice` par a par, y el
+    índice y el punto también, salvo en los empates: entre las dos muestras
+    se queda con la primera y, con el mismo paso (Δpaso = 0), en que la
+    distancia no depende de t, devuelve el índice 0. `acoplamiento_indice`
+    elige entonces la muestra que deje el redondeo, en cualquier punto de
+    la curva.
+    """
+    helices1 = np.asarray(helices1, dtype=float)
+    helices2 = np.asarray(helices2, dtype=float)
+    theta = np.asarray(theta, dtype=float)
+    m, n = len(helices1), len(theta)
+    indices = np.empty(m, dtype=np.intp)
+    distancias = np.empty(m)
+    puntos = np.empty((m, 3))
+    for inicio in range(0, m, chunk):
+        bloque = slice(inicio, inicio + chunk)
+        r1, f1, p1, z1 = helices1[bloque, :4].T
+        r2, f2, p2, z2 = helices2[bloque, :4].T
+        dp, dz = p1 - p2, z1 - z2
+        plano2 = (r1 - r2)**2 + 4 * r1 * r2 * np.sin((f1 - f2) / 2)**2
+
+        # Muestras a cada lado del mínimo de la parábola; con el mismo paso
+        # la distancia es constante y gana la primera
+        t_min = np.divide(-dz, dp, out=np.full_like(dz, -np.inf), where=dp != 0)
+        derecha = np.minimum(np.searchsorted(theta, t_min), n - 1)
+        izquierda = np.maximum(derecha - 1, 0)
+        altura_izq = (dp * theta[izquierda] + dz)**2
+        altura_der = (dp * theta[derecha] + dz)**2
+        indice = np.where(altura_izq <= altura_der, izquierda, derecha)
+
+        t = theta[indice]
+        indices[bloque] = indice
+        distancias[bloque] = np.sqrt(plano2 + np.minimum(altura_izq, altura_der))
+        puntos[bloque, 0] = (r1 * np.cos(t + f1) + r2 * np.cos(t + f2)) / 2
+        puntos[bloque, 1] = (r1 * np.sin(t + f1) + r2 * np.sin(t + f2)) / 2
+        puntos[bloque, 2] = ((p1 + p2) * t + z1 + z2) / 2
+    return indices, distancias, puntos
+
+
+def helice_parametrica(radio, fase, paso, t_fin, z0=0.0):
+    """Describe la hélice (radio·cos(t+fase), radio·sin(t+fase), paso·t + z0), t ∈ [0, t_fin].
+
+    Cubre tanto `helice_proyectiva` (radio = cos A, fase = W, paso = B)
+    como `helice_real`.
+    """
+    return (float(radio), float(fase), float(paso), float(z0), float(t_fin))
+
+
+def _evaluar(helice, t):
+    radio, fase, paso, z0, _ = helice
+    return np.stack([radio * np.cos(t + fase), radio * np.sin(t + fase), paso * t + z0], axis=-1)
+
+
+# Tope de pasos de Newton acotado: aun bisecando siempre, 60 llegan a la precisión de un double
+_ITERACIONES_BORDE = 60
+
+
+def _minimos_borde(A, fase, beta, gamma, lo, hi, tol):
+    # Candidatos a mínimo de g(x) = -A·cos(x + fase) + (beta·x + gamma)² en
+    # [lo, hi], para P problemas a la vez (arreglos (P,), A >= 0): los dos
+    # extremos y las raíces de g'. g'' = A·cos(x + fase) + 2·beta² es
+    # positiva en un intervalo de semiancho α alrededor de cada valle del
+    # coseno (x + fase = 2πk) y g' crece en él, así que cada mínimo interior
+    # es la única raíz de g' en uno de esos intervalos. Además, g' = 0 exige
+    # |2·beta·(beta·x + gamma)| <= A, lo que acota los valles que revisar.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        alfa = np.arccos(np.clip(np.nan_to_num(-2 * beta**2 / A, nan=-1.0, neginf=-1.0), -1, 1))
+        centro = -gamma / beta
+        ancho = A / (2 * beta**2)
+    desde = np.where(beta != 0, np.maximum(lo, centro - ancho), lo)
+    hasta = np.where(beta != 0, np.minimum(hi, centro + ancho), hi)
+    k_min = np.ceil((desde + fase - alfa) / (2 * np.pi))
+    k_max = np.floor((hasta + fase + alfa) / (2 * np.pi))
+    valles = np.maximum(k_max - k_min + 1, 0).astype(np.intp)
+
+    problema = np.repeat(np.arange(len(A)), valles)
+    k = k_min[problema] + np.arange(valles.sum()) - np.repeat(np.cumsum(valles) - valles, valles)
+    valle = 2 * np.pi * k - fase[problema]
+    a = np.maximum(valle - alfa[problema], lo[problema])
+    b = np.minimum(valle + alfa[problema], hi[problema])
+    A_, fase_, beta_, gamma_ = A[problema], fase[problema], beta[problema], gamma[problema]
+
+    def derivada(x):
+        return A_ * np.sin(x + fase_) + 2 * beta_ * (beta_ * x + gamma_)
+
+    con_raiz = (a < b) & (derivada(a) <= 0) & (derivada(b) >= 0)
+    problema, a, b = problema[con_raiz], a[con_raiz], b[con_raiz]
+    A_, fase_, beta_, gamma_ = A_[con_raiz], fase_[con_raiz], beta_[con_raiz], gamma_[con_raiz]
+    # Newton acotado: la raíz sigue en [a, b] y, si el paso se sale, se biseca
+    x = (a + b) / 2
+    for _ in range(_ITERACIONES_BORDE):
+        gx = derivada(x)
+        a = np.where(gx < 0, x, a)
+        b = np.where(gx < 0, b, x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            siguiente = x - gx / (A_ * np.cos(x + fase_) + 2 * beta_**2)
+        fuera = ~((siguiente > a) & (siguiente < b))
+        siguiente[fuera] = (a[fuera] + b[fuera]) / 2
+        cambio = np.abs(siguiente - x).max(initial=0)
+        x = siguiente
+        if cambio < tol:
+            break
+    indices = np.arange(len(A))
+    return (np.concatenate([indices, indices, problema]),
+            np.concatenate([lo, hi, x]))
+
+
+@perfilar
+def acoplamiento_exacto(helice1, helice2, tol=1e-9):
+    """Mínima distancia real entre dos hélices paramétricas.
+
+    Las hélices se describen con `helice_parametrica`. Con s y t los
+    parámetros de cada una,
+
+        |c1(s) - c2(t)|² = r1² + r2² - 2·r1·r2·cos(u) + v²,
+        u = s - t + f1 - f2,  v = paso1·s - paso2·t + z1 - z2,
+
+    así que los únicos mínimos interiores son los de u = 2πk y v = 0, a
+    distancia |r1 - r2|, la menor posible. Si ninguno cae en el dominio, el
+    mínimo está en un borde, y en cada borde la distancia es una función
+    de una variable de la forma -A·cos(x + φ) + (β·x + γ)², cuyos mínimos
+    se hallan valle a valle del coseno con Newton acotado sobre la
+    derivada, hasta que el paso es menor que `tol` en parámetro. Se
+    comparan todos los candidatos, esquinas incluidas.
+
+    Devuelve `(s, t, distancia, punto)`: los parámetros del acercamiento
+    en cada hélice, la distancia y el punto medio de acoplamiento.
+    """
+    r1, f1, paso1, z1, s_fin = helice1
+    r2, f2, paso2, z2, t_fin = helice2
+    # Con radios de signo opuesto el coseno cambia de signo: media vuelta de fase
+    A = 2 * abs(r1 * r2)
+    df = f1 - f2 + (np.pi if r1 * r2 < 0 else 0.0)
+    dz = z1 - z2
+
+    # Bordes s = 0, s = s_fin (en t) y t = 0, t = t_fin (en s)
+    fijo = np.array([0.0, s_fin, 0.0, t_fin])
+    en_s = np.array([False, False, True, True])
+    problema, x = _minimos_borde(
+        np.full(4, A),
+        np.where(en_s, df - fijo, -(fijo + df)),
+        np.where(en_s, paso1, -paso2),
+        np.where(en_s, dz - paso2 * fijo, paso1 * fijo + dz),
+        np.zeros(4), np.where(en_s, s_fin, t_fin), tol)
+    s = np.where(en_s[problema], x, fijo[problema])
+    t = np.where(en_s[problema], fijo[problema], x)
+
+    # Mínimo interior: s - t = 2πk - df y paso1·s - paso2·t = -dz; s y t
+    # son lineales en k, así que basta el primer k que cae en el dominio
+    if paso1 != paso2 and A > 0:
+        s0 = (-dz + paso2 * df) / (paso1 - paso2)
+        t0 = s0 + df
+        ds = -2 * np.pi * paso2 / (paso1 - paso2)
+        dt = -2 * np.pi * paso1 / (paso1 - paso2)
+        k_min, k_max = -np.inf, np.inf
+        for origen, pendiente, fin in ((s0, ds, s_fin), (t0, dt, t_fin)):
+            if pendiente == 0:
+                if not 0 <= origen <= fin:
+                    k_min, k_max = np.inf, -np.inf
+                continue
+            extremos = sorted(((0 - origen) / pendiente, (fin - origen) / pendiente))
+            k_min, k_max = max(k_min, extremos[0]), min(k_max, extremos[1])
+        if np.ceil(k_min) <= k_max:
+            k = np.ceil(k_min)
+            s = np.append(s, np.clip(s0 + k * ds, 0, s_fin))
+            t = np.append(t, np.clip(t0 + k * dt, 0, t_fin))
+
+    p1 = _evaluar(helice1, s)
+    p2 = _evaluar(helice2, t)
+    distancias = np.sqrt(((p1 - p2)**2).sum(-1))
+    k = np.argmin(distancias)
+    punto = tuple((p1[k] + p2[k]) / 2)
+    return s[k], t[k], distancias[k], punto
+
+
+# Desplazamientos a la mitad de las 26 celdas vecinas: cada par de celdas
+# adyacentes se visita una sola vez
+_VECINAS = [(dx, dy, dz)
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+            if (dx, dy, dz) > (0, 0, 0)]
+
+
+def _pares_en_rangos(origen, inicio, fin):
+    # Empareja cada posición de `origen` con todas las de [inicio, fin)
+    cuentas = fin - inicio
+    total = cuentas.sum()
+    src = np.repeat(origen, cuentas)
+    desplazamiento = np.arange(total) - np.repeat(np.cumsum(cuentas) - cuentas, cuentas)
+    dst = np.repeat(inicio, cuentas) + desplazamiento
+    return src, dst
+
+
+def _minimo_por_clave(clave, indices, distancias):
+    # Conserva el acoplamiento de menor distancia (y menor índice) por clave
+    # de par, ordenado por clave. Basta ordenar por clave: el mínimo sale por
+    # grupos y solo los empates exactos de distancia se deshacen por índice
+    orden = np.argsort(clave)
+    nuevo = np.ones(len(orden), dtype=bool)
+    nuevo[1:] = clave[orden[1:]] != clave[orden[:-1]]
+    grupo = np.cumsum(nuevo) - 1
+    distancias_ord = distancias[orden]
+    minimo = np.minimum.reduceat(distancias_ord, np.flatnonzero(nuevo))
+    empatan = distancias_ord == minimo[grupo]
+    orden, grupo = orden[empatan], grupo[empatan]
+    if len(orden) > len(minimo):
+        elegidos = np.lexsort((indices[orden], grupo))
+        orden, grupo = orden[elegidos], grupo[elegidos]
+        primero = np.ones(len(grupo), dtype=bool)
+        primero[1:] = grupo[1:] != grupo[:-1]
+        orden = orden[primero]
+    return clave[orden], indices[orden], distancias[orden]
+
+
+# Puntos por bloque de índices por cada `chunk` candidatos: cada punto
+# guarda los rangos de sus 14 celdas (la suya y la mitad de las vecinas)
+_PUNTOS_POR_CANDIDATO = 1 / 16
+
+
+@perfilar
+def red_acoplamientos_indexada(trayectorias, threshold=0.3, chunk=1 << 20):
+    """Red de acoplamientos mediante una rejilla uniforme de celdas.
+
+    `trayectorias` es un arreglo (N, n, 3) como el de `helices_proyectivas`.
+    Igual que en la red original, dos partículas se acoplan cuando sus
+    puntos del mismo índice quedan a menos de `threshold`; aquí esos puntos
+    se agrupan en celdas de lado `threshold` (con el índice como parte de
+    la clave) y solo se comparan los de celdas vecinas.
+
+    La memoria de trabajo la fija `chunk`, no la densidad: los índices se
+    toman en bloques de unos `chunk / 16` puntos y, dentro de cada bloque,
+    los pares candidatos se generan en tandas de unos `chunk`, según la
+    ocupación de las celdas, por densa que sea la zona (como cerca de ε₀
+    con umbrales grandes). Los acoplamientos hallados se van fusionando,
+    así que aparte de `chunk` solo crece el propio resultado.
+
+    Devuelve `(pares, indices, distancias)`: pares (E, 2) con i < j
+    ordenados, el índice del acoplamiento de cada par y su distancia.
+    """
+    trayectorias = np.asarray(trayectorias)
+    n_part, n_puntos = trayectorias.shape[:2]
+    vacio = (np.empty((0, 2), dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0))
+    if n_part < 2 or n_puntos == 0:
+        return vacio
+
+    # Rejilla con una celda de margen para que los vecinos nunca den la vuelta
+    minimo = trayectorias.reshape(-1, 3).min(axis=0)
+    celdas_max = np.floor((trayectorias.reshape(-1, 3).max(axis=0) - minimo) / threshold)
+    nx, ny, nz = (celdas_max.astype(np.int64) + 3)
+    pasos = np.array([ny * nz, nz, 1], dtype=np.int64)
+    desplazamientos = np.array([0] + [np.dot(d, pasos) for d in _VECINAS], dtype=np.int64)
+    bloque_indices = max(1, int(chunk * _PUNTOS_POR_CANDIDATO) // n_part)
+    # Con distancias al cuadrado; el margen deja la comparación exacta para sqrt
+    limite2 = threshold * threshold * (1 + 1e-12)
+
+    fusionado = None
+    parciales, pendientes = [], 0
+    for k0 in range(0, n_puntos, bloque_indices):
+        bloque = trayectorias[:, k0:k0 + bloque_indices]
+        kc = bloque.shape[1]
+        puntos = bloque.reshape(-1, 3)
+        celda = np.floor((puntos - minimo) / threshold).astype(np.int64) + 1
+        k = np.tile(np.arange(kc, dtype=np.int64), n_part)
+        clave = k * (nx * ny * nz) + celda @ pasos
+        orden = np.argsort(clave, kind='stable')
+        clave_ord = clave[orden]
+        # Coordenadas por columnas en el orden de las celdas
+        columnas = [np.ascontiguousarray(columna[orden], dtype=float) for columna in puntos.T]
+
+        # Rango de posiciones ordenadas que empareja cada punto en su celda
+        # (solo las posteriores) y en la mitad de las vecinas
+        posiciones = np.arange(len(clave_ord))
+        inicios = np.empty((len(desplazamientos), len(clave_ord)), dtype=np.int64)
+        fines = np.empty_like(inicios)
+        inicios[0] = posiciones + 1
+        fines[0] = np.searchsorted(clave_ord, clave_ord, side='right')
+        for r, desplazamiento in enumerate(desplazamientos[1:], 1):
+            vecina = clave_ord + desplazamiento
+            inicios[r] = np.searchsorted(clave_ord, vecina, side='left')
+            fines[r] = np.searchsorted(clave_ord, vecina, side='right')
+        acumulado = np.cumsum((fines - inicios).sum(axis=0))
+
+        # Tandas de puntos de origen con unos `chunk` candidatos en total
+        a = 0
+        while a < len(posiciones):
+            previo = acumulado[a - 1] if a else 0
+            b = max(a + 1, int(np.searchsorted(acumulado, previo + chunk, side='right')))
+            src, dst = zip(*(_pares_en_rangos(posiciones[a:b], inicios[r, a:b], fines[r, a:b])
+                             for r in range(len(desplazamientos))))
+            a = b
+            src, dst = np.concatenate(src), np.concatenate(dst)
+            d2 = np.zeros(len(src))
+            for columna in columnas:
+                diferencia = columna[src] - columna[dst]
+                diferencia *= diferencia
+                d2 += diferencia
+            cerca = np.flatnonzero(d2 < limite2)
+            dist = np.sqrt(d2[cerca])
+            exactos = dist < threshold
+            cerca, dist = cerca[exactos], dist[exactos]
+            if len(dist) == 0:
+                continue
+
+            pi, ki = np.divmod(orden[src[cerca]], kc)
+            pj = orden[dst[cerca]] // kc
+            clave_par = np.minimum(pi, pj) * n_part + np.maximum(pi, pj)
+            parciales.append(_minimo_por_clave(clave_par, (ki + k0).astype(np.int32), dist))
+            pendientes += len(dist)
+
+            # Fusión cuando lo pendiente iguala a lo ya fusionado: el trabajo
+            # total de las fusiones es proporcional al resultado
+            if pendientes >= max(chunk, 0 if fusionado is None else len(fusionado[0])):
+                fusionado = _fusionar(fusionado, parciales)
+                parciales, pendientes = [], 0
+
+    fusionado = _fusionar(fusionado, parciales)
+    if fusionado is None:
+        return vacio
+    clave, indices, distancias = fusionado
+    pares = np.stack(np.divmod(clave, n_part), axis=1)
+    return pares, indices.astype(np.intp), distancias
+
+
+def _fusionar(fusionado, parciales):
+    # Une acoplamientos parciales quedándose con el mejor de cada par
+    if fusionado is not None:
+        parciales = [fusionado] + parciales
+    if not parciales:
+        return None
+    return _minimo_por_clave(*(np.concatenate(r) for r in zip(*parciales)))
+
+
+def red_acoplamientos(particulas, threshold=0.3):
+    """Conexiones entre partículas cuya cercanía estructural baja de `threshold`.
+
+    `particulas` es una secuencia de tuplas (x, y, z) de igual longitud.
+    Devuelve una lista de pares (punto_i, punto_j) ordenada por (i, j).
+    """
+    trayectorias = np.stack([np.stack(p, axis=-1) for p in particulas])
+    pares, indices, _ = red_acoplamientos_indexada(trayectorias, threshold)
+    puntos_i = trayectorias[pares[:, 0], indices]
+    puntos_j = trayectorias[pares[:, 1], indices]
+    return [(tuple(a), tuple(b)) for a, b in zip(puntos_i, puntos_j)]
@@ -0,0 +1,102 @@
+"""Almacén en disco de conjuntos de trayectorias, con acceso por `np.memmap`.
+
+Un almacén es un directorio con tres archivos:
+
+- `trayectorias.npy`: arreglo (N, n, 3) de las trayectorias;
+- `parametros.npy`: tabla (N, k) con los parámetros de cada partícula;
+- `meta.json`: nombres de las columnas de la tabla y metadatos libres
+  (semilla, rangos, ...).
+
+Ambos `.npy` son archivos estándar de numpy que se abren mapeados en
+memoria: leer `almacen.trayectorias[i:j]` no carga el resto ni copia nada,
+así que las etapas posteriores (acoplamiento, lagrangiano, renderizado)
+trabajan sobre poblaciones que no caben en RAM.
+"""
+import json
+import os
+
+import numpy as np
+
+from .trayectorias import helices_proyectivas
+
+COLUMNAS = ('A', 'S', 'W', 'B')
+
+
+class AlmacenTrayectorias:
+    """Trayectorias (N, n, 3) y su tabla de parámetros, mapeadas desde `directorio`.
+
+    Se crea con `crear` y se reabre con `abrir`. Los arreglos `params` y
+    `trayectorias` son `np.memmap`, de solo lectura salvo en modo 'r+'
+    (el de un almacén recién creado).
+    """
+
+    def __init__(self, directorio, modo='r'):
+        self.directorio = directorio
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as archivo:
+            self.meta = json.load(archivo)
+        self.columnas = tuple(self.meta['columnas'])
+        self.params = np.load(os.path.join(directorio, 'parametros.npy'), mmap_mode=modo)
+        self.trayectorias = np.load(os.path.join(directorio, 'trayectorias.npy'), mmap_mode=modo)
+        self.dtype = self.trayectorias.dtype
+        self.forma = self.trayectorias.shape[:2]
+
+    @classmethod
+    def crear(cls, directorio, n_particulas, n_puntos, dtype=np.float32,
+              columnas=COLUMNAS, **meta):
+        """Crea un almacén vacío de `n_particulas` trayectorias de `n_puntos`."""
+        os.makedirs(directorio, exist_ok=True)
+        with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as archivo:
+            json.dump({'columnas': list(columnas), **meta}, archivo, indent=2)
+        for nombre, forma, tipo in (('parametros.npy', (n_particulas, len(columnas)), np.float64),
+                                    ('trayectorias.npy', (n_particulas, n_puntos, 3), dtype)):
+            # open_memmap escribe la cabecera y reserva el archivo sin llenarlo
+            np.lib.format.open_memmap(os.path.join(directorio, nombre), mode='w+',
+                                      dtype=tipo, shape=forma).flush()
+        return cls(directorio, 'r+')
+
+    @classmethod
+    def abrir(cls, directorio, modo='r'):
+        """Reabre un almacén existente ('r' solo lectura, 'r+' escritura)."""
+        return cls(directorio, modo)
+
+    def __len__(self):
+        return self.forma[0]
+
+    def escribir(self, inicio, params, trayectorias=None):
+        """Escribe las partículas desde `inicio`.
+
+        Sin `trayectorias` se generan aquí como hélices proyectivas de
+        `params` (A, S, W, B), directamente sobre el archivo.
+        """
+        params = np.asarray(params)
+        fin = inicio + len(params)
+        self.params[inicio:fin] = params
+        if trayectorias is None:
+            helices_proyectivas(params, n=self.forma[1], dtype=self.dtype,
+                                out=self.trayectorias[inicio:fin])
+        else:
+            self.trayectorias[inicio:fin] = trayectorias
+
+    def lotes(self, chunk=4096):
+        """Recorre el almacén en lotes {'inicio', 'params', 'trayectorias'} de vistas."""
+        for inicio in range(0, len(self), chunk):
+            yield {'inicio': inicio,
+                   'params': self.params[inicio:inicio + chunk],
+                   'trayectorias': self.trayectorias[inicio:inicio + chunk]}
+
+    def tabla(self):
+        """Tabla de parámetros como diccionario {columna: arreglo (N,)}."""
+        return {nombre: self.params[:, k] for k, nombre in enumerate(self.columnas)}
+
+    def cerrar(self):
+        """Vuelca los cambios pendientes y suelta los mapas."""
+        for mapa in (self.params, self.trayectorias):
+            if isinstance(mapa, np.memmap) and mapa.mode != 'r':
+                mapa.flush()
+        self.params = self.trayectorias = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
@@ -0,0 +1,222 @@
+"""Campo estructural radial desde ε₀ (solo numpy)."""
+import numpy as np
+
+
+def malla_esferica(n_phi=60, n_theta=60):
+    """Ángulos esféricos (phi, theta) en forma de malla."""
+    phi = np.linspace(0, np.pi, n_phi)           # inclinación (0: polo norte, π: sur)
+    theta = np.linspace(0, 2 * np.pi, n_theta)   # azimut (0 → 2π)
+    return np.meshgrid(phi, theta)
+
+
+def campo_radial(phi, theta, torsion_amp=0.3, spinmod_amp=0.2):
+    """Superficie proyectiva R(φ, θ) = 1 + torsión + modulación de spin."""
+    torsion = torsion_amp * np.sin(3 * phi)       # oscilaciones de presión/torsión
+    spin_mod = spinmod_amp * np.cos(2 * theta)    # variación por giro proyectado
+    R = 1 + torsion + spin_mod
+    X = R * np.sin(phi) * np.cos(theta)
+    Y = R * np.sin(phi) * np.sin(theta)
+    Z = R * np.cos(phi)
+    return X, Y, Z
+
+
+def _nodos_adaptativos(perfil, inicio, fin, tol, n_inicial, max_nodos):
+    # Biseca los tramos cuyo punto medio se aparta de la cuerda más que
+    # `tol`; si se alcanza `max_nodos`, se parten primero los peores
+    nodos = np.linspace(inicio, fin, n_inicial)
+    while len(nodos) < max_nodos:
+        medios = (nodos[:-1] + nodos[1:]) / 2
+        cuerda = (perfil(nodos[:-1]) + perfil(nodos[1:])) / 2
+        error = np.sqrt(((perfil(medios) - cuerda)**2).sum(-1))
+        partir = np.flatnonzero(error > tol)
+        if len(partir) == 0:
+            break
+        if len(partir) > max_nodos - len(nodos):
+            partir = partir[np.argsort(error[partir])[::-1][:max_nodos - len(nodos)]]
+        nodos = np.sort(np.concatenate([nodos, medios[partir]]))
+    return nodos
+
+
+class SuperficieCampo:
+    """Superficie del campo radial sobre una malla (φ, θ) adaptativa.
+
+    R(φ, θ) = 1 + torsión·sin(kφ·φ) + spin_mod·cos(kθ·θ), con (kφ, kθ) =
+    `armonicos` (3 y 2 en `campo_radial`). Cada eje se refina por
+    bisección donde el perfil de la superficie se curva más, tomando las
+    amplitudes máximas `amplitud_max`, hasta que ningún tramo se aparta
+    de su cuerda más de `tol`. La malla no depende de las amplitudes: las
+    bases esfera, esfera·sin(kφ·φ) y esfera·cos(kθ·θ) se calculan una vez
+    y `evaluar` solo las combina.
+
+    La malla tiene forma (n_theta, n_phi), como la de `malla_esferica`.
+    """
+
+    def __init__(self, tol=1e-2, amplitud_max=(0.5, 0.5), armonicos=(3, 2),
+                 n_inicial=9, max_nodos=513):
+        k_phi, k_theta = armonicos
+        a_max, s_max = amplitud_max
+
+        def meridiano(phi):
+            r = 1 + s_max + a_max * np.sin(k_phi * phi)
+            return np.stack([r * np.sin(phi), r * np.cos(phi)], axis=-1)
+
+        def paralelo(theta):
+            r = 1 + a_max + s_max * np.cos(k_theta * theta)
+            return np.stack([r * np.cos(theta), r * np.sin(theta)], axis=-1)
+
+        self.phi = _nodos_adaptativos(meridiano, 0, np.pi, tol, n_inicial, max_nodos)
+        self.theta = _nodos_adaptativos(paralelo, 0, 2 * np.pi, tol, n_inicial, max_nodos)
+        phi, theta = np.meshgrid(self.phi, self.theta)
+        self.forma = phi.shape
+
+        self._esfera = np.stack([np.sin(phi) * np.cos(theta),
+                                 np.sin(phi) * np.sin(theta),
+                                 np.cos(phi)])
+        self._torsion = self._esfera * np.sin(k_phi * phi)
+        self._spin = self._esfera * np.cos(k_theta * theta)
+        self._xyz = np.empty_like(self._esfera)
+        self._temporal = np.empty_like(self._esfera)
+
+        # Cuadriláteros de la malla: vértice k = fila·n_phi + columna
+        filas, columnas = self.forma
+        k = (np.arange(filas - 1)[:, None] * columnas + np.arange(columnas - 1)).ravel()
+        self.cuadros = np.stack([k, k + 1, k + columnas + 1, k + columnas], axis=1)
+
+    def evaluar(self, torsion_amp=0.3, spinmod_amp=0.2):
+        """X, Y, Z en forma de malla, como `campo_radial`.
+
+        Devuelve un arreglo (3, n_theta, n_phi) que se reutiliza en la
+        siguiente llamada.
+        """
+        np.multiply(self._torsion, torsion_amp, out=self._xyz)
+        np.multiply(self._spin, spinmod_amp, out=self._temporal)
+        self._xyz += self._temporal
+        self._xyz += self._esfera
+        return self._xyz
+
+    def poligonos(self, torsion_amp=0.3, spinmod_amp=0.2):
+        """Cuadriláteros (M, 4, 3) de la superficie, en el orden de `plot_surface`."""
+        return self.evaluar(torsion_amp, spinmod_amp).reshape(3, -1).T[self.cuadros]
+
+    def buferes(self, torsion_amp=0.3, spinmod_amp=0.2, dtype=np.float32):
+        """Búferes planos (vértices x, y, z intercalados; índices de triángulos)."""
+        vertices = self.evaluar(torsion_amp, spinmod_amp).reshape(3, -1).T.astype(dtype).ravel()
+        a, b, c, d = self.cuadros.T
+        indices = np.stack([a, b, c, a, c, d], axis=1).astype(np.uint32).ravel()
+        return vertices, indices
+
+
+def _legendre_combinada(aportes, x, s):
+    # Σ amplitud·P̄_l^m(cos φ) por columna de Fourier, con x = cos φ y
+    # s = sin φ. Las P̄ normalizadas salen de recurrencias estables en l (sin
+    # factoriales) y se acumulan según se generan: nunca hay una tabla con
+    # una fila por modo
+    columnas = 1 + max(c for lista in aportes.values() for c, _ in lista)
+    G = np.zeros((columnas,) + x.shape)
+    l_max = {}
+    for l, m in aportes:
+        l_max[m] = max(l_max.get(m, m), l)
+
+    p_mm = np.full(x.shape, np.sqrt(1 / (4 * np.pi)))
+    m_actual = 0
+    for m in sorted(l_max):
+        while m_actual < m:
+            m_actual += 1
+            p_mm = np.sqrt((2 * m_actual + 1) / (2 * m_actual)) * s * p_mm
+        anterior, actual = None, p_mm
+        for l in range(m, l_max[m] + 1):
+            if l == m + 1:
+                anterior, actual = actual, np.sqrt(2 * m + 3) * x * actual
+            elif l > m + 1:
+                a = np.sqrt((4 * l * l - 1) / (l * l - m * m))
+                b = np.sqrt(((l - 1)**2 - m * m) / (4 * (l - 1)**2 - 1))
+                anterior, actual = actual, a * (x * actual - b * anterior)
+            for columna, coeficiente in aportes.get((l, m), ()):
+                G[columna] += coeficiente * actual
+    return G
+
+
+class CampoArmonico:
+    """Campo radial R(φ, θ) = 1 + Σ amplitud·Y_l^m(φ, θ) de una lista de modos.
+
+    `modos` es una secuencia de (l, m, amplitud) con |m| <= l; Y_l^m son
+    los armónicos esféricos reales ortonormales (cos(mθ) para m >= 0,
+    sin(|m|θ) para m < 0), con φ la inclinación y θ el azimut, como en
+    `malla_esferica`. Los modos repetidos se suman.
+
+    Internamente el campo es R = 1 + Σ_c G_c(φ)·F_c(θ), una columna c por
+    cada m distinto: G acumula las funciones de Legendre ponderadas por las
+    amplitudes y F es la tabla de Fourier.
+    """
+
+    def __init__(self, modos):
+        modos = [(int(l), int(m), float(amplitud)) for l, m, amplitud in modos]
+        if not modos:
+            raise ValueError("se necesita al menos un modo")
+        for l, m, _ in modos:
+            if l < 0 or abs(m) > l:
+                raise ValueError(f"modo inválido (l={l}, m={m}): se requiere |m| <= l")
+        self.modos = modos
+        self._m = np.array(sorted({m for _, m, _ in modos}), dtype=int)
+        columnas = {m: c for c, m in enumerate(self._m)}
+        # Aportes de cada P̄_l^|m| a las columnas de Fourier; √2 en m ≠ 0
+        acumulados = {}
+        for l, m, amplitud in modos:
+            clave = (l, abs(m), columnas[m])
+            factor = 1.0 if m == 0 else np.sqrt(2)
+            acumulados[clave] = acumulados.get(clave, 0.0) + factor * amplitud
+        self._aportes = {}
+        for (l, m, columna), coeficiente in acumulados.items():
+            self._aportes.setdefault((l, m), []).append((columna, coeficiente))
+
+    def tabla_legendre(self, phi):
+        """G (columnas, n): Legendre por inclinación, ya ponderado por las amplitudes."""
+        phi = np.asarray(phi, dtype=float)
+        return _legendre_combinada(self._aportes, np.cos(phi), np.sin(phi))
+
+    def tabla_fourier(self, theta):
+        """F (columnas, n): cos(mθ) o sin(|m|θ) por cada m distinto."""
+        theta = np.asarray(theta, dtype=float)
+        angulos = np.multiply.outer(np.abs(self._m), theta)
+        return np.where((self._m < 0).reshape((-1,) + (1,) * theta.ndim),
+                        np.sin(angulos), np.cos(angulos))
+
+    def malla(self, phi, theta, dtype=np.float64):
+        """R sobre la malla de los ejes 1D `phi` y `theta`, de forma (len(theta), len(phi)).
+
+        Las tablas de Legendre y de Fourier se calculan una vez por eje y la
+        malla sale de un único producto de matrices, sin temporales del
+        tamaño de la malla.
+        """
+        G = self.tabla_legendre(phi).astype(dtype)
+        F = self.tabla_fourier(theta).astype(dtype)
+        R = np.matmul(F.T, G)
+        R += 1
+        return R
+
+    def evaluar(self, phi, theta, chunk=16384):
+        """R en puntos sueltos; `phi` y `theta` se difunden a una forma común.
+
+        Los puntos se procesan en bloques de `chunk`, de modo que la memoria
+        de las tablas no crece con el número de puntos.
+        """
+        phi, theta = np.broadcast_arrays(np.asarray(phi, dtype=float),
+                                         np.asarray(theta, dtype=float))
+        forma = phi.shape
+        phi, theta = phi.ravel(), theta.ravel()
+        R = np.empty(phi.size)
+        for inicio in range(0, phi.size, chunk):
+            bloque = slice(inicio, inicio + chunk)
+            G = self.tabla_legendre(phi[bloque])
+            F = self.tabla_fourier(theta[bloque])
+            R[bloque] = 1 + np.einsum('ci,ci->i', G, F)
+        return R.reshape(forma)
+
+
+def campo_armonico(phi, theta, modos):
+    """Superficie X, Y, Z del campo de una lista de modos (l, m, amplitud)."""
+    R = CampoArmonico(modos).evaluar(phi, theta)
+    X = R * np.sin(phi) * np.cos(theta)
+    Y = R * np.sin(phi) * np.sin(theta)
+    Z = R * np.cos(phi)
+    return X, Y, Z
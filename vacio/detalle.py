@@ -0,0 +1,145 @@
+"""Nivel de detalle de las trayectorias dibujadas (solo numpy).
+
+Una polilínea que sigue una curva de curvatura κ con cuerdas de longitud
+h se separa de ella como mucho κ·h²/8 (la flecha del arco). Si un píxel
+de pantalla equivale a 1/escala unidades de datos, el error no pasa de
+`tolerancia` píxeles mientras h ≤ √(8·tolerancia / (escala·κ)). De ahí
+salen los puntos que necesita cada curva según su curvatura y su tamaño
+en pantalla, en vez de un número fijo de 1000 o 2000:
+
+- `puntos_helices` da la cuenta cerrada de un lote de hélices proyectivas;
+- `eje_adaptativo` reparte los puntos de una curva cualquiera a partir de
+  sus derivadas, más densos donde más se curva;
+- `rdp` y `decimar` quitan puntos de curvas ya muestreadas (Ramer–Douglas–
+  Peucker) antes de pasarlas a matplotlib.
+
+`escala` son píxeles por unidad de datos (ver `graficos.escala_pantalla`).
+"""
+import numpy as np
+
+# Desvío máximo entre la curva y la polilínea dibujada, en píxeles
+TOLERANCIA_PX = 0.25
+
+
+def puntos_helices(params, escala, tolerancia=TOLERANCIA_PX, n_min=16, n_max=10000):
+    """Puntos por hélice de un arreglo (N, 4) de (A, S, W, B), de forma (N,).
+
+    Con θ como parámetro la hélice de radio r = cos A avanza √(r² + B²) por
+    radián con curvatura r / (r² + B²): hacen falta √(escala·r / (8·tol))
+    puntos por radián a lo largo de sus 2π·S radianes.
+    """
+    params = np.asarray(params, dtype=float)
+    radio = np.abs(np.cos(params[:, 0]))
+    por_radian = np.sqrt(escala * radio / (8 * tolerancia))
+    n = np.ceil(2 * np.pi * params[:, 1] * por_radian).astype(np.int64) + 1
+    return np.clip(n, n_min, n_max)
+
+
+def eje_adaptativo(derivadas, inicio, fin, escala, tolerancia=TOLERANCIA_PX,
+                   n_min=16, n_max=10000, muestras=1024):
+    """Eje θ no uniforme en [inicio, fin] para dibujar una curva con error ≤ tolerancia.
+
+    `derivadas(theta)` devuelve la velocidad y la aceleración, tuplas
+    (x, y, z) como las de `geometria` (se ignora lo demás). Se evalúan en
+    `muestras` puntos, se integra la densidad de puntos necesaria
+    |v|·√(escala·κ / (8·tol)) y se colocan los puntos invirtiendo esa
+    integral: la cuenta total depende de la curvatura y del tamaño en
+    pantalla, y los puntos se agolpan donde la curva se dobla.
+    """
+    theta = np.linspace(inicio, fin, muestras)
+    v, a = derivadas(theta)[:2]
+    vx, vy, vz = (np.broadcast_to(c, theta.shape) for c in v)
+    ax, ay, az = (np.broadcast_to(c, theta.shape) for c in a)
+    rapidez = np.sqrt(vx**2 + vy**2 + vz**2)
+    producto = np.sqrt((vy * az - vz * ay)**2 + (vz * ax - vx * az)**2 + (vx * ay - vy * ax)**2)
+    kappa = producto / np.maximum(rapidez, np.finfo(float).tiny)**3
+    densidad = rapidez * np.sqrt(escala * kappa / (8 * tolerancia))
+
+    # Densidad acumulada (trapecios) e inversión por interpolación
+    acumulada = np.concatenate([[0.0], np.cumsum((densidad[1:] + densidad[:-1]) / 2 * np.diff(theta))])
+    # Un 5 % de densidad uniforme evita huecos en los tramos rectos
+    acumulada += np.linspace(0, acumulada[-1] * 0.05, muestras)
+    n = int(np.clip(np.ceil(acumulada[-1]) + 1, n_min, n_max))
+    if acumulada[-1] <= 0:
+        return np.linspace(inicio, fin, n)
+    eje = np.interp(np.linspace(0, acumulada[-1], n), acumulada, theta)
+    eje[[0, -1]] = inicio, fin
+    return eje
+
+
+def _distancia_segmento(columnas, k, i, j):
+    # Distancia del punto k al segmento i-j, con índices alineados. Por
+    # componentes: reducir filas de 3 elementos es mucho más lento
+    ap, ab = [], []
+    for columna in columnas:
+        origen = columna[i]
+        ap.append(columna[k] - origen)
+        ab.append(columna[j] - origen)
+    proyeccion = sum(x * y for x, y in zip(ap, ab))
+    largo2 = sum(x * x for x in ab)
+    t = np.divide(proyeccion, largo2, out=np.zeros_like(largo2), where=largo2 > 0)
+    np.clip(t, 0, 1, out=t)
+    return np.sqrt(sum((x - t * y)**2 for x, y in zip(ap, ab)))
+
+
+def rdp(curvas, tolerancia):
+    """Máscara de puntos que conserva la simplificación de Ramer–Douglas–Peucker.
+
+    `curvas` es una curva (n, d) o un lote (M, n, d); la máscara tiene la
+    forma (n,) o (M, n). Se conservan los extremos y, recursivamente, el
+    punto más alejado de cada cuerda mientras se aleje más de `tolerancia`
+    (en unidades de datos): los tramos rectos se quedan en sus extremos y
+    las curvas cerradas conservan los puntos que dan su forma. Todos los
+    tramos pendientes de todas las curvas se procesan juntos en cada ronda.
+    """
+    curvas = np.asarray(curvas, dtype=float)
+    una = curvas.ndim == 2
+    if una:
+        curvas = curvas[None]
+    m, n = curvas.shape[:2]
+    conservar = np.zeros((m, n), dtype=bool)
+    if n == 0:
+        return conservar[0] if una else conservar
+    conservar[:, [0, -1]] = True
+    # Índices planos curva·n + punto sobre todas las curvas
+    columnas = [np.ascontiguousarray(columna) for columna in curvas.reshape(m * n, -1).T]
+    marcas = conservar.reshape(-1)
+
+    # Tramos pendientes, como índices planos de sus extremos (i, j)
+    i = np.arange(m, dtype=np.int64) * n
+    j = i + n - 1
+    while len(i):
+        interiores = j - i - 1
+        pendientes = interiores > 0
+        i, j, interiores = i[pendientes], j[pendientes], interiores[pendientes]
+        if not len(i):
+            break
+        tramo = np.repeat(np.arange(len(i)), interiores)
+        inicios = np.cumsum(interiores) - interiores
+        k = np.arange(interiores.sum()) - inicios[tramo] + i[tramo] + 1
+        d = _distancia_segmento(columnas, k, i[tramo], j[tramo])
+
+        # Punto más alejado de cada tramo (el primero si hay empate; `tramo`
+        # está ordenado)
+        maximo = np.maximum.reduceat(d, inicios)
+        candidatos = np.flatnonzero(d == maximo[tramo])
+        primero = np.ones(len(candidatos), dtype=bool)
+        primero[1:] = tramo[candidatos[1:]] != tramo[candidatos[:-1]]
+        lejano = k[candidatos[primero]]
+
+        dividir = maximo > tolerancia
+        i, j, lejano = i[dividir], j[dividir], lejano[dividir]
+        marcas[lejano] = True
+        i, j = np.concatenate([i, lejano]), np.concatenate([lejano, j])
+    return conservar[0] if una else conservar
+
+
+def decimar(curvas, tolerancia, chunk=1024):
+    """Lista con cada curva de `curvas` (M, n, d) reducida por `rdp`."""
+    curvas = np.asarray(curvas)
+    resultado = []
+    for inicio in range(0, len(curvas), chunk):
+        bloque = curvas[inicio:inicio + chunk]
+        mascara = rdp(bloque, tolerancia)
+        resultado.extend(curva[conservar] for curva, conservar in zip(bloque, mascara))
+    return resultado
@@ -0,0 +1,314 @@
+"""Dinámica de acoplamientos: partículas que avanzan por sus hélices paso a paso.
+
+Cada partícula (A, S, W, B) recorre su hélice proyectiva a su propio
+ritmo, θ = S·t, desplazada por un origen propio:
+
+    p(t) = origen + (cos(S·t + W)·cos A, sin(S·t + W)·cos A, B·S·t)
+
+Es el mismo muestreo que el de `helices_proyectivas` y la red de fig13:
+el punto k de cada hélice de n puntos es el instante t = 2π·k / (n - 1).
+En cada paso se buscan los pares a menos de `threshold` comparando
+posiciones del mismo instante. Un par que entra en ese radio es un
+acoplamiento nuevo: se registra y sus dos partículas pasan a la torsión
+`B_modificado` sin saltos de posición, como la trayectoria modificada que
+parte del punto de acoplamiento. Los pares que ya empiezan dentro se
+registran en el paso 0.
+
+Los candidatos salen de una lista de vecinos con margen (`piel`): al
+consultar una partícula en la rejilla se guardan sus pares a menos de
+threshold + piel de las posiciones de referencia, y solo se vuelve a
+consultar cuando se aleja más de piel / 2 de su referencia (o cambia de
+torsión). Cada par de la lista no se comprueba en todos los pasos, sino
+cuando su distancia puede haber cruzado el radio: la separación en XY de
+dos partículas con el mismo origen en XY cambia como mucho a
+min(r_i, r_j)·|S_i - S_j| (lo que gira una respecto a la otra; con
+orígenes distintos, a |S_i·r_i| + |S_j·r_j|) y la de z a
+|B_i·S_i - B_j·S_j|, así que un par a distancia d no cruza el radio antes
+de |d - threshold| / (esa velocidad) y se agenda para ese paso (a lo sumo
+`horizonte` pasos después). La comprobación usa las posiciones del paso,
+de modo que los acoplamientos son los mismos que al comparar todos los
+pares en cada paso.
+"""
+import numpy as np
+
+from .acoplamiento import _pares_en_rangos
+
+# Las 27 celdas que rodean a una (incluida ella misma)
+_ENTORNO = np.array([(dx, dy, dz)
+                     for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+# Partículas consultadas a la vez en la rejilla, para acotar los temporales
+_BLOQUE_CONSULTA = 2048
+# Registros en la agenda por debajo de los cuales no merece la pena purgarla
+_PURGA_MINIMA = 1 << 20
+
+
+def _distancia2(posiciones, i, j):
+    # Por componentes: indexar columnas sueltas es varias veces más rápido
+    # que reunir filas (E, 3)
+    total = np.zeros(len(i))
+    for columna in posiciones.T:
+        diferencia = columna[i] - columna[j]
+        diferencia *= diferencia
+        total += diferencia
+    return total
+
+
+class DinamicaAcoplamientos:
+    """Integrador de N partículas helicoidales con acoplamientos incrementales.
+
+    `params` es un arreglo (N, 4) de (A, S, W, B) como el de
+    `parametros_aleatorios`; `dt` es el avance de t por paso. `origen`
+    (N, 3), por defecto ceros, desplaza cada hélice (por ejemplo, alturas
+    iniciales distintas). Con `B_modificado=None` los acoplamientos se
+    registran pero no cambian las trayectorias. `piel` (por defecto,
+    `threshold / 2`) es el margen de la lista de vecinos y `horizonte` el
+    máximo de pasos entre dos comprobaciones de un par (hasta 65535).
+    """
+
+    def __init__(self, params, threshold=0.3, dt=0.01, B_modificado=0.35, origen=None,
+                 piel=None, horizonte=1024):
+        params = np.asarray(params, dtype=float)
+        if params.ndim != 2 or params.shape[1] != 4:
+            raise ValueError(f"params debe tener forma (N, 4), no {params.shape}")
+        self.n = len(params)
+        self.radio = np.cos(params[:, 0])
+        self.S = params[:, 1].copy()
+        self.fase = params[:, 2].copy()
+        self.B = params[:, 3].copy()
+        # Avance en z por unidad de t
+        self.ascenso = self.B * self.S
+        if origen is None:
+            self.origen = np.zeros((self.n, 3))
+        else:
+            self.origen = np.array(origen, dtype=float)
+            if self.origen.shape != (self.n, 3):
+                raise ValueError(f"origen debe tener forma {(self.n, 3)}, no {self.origen.shape}")
+        # Con orígenes distintos en XY la separación ya no depende solo del
+        # giro relativo
+        self._mismo_plano = bool((self.origen[:, :2] == self.origen[0, :2]).all())
+        self.threshold = threshold
+        self.dt = dt
+        self.B_modificado = B_modificado
+        self.piel = threshold / 2 if piel is None else piel
+        if not 1 <= horizonte <= np.iinfo(np.uint16).max:
+            raise ValueError(f"horizonte debe estar entre 1 y {np.iinfo(np.uint16).max}")
+        self.horizonte = horizonte
+        self.t = 0.0
+        self.pasos = 0
+        # Partículas consultadas en la rejilla y pares comprobados desde el inicio
+        self.consultas = 0
+        self.comprobaciones = 0
+
+        self.posiciones = self._posiciones()
+        self._referencia = self.posiciones.copy()
+        # Un registro de par (i, j, versión de i, versión de j, dentro) solo
+        # vale mientras ninguna de sus partículas se haya vuelto a consultar
+        self._version = np.zeros(self.n, dtype=np.int32)
+        self._agenda = {}
+        self._agendados = 0
+        self._purga = _PURGA_MINIMA
+        self._eventos = []
+        self._actualizar(previas=None)
+
+    def _posiciones(self):
+        fase = self.S * self.t + self.fase
+        posiciones = np.empty((self.n, 3))
+        np.cos(fase, out=posiciones[:, 0])
+        np.sin(fase, out=posiciones[:, 1])
+        posiciones[:, :2] *= self.radio[:, None]
+        posiciones[:, 2] = self.ascenso * self.t
+        posiciones += self.origen
+        return posiciones
+
+    def _consultar(self, movidas):
+        # Refresca la referencia de `movidas`, invalida sus registros y
+        # devuelve sus pares (i < j) a menos de threshold + piel
+        self.consultas += len(movidas)
+        self._version[movidas] += 1
+        referencia = self._referencia
+        referencia[movidas] = self.posiciones[movidas]
+        lado = self.threshold + self.piel
+
+        # Rejilla de todas las referencias, con una celda de margen
+        celdas = np.floor((referencia - referencia.min(axis=0)) / lado).astype(np.int64) + 1
+        _, ny, nz = celdas.max(axis=0) + 2
+        pasos = np.array([ny * nz, nz, 1], dtype=np.int64)
+        clave = celdas @ pasos
+        orden = np.argsort(clave, kind='stable')
+        clave_ord = clave[orden]
+
+        # Consultas ordenadas por celda: searchsorted avanza sin saltos
+        es_movida = np.zeros(self.n, dtype=bool)
+        es_movida[movidas] = True
+        movidas = movidas[np.argsort(clave[movidas], kind='stable')]
+        pares = []
+        for inicio_bloque in range(0, len(movidas), _BLOQUE_CONSULTA):
+            bloque = movidas[inicio_bloque:inicio_bloque + _BLOQUE_CONSULTA]
+            consulta = clave[bloque]
+            locales = np.arange(len(bloque))
+            for desplazamiento in _ENTORNO @ pasos:
+                inicio = np.searchsorted(clave_ord, consulta + desplazamiento, side='left')
+                fin = np.searchsorted(clave_ord, consulta + desplazamiento, side='right')
+                s, d = _pares_en_rangos(locales, inicio, fin)
+                src, dst = bloque[s], orden[d]
+                # Un par entre dos partículas movidas aparece en ambos
+                # sentidos: se conserva solo el de src < dst
+                validos = (src < dst) | ((src > dst) & ~es_movida[dst])
+                src, dst = src[validos], dst[validos]
+                cerca = _distancia2(referencia, src, dst) < lado * lado
+                src, dst = src[cerca], dst[cerca]
+                pares.append(np.stack([np.minimum(src, dst), np.maximum(src, dst)],
+                                      axis=1).astype(np.int32, copy=False))
+        if not pares:
+            return np.empty((0, 2), dtype=np.int32)
+        return np.concatenate(pares)
+
+    def _registros(self, pares, dentro):
+        # int32: con millones de pares cerca del origen, la lista es lo que más ocupa
+        i, j = pares[:, 0], pares[:, 1]
+        registros = np.stack([i, j, self._version[i], self._version[j], dentro], axis=1)
+        return registros.astype(np.int32, copy=False)
+
+    def _agendar(self, registros, distancias):
+        # Próxima comprobación de cada registro: antes no puede cruzar el radio
+        i, j = registros[:, 0], registros[:, 1]
+        giro = np.abs(self.S[i] - self.S[j])
+        if self._mismo_plano:
+            plano = np.minimum(np.abs(self.radio[i]), np.abs(self.radio[j])) * giro
+        else:
+            plano = np.abs(self.S[i] * self.radio[i]) + np.abs(self.S[j] * self.radio[j])
+        velocidad = np.hypot(plano, self.ascenso[i] - self.ascenso[j])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            faltan = np.floor(np.abs(distancias - self.threshold) / (velocidad * self.dt))
+        faltan = np.nan_to_num(faltan, nan=self.horizonte, posinf=self.horizonte)
+        # Pasos hasta la comprobación, en 16 bits: argsort estable los ordena por radix
+        faltan = np.clip(faltan, 1, self.horizonte).astype(np.uint16)
+        # np.take y np.compress por filas son varias veces más rápidos que indexar
+        registros = np.take(registros, np.argsort(faltan, kind='stable'), axis=0)
+        limites = np.cumsum(np.bincount(faltan, minlength=self.horizonte + 1))
+        for k in np.flatnonzero(np.diff(limites)).tolist():
+            grupo = registros[limites[k]:limites[k + 1]]
+            self._agenda.setdefault(self.pasos + k + 1, []).append(grupo)
+        self._agendados += len(registros)
+
+    def _purgar(self):
+        # Los registros invalidados esperan en la agenda hasta su paso; cuando
+        # se ha duplicado desde la última purga se quitan de una vez
+        for paso in list(self._agenda):
+            vigentes = self._vigentes(np.concatenate(self._agenda[paso]))
+            if len(vigentes):
+                self._agenda[paso] = [vigentes]
+            else:
+                del self._agenda[paso]
+        self._agendados = sum(len(grupo[0]) for grupo in self._agenda.values())
+        self._purga = max(2 * self._agendados, _PURGA_MINIMA)
+
+    def _vigencia(self, registros):
+        i, j = registros[:, 0], registros[:, 1]
+        return (self._version[i] == registros[:, 2]) & (self._version[j] == registros[:, 3])
+
+    def _vigentes(self, registros):
+        return np.compress(self._vigencia(registros), registros, axis=0)
+
+    def _cambiar_torsion(self, acopladas, registros, distancias):
+        # Pasan a B_modificado conservando su altura actual; las que ya la
+        # tenían no cambian de trayectoria. Los pares de las que cambian
+        # varían de velocidad y se rehacen con su estado actual
+        marcadas = np.zeros(self.n, dtype=bool)
+        marcadas[acopladas] = True
+        afectadas = np.flatnonzero(marcadas & (self.B != self.B_modificado))
+        if not len(afectadas):
+            return registros, distancias
+        posiciones = self.posiciones
+        self.B[afectadas] = self.B_modificado
+        self.ascenso[afectadas] = self.B_modificado * self.S[afectadas]
+        self.origen[afectadas, 2] = posiciones[afectadas, 2] - self.ascenso[afectadas] * self.t
+        pares = self._consultar(afectadas)
+        cerca = np.sqrt(_distancia2(posiciones, pares[:, 0], pares[:, 1]))
+        vigentes = self._vigencia(registros)
+        return (np.concatenate([np.compress(vigentes, registros, axis=0),
+                                self._registros(pares, cerca < self.threshold)]),
+                np.concatenate([distancias[vigentes], cerca]))
+
+    def _actualizar(self, previas):
+        # Consultas, comprobaciones y acoplamientos del paso actual; con
+        # `previas=None` (paso 0) se consultan todas y nadie estaba dentro
+        posiciones = self.posiciones
+        registros = self._agenda.pop(self.pasos, [])
+        if registros:
+            registros = np.concatenate(registros)
+            self._agendados -= len(registros)
+        else:
+            registros = np.empty((0, 5), dtype=np.int32)
+
+        if previas is None:
+            movidas = np.arange(self.n)
+        else:
+            desplazamiento = ((posiciones - self._referencia)**2).sum(axis=1)
+            movidas = np.flatnonzero(desplazamiento > (self.piel / 2)**2)
+        if len(movidas):
+            # Los pares de las consultadas se comprueban ya; solo los que están
+            # dentro ahora pueden ser nuevos, según su estado del paso anterior
+            pares = self._consultar(movidas)
+            cerca = np.sqrt(_distancia2(posiciones, pares[:, 0], pares[:, 1]))
+            antes = np.zeros(len(pares), dtype=bool)
+            if previas is not None:
+                ahora = np.flatnonzero(cerca < self.threshold)
+                antes[ahora] = (_distancia2(previas, pares[ahora, 0], pares[ahora, 1])
+                                < self.threshold**2)
+            registros = self._vigentes(registros)
+            distancias = np.sqrt(_distancia2(posiciones, registros[:, 0], registros[:, 1]))
+            registros = np.concatenate([registros, self._registros(pares, antes)])
+            distancias = np.concatenate([distancias, cerca])
+        else:
+            registros = self._vigentes(registros)
+            distancias = np.sqrt(_distancia2(posiciones, registros[:, 0], registros[:, 1]))
+        if not len(registros):
+            return 0
+        self.comprobaciones += len(registros)
+        i, j = registros[:, 0], registros[:, 1]
+        dentro = distancias < self.threshold
+        nuevos = np.flatnonzero(dentro & (registros[:, 4] == 0))
+        registros[:, 4] = dentro
+
+        if len(nuevos):
+            nuevos = nuevos[np.lexsort((j[nuevos], i[nuevos]))]
+            a, b = i[nuevos], j[nuevos]
+            self._eventos.append((np.full(len(nuevos), self.pasos), a, b, distancias[nuevos],
+                                  (posiciones[a] + posiciones[b]) / 2))
+            if self.B_modificado is not None:
+                registros, distancias = self._cambiar_torsion(np.r_[a, b], registros, distancias)
+        self._agendar(registros, distancias)
+        if self._agendados > self._purga:
+            self._purgar()
+        return len(nuevos)
+
+    def paso(self):
+        """Avanza un paso `dt`; devuelve el número de acoplamientos nuevos."""
+        previas = self.posiciones
+        self.pasos += 1
+        self.t = self.pasos * self.dt
+        self.posiciones = self._posiciones()
+        return self._actualizar(previas)
+
+    def avanzar(self, pasos):
+        """Avanza `pasos` pasos; devuelve el total de acoplamientos nuevos."""
+        return sum(self.paso() for _ in range(pasos))
+
+    @property
+    def pares_candidatos(self):
+        """Pares (E, 2) de la lista de vecinos vigente, con i < j."""
+        registros = [r for grupo in self._agenda.values() for r in grupo]
+        if not registros:
+            return np.empty((0, 2), dtype=np.int32)
+        pares = self._vigentes(np.concatenate(registros))[:, :2]
+        return np.unique(pares, axis=0)
+
+    def eventos(self):
+        """Acoplamientos registrados: paso, i, j, distancia (M,) y punto (M, 3)."""
+        if not self._eventos:
+            return {'paso': np.empty(0, dtype=int), 'i': np.empty(0, dtype=np.int32),
+                    'j': np.empty(0, dtype=np.int32), 'distancia': np.empty(0),
+                    'punto': np.empty((0, 3))}
+        paso, i, j, distancia, punto = (np.concatenate(c) for c in zip(*self._eventos))
+        return {'paso': paso, 'i': i, 'j': j, 'distancia': distancia, 'punto': punto}
@@ -0,0 +1,390 @@
+"""Exportación de escenas 3D a un visor WebGL autónomo (solo numpy).
+
+Una `EscenaWeb` reúne capas de curvas (trayectorias), aristas (la red de
+acoplamientos) y superficies (el campo radial) y las escribe en un
+directorio como:
+
+- `escena.bin`: todos los búferes binarios seguidos (float32 para
+  posiciones, uint32 para desplazamientos e índices, uint8 para colores),
+  alineados a 4 bytes para leerse como arreglos tipados de JavaScript;
+- `escena.json`: el manifiesto con la posición de cada búfer;
+- `index.html`: un visor WebGL2 sin dependencias externas. El giro, el
+  zoom y la visibilidad de las capas se resuelven en el navegador.
+
+Por defecto los datos se incrustan en el HTML (en base64), de modo que
+basta abrirlo con doble clic y sin red; por encima de `LIMITE_INCRUSTADO`
+el visor lee `escena.bin` y hay que servir el directorio (por ejemplo con
+`python -m http.server`).
+"""
+import base64
+import json
+import os
+
+import numpy as np
+
+# Tamaño máximo de los búferes que se incrustan en el HTML
+LIMITE_INCRUSTADO = 64 * 2**20
+
+
+def _rgba(colores, n, defecto):
+    # Colores (n, 4) uint8 a partir de uno solo o de uno por elemento en [0, 1]
+    colores = np.asarray(defecto if colores is None else colores, dtype=float)
+    if colores.ndim == 1:
+        colores = np.broadcast_to(colores, (n, len(colores)))
+    if colores.shape != (n, 3) and colores.shape != (n, 4):
+        raise ValueError(f"se esperaban {n} colores RGB o RGBA, no {colores.shape}")
+    if colores.shape[1] == 3:
+        colores = np.column_stack([colores, np.ones(n)])
+    return np.round(np.clip(colores, 0, 1) * 255).astype(np.uint8)
+
+
+class EscenaWeb:
+    """Capas de una escena 3D para exportar con `guardar`.
+
+    Las posiciones se guardan en float32. Las capas se dibujan en el orden
+    en que se añaden, las superficies semitransparentes al final.
+    """
+
+    def __init__(self, titulo="Escena"):
+        self.titulo = titulo
+        self.capas = []
+
+    def curvas(self, curvas, colores=None, nombre='curvas'):
+        """Añade curvas: un arreglo (M, n, 3) o una lista de arreglos (n_k, 3).
+
+        `colores` es uno solo o uno por curva (RGB o RGBA en [0, 1]).
+        """
+        curvas = [np.asarray(curva, dtype=np.float32).reshape(-1, 3) for curva in curvas]
+        largos = np.array([len(curva) for curva in curvas], dtype=np.int64)
+        desplazamientos = np.concatenate([[0], np.cumsum(largos)]).astype(np.uint32)
+        posiciones = np.concatenate(curvas) if curvas else np.empty((0, 3), np.float32)
+        self.capas.append({'nombre': nombre, 'tipo': 'curvas', 'buferes': {
+            'posiciones': posiciones,
+            'desplazamientos': desplazamientos,
+            'colores': _rgba(colores, len(curvas), (0.2, 0.3, 0.8)),
+        }})
+        return self
+
+    def aristas(self, inicios, fines, colores=None, nombre='aristas'):
+        """Añade segmentos sueltos de `inicios` (E, 3) a `fines` (E, 3)."""
+        inicios = np.asarray(inicios, dtype=np.float32).reshape(-1, 3)
+        fines = np.asarray(fines, dtype=np.float32).reshape(-1, 3)
+        if inicios.shape != fines.shape:
+            raise ValueError(f"inicios {inicios.shape} y fines {fines.shape} no coinciden")
+        self.capas.append({'nombre': nombre, 'tipo': 'aristas', 'buferes': {
+            'posiciones': np.stack([inicios, fines], axis=1).reshape(-1, 3),
+            'colores': _rgba(colores, len(inicios), (0, 0, 0, 0.5)),
+        }})
+        return self
+
+    def superficie(self, vertices, indices, colores=None, nombre='superficie'):
+        """Añade una malla de triángulos: vértices (N, 3) e índices (3·T,).
+
+        `SuperficieCampo.buferes()` da ambos directamente. `colores` es uno
+        solo o uno por vértice.
+        """
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        indices = np.asarray(indices, dtype=np.uint32).ravel()
+        if len(indices) % 3 or (len(indices) and indices.max() >= len(vertices)):
+            raise ValueError("los índices deben formar triángulos de vértices existentes")
+        self.capas.append({'nombre': nombre, 'tipo': 'superficie', 'buferes': {
+            'posiciones': vertices,
+            'indices': indices,
+            'colores': _rgba(colores, len(vertices), (0.3, 0.6, 0.5, 0.6)),
+        }})
+        return self
+
+    def _empaquetar(self):
+        # Un único búfer binario y el manifiesto que lo describe
+        trozos, capas, total = [], [], 0
+        for capa in self.capas:
+            descripcion = {'nombre': capa['nombre'], 'tipo': capa['tipo']}
+            for clave, arreglo in capa['buferes'].items():
+                datos = np.ascontiguousarray(arreglo).tobytes()
+                descripcion[clave] = {'tipo': arreglo.dtype.name, 'desplazamiento': total,
+                                      'cantidad': int(arreglo.size)}
+                relleno = -len(datos) % 4
+                trozos.append(datos + b'\0' * relleno)
+                total += len(datos) + relleno
+            capas.append(descripcion)
+
+        posiciones = [capa['buferes']['posiciones'] for capa in self.capas
+                      if len(capa['buferes']['posiciones'])]
+        if posiciones:
+            minimo = np.min([p.min(axis=0) for p in posiciones], axis=0).astype(float)
+            maximo = np.max([p.max(axis=0) for p in posiciones], axis=0).astype(float)
+        else:
+            minimo = maximo = np.zeros(3)
+        manifiesto = {'titulo': self.titulo, 'archivo': 'escena.bin', 'bytes': total,
+                      'centro': ((minimo + maximo) / 2).tolist(),
+                      'radio': float(max(np.linalg.norm(maximo - minimo) / 2, 1e-9)),
+                      'capas': capas}
+        return b''.join(trozos), manifiesto
+
+    def guardar(self, directorio, incrustar=None):
+        """Escribe la escena en `directorio` y devuelve la ruta del HTML.
+
+        Con `incrustar=None` los datos se incrustan en el HTML si no pasan
+        de `LIMITE_INCRUSTADO` bytes.
+        """
+        datos, manifiesto = self._empaquetar()
+        if incrustar is None:
+            incrustar = len(datos) <= LIMITE_INCRUSTADO
+        os.makedirs(directorio, exist_ok=True)
+        with open(os.path.join(directorio, 'escena.bin'), 'wb') as archivo:
+            archivo.write(datos)
+        with open(os.path.join(directorio, 'escena.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(manifiesto, archivo, indent=2, ensure_ascii=False)
+
+        incrustado = ''
+        if incrustar:
+            incrustado = ('<script id="datos" type="application/octet-stream">'
+                          + base64.b64encode(datos).decode('ascii') + '</script>')
+        # `</` no puede aparecer dentro de un <script>
+        html = (_PLANTILLA
+                .replace('__TITULO__', _escapar(self.titulo))
+                .replace('__MANIFIESTO__', json.dumps(manifiesto, ensure_ascii=False)
+                         .replace('</', '<\\/'))
+                .replace('__DATOS__', incrustado))
+        ruta = os.path.join(directorio, 'index.html')
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(html)
+        return ruta
+
+
+def _escapar(texto):
+    return (texto.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;'))
+
+
+_PLANTILLA = r"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>__TITULO__</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; background: #fff;
+               font: 13px sans-serif; }
+  canvas { display: block; width: 100%; height: 100%; cursor: grab; }
+  #panel { position: absolute; top: 8px; left: 8px; padding: 6px 10px;
+           background: rgba(255, 255, 255, 0.85); border: 1px solid #ccc; }
+  #panel h1 { font-size: 14px; margin: 0 0 4px; }
+  #panel label { display: block; }
+  #estado { color: #666; margin-top: 4px; }
+</style>
+</head>
+<body>
+<canvas id="lienzo"></canvas>
+<div id="panel"><h1>__TITULO__</h1><div id="capas"></div>
+  <label><input type="checkbox" id="girar"> girar</label>
+  <div id="estado">cargando…</div></div>
+__DATOS__
+<script>
+"use strict";
+const MANIFIESTO = __MANIFIESTO__;
+const TIPOS = {float32: Float32Array, uint32: Uint32Array, uint8: Uint8Array};
+
+async function cargarDatos() {
+  const nodo = document.getElementById("datos");
+  if (nodo) {
+    const texto = atob(nodo.textContent.trim());
+    const bytes = new Uint8Array(texto.length);
+    for (let i = 0; i < texto.length; i++) bytes[i] = texto.charCodeAt(i);
+    return bytes.buffer;
+  }
+  const respuesta = await fetch(MANIFIESTO.archivo);
+  if (!respuesta.ok) throw new Error("no se pudo leer " + MANIFIESTO.archivo);
+  return respuesta.arrayBuffer();
+}
+
+function vista(datos, d) {
+  return new TIPOS[d.tipo](datos, d.desplazamiento, d.cantidad);
+}
+
+// Matrices 4×4 en columnas, como las espera WebGL
+function perspectiva(fov, aspecto, cerca, lejos) {
+  const f = 1 / Math.tan(fov / 2), r = 1 / (cerca - lejos);
+  return [f / aspecto, 0, 0, 0, 0, f, 0, 0, 0, 0, (cerca + lejos) * r, -1,
+          0, 0, 2 * cerca * lejos * r, 0];
+}
+function mirar(ojo, centro, arriba) {
+  const resta = (a, b) => [a[0] - b[0], a[1] - b[1], a[2] - b[2]];
+  const cruz = (a, b) => [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2],
+                          a[0] * b[1] - a[1] * b[0]];
+  const unitario = a => { const n = Math.hypot(...a); return a.map(x => x / n); };
+  const punto = (a, b) => a[0] * b[0] + a[1] * b[1] + a[2] * b[2];
+  const z = unitario(resta(ojo, centro)), x = unitario(cruz(arriba, z)), y = cruz(z, x);
+  return [x[0], y[0], z[0], 0, x[1], y[1], z[1], 0, x[2], y[2], z[2], 0,
+          -punto(x, ojo), -punto(y, ojo), -punto(z, ojo), 1];
+}
+function producto(a, b) {
+  const r = new Array(16).fill(0);
+  for (let c = 0; c < 4; c++)
+    for (let f = 0; f < 4; f++)
+      for (let k = 0; k < 4; k++) r[c * 4 + f] += a[k * 4 + f] * b[c * 4 + k];
+  return r;
+}
+
+const VERTICES = `#version 300 es
+in vec3 posicion; in vec4 color; uniform mat4 matriz; out vec4 v_color;
+void main() { gl_Position = matriz * vec4(posicion, 1.0); v_color = color; }`;
+const FRAGMENTOS = `#version 300 es
+precision mediump float; in vec4 v_color; out vec4 salida;
+void main() { salida = v_color; }`;
+
+function compilar(gl) {
+  const programa = gl.createProgram();
+  for (const [tipo, fuente] of [[gl.VERTEX_SHADER, VERTICES], [gl.FRAGMENT_SHADER, FRAGMENTOS]]) {
+    const shader = gl.createShader(tipo);
+    gl.shaderSource(shader, fuente);
+    gl.compileShader(shader);
+    if (!gl.getShaderParameter(shader, gl.COMPILE_STATUS)) throw new Error(gl.getShaderInfoLog(shader));
+    gl.attachShader(programa, shader);
+  }
+  gl.linkProgram(programa);
+  if (!gl.getProgramParameter(programa, gl.LINK_STATUS)) throw new Error(gl.getProgramInfoLog(programa));
+  return programa;
+}
+
+// Índices de dibujo y colores por vértice de cada tipo de capa
+function prepararCapa(datos, capa) {
+  const posiciones = vista(datos, capa.posiciones);
+  const colores = vista(datos, capa.colores);
+  const nVertices = posiciones.length / 3;
+  // Cada color RGBA como un uint32 (los búferes están alineados a 4 bytes)
+  const rgba = new Uint32Array(colores.buffer, colores.byteOffset, colores.length / 4);
+  if (capa.tipo === "curvas") {
+    const desplazamientos = vista(datos, capa.desplazamientos);
+    const nCurvas = desplazamientos.length - 1;
+    const porVertice = new Uint32Array(nVertices);
+    const indices = new Uint32Array(2 * Math.max(nVertices - nCurvas, 0));
+    let k = 0;
+    for (let c = 0; c < nCurvas; c++) {
+      const inicio = desplazamientos[c], fin = desplazamientos[c + 1];
+      porVertice.fill(rgba[c], inicio, fin);
+      for (let v = inicio; v + 1 < fin; v++) { indices[k++] = v; indices[k++] = v + 1; }
+    }
+    return {posiciones, colores: new Uint8Array(porVertice.buffer),
+            indices: indices.subarray(0, k), modo: "LINES"};
+  }
+  if (capa.tipo === "aristas") {
+    const porVertice = new Uint32Array(nVertices);
+    const indices = new Uint32Array(nVertices);
+    for (let v = 0; v < nVertices; v++) { porVertice[v] = rgba[v >> 1]; indices[v] = v; }
+    return {posiciones, colores: new Uint8Array(porVertice.buffer), indices, modo: "LINES"};
+  }
+  return {posiciones, colores, indices: vista(datos, capa.indices), modo: "TRIANGLES",
+          transparente: true};
+}
+
+async function iniciar() {
+  const lienzo = document.getElementById("lienzo");
+  const estado = document.getElementById("estado");
+  const gl = lienzo.getContext("webgl2", {antialias: true});
+  if (!gl) { estado.textContent = "este navegador no admite WebGL2"; return; }
+  const datos = await cargarDatos();
+  const programa = compilar(gl);
+  const atributoPosicion = gl.getAttribLocation(programa, "posicion");
+  const atributoColor = gl.getAttribLocation(programa, "color");
+  const uniformeMatriz = gl.getUniformLocation(programa, "matriz");
+
+  const capas = MANIFIESTO.capas.map(capa => {
+    const p = prepararCapa(datos, capa);
+    const vao = gl.createVertexArray();
+    gl.bindVertexArray(vao);
+    const bufer = (destino, arreglo) => {
+      const b = gl.createBuffer(); gl.bindBuffer(destino, b);
+      gl.bufferData(destino, arreglo, gl.STATIC_DRAW); return b;
+    };
+    bufer(gl.ARRAY_BUFFER, p.posiciones);
+    gl.enableVertexAttribArray(atributoPosicion);
+    gl.vertexAttribPointer(atributoPosicion, 3, gl.FLOAT, false, 0, 0);
+    bufer(gl.ARRAY_BUFFER, p.colores);
+    gl.enableVertexAttribArray(atributoColor);
+    gl.vertexAttribPointer(atributoColor, 4, gl.UNSIGNED_BYTE, true, 0, 0);
+    bufer(gl.ELEMENT_ARRAY_BUFFER, p.indices);
+    gl.bindVertexArray(null);
+    return {nombre: capa.nombre, tipo: capa.tipo, vao, n: p.indices.length,
+            modo: gl[p.modo], transparente: !!p.transparente, visible: true,
+            vertices: p.posiciones.length / 3};
+  });
+
+  const lista = document.getElementById("capas");
+  for (const capa of capas) {
+    const etiqueta = document.createElement("label");
+    const casilla = document.createElement("input");
+    casilla.type = "checkbox"; casilla.checked = true;
+    casilla.onchange = () => { capa.visible = casilla.checked; pedirDibujo(); };
+    etiqueta.append(casilla, ` ${capa.nombre} (${capa.vertices.toLocaleString()} vértices)`);
+    lista.append(etiqueta);
+  }
+
+  // Cámara orbital alrededor del centro de la escena, con Z hacia arriba
+  let azimut = -60 * Math.PI / 180, elevacion = 30 * Math.PI / 180, distancia = 2.8;
+  const centro = MANIFIESTO.centro, radio = MANIFIESTO.radio;
+  const girar = document.getElementById("girar");
+  let pendiente = false, ultimo = performance.now(), cuadros = 0;
+
+  function dibujar(ahora) {
+    pendiente = false;
+    const ancho = lienzo.clientWidth * devicePixelRatio, alto = lienzo.clientHeight * devicePixelRatio;
+    if (lienzo.width !== ancho || lienzo.height !== alto) { lienzo.width = ancho; lienzo.height = alto; }
+    gl.viewport(0, 0, ancho, alto);
+    gl.clearColor(1, 1, 1, 1);
+    gl.clear(gl.COLOR_BUFFER_BIT | gl.DEPTH_BUFFER_BIT);
+    const d = distancia * radio;
+    const ojo = [centro[0] + d * Math.cos(elevacion) * Math.cos(azimut),
+                 centro[1] + d * Math.cos(elevacion) * Math.sin(azimut),
+                 centro[2] + d * Math.sin(elevacion)];
+    const matriz = producto(perspectiva(Math.PI / 4, ancho / alto, d / 100, d * 4),
+                            mirar(ojo, centro, [0, 0, 1]));
+    gl.useProgram(programa);
+    gl.uniformMatrix4fv(uniformeMatriz, false, matriz);
+    gl.enable(gl.DEPTH_TEST);
+    gl.enable(gl.BLEND);
+    gl.blendFunc(gl.SRC_ALPHA, gl.ONE_MINUS_SRC_ALPHA);
+    for (const transparente of [false, true]) {
+      gl.depthMask(!transparente);
+      for (const capa of capas) {
+        if (!capa.visible || capa.transparente !== transparente) continue;
+        gl.bindVertexArray(capa.vao);
+        gl.drawElements(capa.modo, capa.n, gl.UNSIGNED_INT, 0);
+      }
+    }
+    gl.bindVertexArray(null);
+    cuadros++;
+    if (ahora - ultimo > 1000) {
+      estado.textContent = `${(cuadros * 1000 / (ahora - ultimo)).toFixed(0)} cuadros/s`;
+      cuadros = 0; ultimo = ahora;
+    }
+    if (girar.checked) { azimut += 0.005; pedirDibujo(); }
+  }
+  function pedirDibujo() {
+    if (!pendiente) { pendiente = true; requestAnimationFrame(dibujar); }
+  }
+
+  let arrastre = null;
+  lienzo.addEventListener("pointerdown", e => { arrastre = [e.clientX, e.clientY]; lienzo.setPointerCapture(e.pointerId); });
+  lienzo.addEventListener("pointerup", () => { arrastre = null; });
+  lienzo.addEventListener("pointermove", e => {
+    if (!arrastre) return;
+    azimut -= (e.clientX - arrastre[0]) * 0.01;
+    elevacion = Math.max(-1.55, Math.min(1.55, elevacion + (e.clientY - arrastre[1]) * 0.01));
+    arrastre = [e.clientX, e.clientY];
+    pedirDibujo();
+  });
+  lienzo.addEventListener("wheel", e => {
+    e.preventDefault();
+    distancia = Math.max(0.2, Math.min(20, distancia * Math.exp(e.deltaY * 0.001)));
+    pedirDibujo();
+  }, {passive: false});
+  girar.onchange = pedirDibujo;
+  window.addEventListener("resize", pedirDibujo);
+  pedirDibujo();
+}
+
+iniciar().catch(error => { document.getElementById("estado").textContent = error.message; });
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,120 @@
+"""Estado explícito de la simulación, sin variables globales.
+
+Cada etapa (proyección, acoplamiento, modificación, dispersión, hélices
+reales) lee sus parámetros de un `EstadoSimulacion` y recibe el resultado
+del acoplamiento como un `Acoplamiento`, en lugar de depender de lo que
+haya dejado una etapa anterior. Los estados son inmutables y se pueden
+pasar a otros procesos: el acoplamiento ya calculado viaja con ellos.
+"""
+from dataclasses import dataclass, field, fields, replace
+
+import numpy as np
+
+from .acoplamiento import acoplamiento_exacto, helice_parametrica
+from .trayectorias import helice_proyectiva
+
+
+@dataclass(frozen=True, slots=True)
+class Acoplamiento:
+    """Acercamiento máximo entre las dos partículas proyectivas de un estado.
+
+    `curva1` y `curva2` son las trayectorias (x, y, z) de ambas partículas
+    en dos giros; `s` y `t` los parámetros del acercamiento en cada una.
+    """
+    curva1: tuple
+    curva2: tuple
+    s: float
+    t: float
+    distancia: float
+    punto: tuple
+
+
+def acoplar(a1, w1, b1, a2, w2, b2, n=1000):
+    """Acopla dos hélices proyectivas (ángulo, fase, torsión) en dos giros."""
+    theta = np.linspace(0, 4 * np.pi, n)
+    s, t, distancia, punto = acoplamiento_exacto(
+        helice_parametrica(np.cos(a1), w1, b1, 4 * np.pi),
+        helice_parametrica(np.cos(a2), w2, b2, 4 * np.pi))
+    return Acoplamiento(helice_proyectiva(theta, a1, w1, b1),
+                        helice_proyectiva(theta, a2, w2, b2),
+                        s, t, distancia, punto)
+
+
+@dataclass(frozen=True, slots=True)
+class EstadoSimulacion:
+    """Parámetros de todas las etapas de TeoriaVacio.
+
+    Los ángulos van en radianes. `A1_new` y `A2_new` valen None mientras
+    no se fijen: entonces se derivan de `a1` y `a2` (ver
+    `angulos_dispersion`). `con(...)` devuelve una copia modificada.
+    """
+    # Hélice proyectiva: ángulo de salida, giros, fase y torsión
+    A: float = np.radians(30)
+    S: float = 3
+    W: float = 2 * np.pi
+    B: float = 0.2
+    # Múltiples proyecciones desde ε₀, una tupla (A, S, W, B) por partícula
+    parametros: tuple = (
+        (np.radians(20), 2, 0, 0.1),
+        (np.radians(45), 4, np.pi/2, 0.3),
+        (np.radians(60), 1.5, np.pi, 0.15),
+        (np.radians(80), 2.5, 3*np.pi/2, 0.25),
+    )
+    # Dos partículas para el acoplamiento estructural
+    a1: float = np.radians(30)
+    s1: float = 3
+    w1: float = 0
+    b1: float = 0.2
+    a2: float = np.radians(60)
+    s2: float = 2
+    w2: float = np.pi/2
+    b2: float = 0.2
+    # Nueva torsión estructural después del acoplamiento
+    B_modificado: float = 0.35
+    # Parámetros tras la dispersión en el punto de acoplamiento
+    A1_new: float = None
+    A2_new: float = None
+    B1_new: float = 0.4
+    B2_new: float = 0.25
+    S1_new: float = 2.5
+    S2_new: float = 3
+    # Hélices reales: radio, paso, giros y fase de cada una
+    r1_h: float = 1.0
+    r2_h: float = 1.0
+    b1_h: float = 0.2
+    b2_h: float = 0.3
+    S1_h: float = 3
+    S2_h: float = 2.5
+    w1_h: float = 0
+    w2_h: float = np.pi/3
+    _acoplamiento: Acoplamiento = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Tuplas para que el estado sea inmutable y se pueda usar como clave
+        object.__setattr__(self, 'parametros', tuple(tuple(p) for p in self.parametros))
+
+    @classmethod
+    def parametros_validos(cls):
+        """Nombres de los parámetros que admite `con`."""
+        return tuple(f.name for f in fields(cls) if f.init)
+
+    def con(self, **cambios):
+        """Copia del estado con `cambios`; rechaza nombres desconocidos."""
+        desconocidos = sorted(set(cambios) - set(self.parametros_validos()))
+        if desconocidos:
+            raise ValueError(f"parámetros desconocidos: {', '.join(desconocidos)}")
+        return replace(self, **cambios)
+
+    @property
+    def acoplamiento(self):
+        """`Acoplamiento` de las partículas 1 y 2, calculado una sola vez."""
+        if self._acoplamiento is None:
+            object.__setattr__(self, '_acoplamiento',
+                               acoplar(self.a1, self.w1, self.b1, self.a2, self.w2, self.b2))
+        return self._acoplamiento
+
+    def angulos_dispersion(self):
+        """Ángulos de salida (A1, A2) tras la dispersión en el acoplamiento."""
+        A1 = self.a1 + np.radians(10) if self.A1_new is None else self.A1_new
+        A2 = self.a2 - np.radians(15) if self.A2_new is None else self.A2_new
+        return A1, A2
@@ -0,0 +1,175 @@
+"""Flujo por etapas: acoplamiento → modificación → dispersión → ramificación.
+
+Un lote es un diccionario de arreglos cuyo primer eje recorre las parejas
+de partículas del lote. Las fuentes (`lotes_parejas`, `parejas_aleatorias`)
+producen lotes con `params`, un arreglo (m, 2, 4) de (A, S, W, B) por
+pareja, e `inicio`, la posición de la primera pareja en la población.
+Cada etapa es una función que recibe un iterable de lotes y devuelve un
+generador de lotes con sus propias claves añadidas, de modo que
+
+    flujo(parejas_aleatorias(10**6, seed=42, chunk=256),
+          etapa_acoplamiento(), etapa_modificacion(), etapa_dispersion())
+
+recorre un millón de parejas con la memoria de un solo lote. Todas las
+etapas admiten una `CacheLRU` indexada por las entradas que leen.
+"""
+import numpy as np
+
+from . import nucleos
+from .acoplamiento import acoplamiento_exacto, helice_parametrica
+from .memoria import _congelar, cuantizar
+from .trayectorias import (
+    parametros_aleatorios,
+    parametros_dispersion,
+    ramas_dispersion,
+)
+
+
+def lotes_parejas(params, chunk=4096):
+    """Recorre un arreglo (N, 2, 4) de parejas en lotes de `chunk`.
+
+    `params` puede ser un `np.memmap`: cada lote es una vista de él.
+    """
+    if np.ndim(params) != 3 or np.shape(params)[1:] != (2, 4):
+        raise ValueError(f"params debe tener forma (N, 2, 4), no {np.shape(params)}")
+    for inicio in range(0, len(params), chunk):
+        yield {'inicio': inicio, 'params': params[inicio:inicio + chunk]}
+
+
+def parejas_aleatorias(n, seed=42, chunk=4096, **rangos):
+    """`n` parejas aleatorias en lotes de `chunk`, sorteadas sobre la marcha.
+
+    El resultado concatenado coincide con
+    `parametros_aleatorios(2 * n, seed, **rangos).reshape(n, 2, 4)`.
+    """
+    rng = np.random.RandomState(seed)
+    for inicio in range(0, n, chunk):
+        m = min(chunk, n - inicio)
+        yield {'inicio': inicio,
+               'params': parametros_aleatorios(2 * m, rng, **rangos).reshape(m, 2, 4)}
+
+
+def etapa(calcular, entradas, cache=None):
+    """Convierte `calcular(**entradas) -> dict` en una etapa del flujo.
+
+    `entradas` son las claves del lote que lee `calcular`; con una `cache`
+    (una `CacheLRU`) el resultado se indexa por ellas, cuantizadas, y sus
+    arreglos quedan de solo lectura.
+    """
+    def aplicar(lotes):
+        for lote in lotes:
+            argumentos = {clave: lote[clave] for clave in entradas}
+            if cache is None:
+                nuevos = calcular(**argumentos)
+            else:
+                nuevos = cache.obtener(cuantizar(argumentos),
+                                       lambda: _congelar(calcular(**argumentos)))
+            yield {**lote, **nuevos}
+
+    aplicar.cache = cache
+    return aplicar
+
+
+def flujo(fuente, *etapas):
+    """Encadena `etapas` sobre los lotes de `fuente`; devuelve un generador."""
+    lotes = iter(fuente)
+    for siguiente in etapas:
+        lotes = siguiente(lotes)
+    return lotes
+
+
+def etapa_acoplamiento(vueltas=2, n=1000, exacto=False, tol=1e-9, cache=None):
+    """Acoplamiento de cada pareja en sus primeras `vueltas` vueltas.
+
+    Por defecto es el de mínima distancia entre muestras del mismo índice
+    (`acoplamiento_indice`) sobre `n` muestras, calculado para todo el lote
+    a la vez con `nucleos.acoplamientos_indice` (en el backend elegido con
+    `usar_backend`). Con `exacto=True` se usa `acoplamiento_exacto`, como
+    en `EstadoSimulacion.acoplamiento`, pero pareja a pareja (alrededor de
+    1 ms por pareja). Añade `s`, `t`, `distancia` (m,) y `punto` (m, 3).
+    """
+    t_fin = 2 * np.pi * vueltas
+    theta = np.linspace(0, t_fin, n)
+
+    def por_indice(params):
+        A, _, W, B = np.moveaxis(params, -1, 0)
+        helices = np.stack([np.cos(A), W, B, np.zeros_like(B)], axis=-1)
+        indice, distancia, punto = nucleos.acoplamientos_indice(helices[:, 0], helices[:, 1], theta)
+        return {'s': theta[indice], 't': theta[indice],
+                'distancia': distancia, 'punto': punto}
+
+    def exacta(params):
+        m = len(params)
+        s, t, distancia = np.empty(m), np.empty(m), np.empty(m)
+        punto = np.empty((m, 3))
+        for k, ((A1, _, W1, B1), (A2, _, W2, B2)) in enumerate(params):
+            s[k], t[k], distancia[k], punto[k] = acoplamiento_exacto(
+                helice_parametrica(np.cos(A1), W1, B1, t_fin),
+                helice_parametrica(np.cos(A2), W2, B2, t_fin), tol=tol)
+        return {'s': s, 't': t, 'distancia': distancia, 'punto': punto}
+
+    return etapa(exacta if exacto else por_indice, ('params',), cache)
+
+
+def _desde(params, punto, theta, dtype):
+    # Hélices proyectivas (..., 4) trasladadas a su `punto` (m, 3)
+    forma = params.shape[:-1]
+    trayectorias = nucleos.helices(params.reshape(-1, 4), theta=theta, dtype=dtype)
+    trayectorias = trayectorias.reshape(*forma, len(theta), 3)
+    trayectorias += np.asarray(punto, dtype=dtype).reshape(
+        len(punto), *(1,) * (len(forma) - 1), 1, 3)
+    return trayectorias
+
+
+def etapa_modificacion(B_modificado=0.35, n=1000, dtype=np.float64, cache=None):
+    """Trayectoria de la partícula 1 tras acoplarse con torsión `B_modificado`.
+
+    Añade `modificada` (m, n, 3), la curva de `trayectoria_modificada`
+    desde el punto de acoplamiento (fig4).
+    """
+    theta = np.linspace(0, 2 * np.pi, n)
+
+    def calcular(params, punto):
+        nuevos = np.array(params[:, 0], dtype=float)
+        nuevos[:, 3] = B_modificado
+        return {'modificada': _desde(nuevos, punto, theta, dtype)}
+
+    return etapa(calcular, ('params', 'punto'), cache)
+
+
+def etapa_dispersion(delta_A=(np.radians(10), -np.radians(15)), B_nuevo=(0.4, 0.25),
+                     n=1000, dtype=np.float64, cache=None):
+    """Dispersión de ambas partículas desde el punto de acoplamiento (fig7).
+
+    Cada partícula sale con su ángulo desplazado `delta_A` y torsión
+    `B_nuevo`, conservando su fase. Añade `dispersion` (m, 2, n, 3).
+    """
+    theta = np.linspace(0, 2 * np.pi, n)
+
+    def calcular(params, punto):
+        nuevos = np.array(params, dtype=float)
+        nuevos[..., 0] += delta_A
+        nuevos[..., 3] = B_nuevo
+        return {'dispersion': _desde(nuevos, punto, theta, dtype)}
+
+    return etapa(calcular, ('params', 'punto'), cache)
+
+
+def etapa_ramificacion(num_ramas=30, seed=123, n=1000, dtype=np.float64, cache=None):
+    """Ramas toroidales dispersas desde el punto de acoplamiento de cada pareja (fig8).
+
+    Las ramas de la pareja k se sortean con `default_rng([seed, k])`, así
+    que no dependen del tamaño de los lotes. Añade `ramas`
+    (m, num_ramas, n, 3): conviene usar lotes pequeños.
+    """
+    theta = np.linspace(0, 2 * np.pi, n)
+
+    def calcular(inicio, punto):
+        ramas = np.empty((len(punto), num_ramas, n, 3), dtype=dtype)
+        for k, origen in enumerate(punto):
+            rng = np.random.default_rng([seed, inicio + k])
+            ramas[k] = ramas_dispersion(theta, parametros_dispersion(num_ramas, rng),
+                                        origen, dtype=dtype)
+        return {'ramas': ramas}
+
+    return etapa(calcular, ('inicio', 'punto'), cache)
@@ -0,0 +1,123 @@
+"""Geometría diferencial analítica de las trayectorias estructurales.
+
+Cada familia de trayectorias (hélice, rotación doble toroidal, rama de
+dispersión) tiene aquí sus derivadas primera, segunda y tercera en forma
+cerrada, sin diferencias finitas ni ruido en los extremos. Con `omega`
+las derivadas son respecto del tiempo, tomando θ = ω·t. Las diferencias
+finitas quedan solo como respaldo para trayectorias arbitrarias.
+
+Cada derivada se devuelve como una tupla (x, y, z) de arreglos, igual que
+las trayectorias de `vacio.trayectorias`; las componentes constantes son
+vistas de solo lectura (`np.broadcast_to`) en lugar de copias.
+"""
+import numpy as np
+
+
+def _componentes(theta, *componentes):
+    # Las componentes constantes se expanden a la forma de theta
+    formas = [np.broadcast_shapes(np.shape(c), np.shape(theta)) for c in componentes]
+    return tuple(c if np.shape(c) == forma else np.broadcast_to(c, forma)
+                 for c, forma in zip(componentes, formas))
+
+
+def derivadas_helice(theta, r, b, fase=0.0, omega=1.0):
+    """Velocidad, aceleración y sobreaceleración de `helice_real`.
+
+    También sirve para `helice_proyectiva` con r = cos(A), b = B y
+    fase = W. Devuelve `(v, a, j)`.
+    """
+    theta = np.asarray(theta, dtype=float)
+    c, s = np.cos(theta + fase), np.sin(theta + fase)
+    w2 = omega * omega
+    v = _componentes(theta, -r * omega * s, r * omega * c, b * omega)
+    a = _componentes(theta, -r * w2 * c, -r * w2 * s, 0.0)
+    j = _componentes(theta, r * w2 * omega * s, -r * w2 * omega * c, 0.0)
+    return v, a, j
+
+
+def curvatura_helice(r, b):
+    """Curvatura constante |r| / (r² + b²) de una hélice."""
+    return np.abs(r) / (r * r + b * b)
+
+
+def torsion_helice(r, b):
+    """Torsión constante b / (r² + b²) de una hélice."""
+    return b / (r * r + b * b)
+
+
+def derivadas_rotacion_doble(theta, r, b, subspin, desfase=0.0, omega=1.0):
+    """Velocidad, aceleración y sobreaceleración de `rotacion_doble`."""
+    theta = np.asarray(theta, dtype=float)
+    giro = subspin * theta + desfase
+    cg, sg = np.cos(giro), np.sin(giro)
+    c, s = np.cos(theta), np.sin(theta)
+
+    # Radio toroidal ρ = r + 0.1·cos(giro) y sus derivadas en θ
+    rho = r + 0.1 * cg
+    rho1 = -0.1 * subspin * sg
+    rho2 = -0.1 * subspin**2 * cg
+    rho3 = 0.1 * subspin**3 * sg
+
+    v = (rho1 * c - rho * s,
+         rho1 * s + rho * c,
+         b + 0.05 * subspin * cg)
+    a = (rho2 * c - 2 * rho1 * s - rho * c,
+         rho2 * s + 2 * rho1 * c - rho * s,
+         -0.05 * subspin**2 * sg)
+    j = (rho3 * c - 3 * rho2 * s - 3 * rho1 * c + rho * s,
+         rho3 * s + 3 * rho2 * c - 3 * rho1 * s - rho * c,
+         -0.05 * subspin**3 * cg)
+    return tuple(tuple(componente * omega**k for componente in derivada)
+                 for k, derivada in enumerate((v, a, j), start=1))
+
+
+def derivadas_rama(theta, direccion, spin, torsion, desfase=0.0, omega=1.0):
+    """Velocidad, aceleración y sobreaceleración de una rama de `dispersion_toroidal`.
+
+    `direccion` es el vector unitario de salida de la rama y `desfase` su
+    fase inicial (el índice de la rama en `dispersion_toroidal`).
+    """
+    theta = np.asarray(theta, dtype=float)
+    dir_x, dir_y, dir_z = direccion
+    fase = spin * theta + desfase
+    c, s = np.cos(fase), np.sin(fase)
+    k1, k2, k3 = spin * omega, (spin * omega)**2, (spin * omega)**3
+    v = _componentes(theta, -dir_x * k1 * s, dir_y * k1 * c, dir_z * torsion * omega)
+    a = _componentes(theta, -dir_x * k2 * c, -dir_y * k2 * s, 0.0)
+    j = _componentes(theta, dir_x * k3 * s, -dir_y * k3 * c, 0.0)
+    return v, a, j
+
+
+def _cruz(u, w):
+    return (u[1] * w[2] - u[2] * w[1],
+            u[2] * w[0] - u[0] * w[2],
+            u[0] * w[1] - u[1] * w[0])
+
+
+def curvatura(v, a):
+    """Curvatura de Frenet |v × a| / |v|³ (0 donde la velocidad se anula)."""
+    rapidez = np.sqrt(v[0]**2 + v[1]**2 + v[2]**2)
+    num = np.sqrt(sum(c**2 for c in _cruz(v, a)))
+    den = rapidez**3
+    return np.divide(num, den, out=np.zeros(np.shape(num)), where=den > 0)
+
+
+def torsion(v, a, j):
+    """Torsión de Frenet (v × a)·j / |v × a|² (0 donde la curvatura se anula)."""
+    va = _cruz(v, a)
+    num = va[0] * j[0] + va[1] * j[1] + va[2] * j[2]
+    den = va[0]**2 + va[1]**2 + va[2]**2
+    return np.divide(num, den, out=np.zeros(np.shape(num)), where=den > 0)
+
+
+def derivadas_numericas(x, y, z, t=None):
+    """Respaldo por diferencias finitas para trayectorias sin forma cerrada.
+
+    Usa diferencias de segundo orden, también en los extremos.
+    Devuelve `(v, a)`; `t` es el parámetro de la curva (por defecto, el
+    índice de muestra).
+    """
+    espaciado = () if t is None else (t,)
+    v = tuple(np.gradient(c, *espaciado, edge_order=2) for c in (x, y, z))
+    a = tuple(np.gradient(c, *espaciado, edge_order=2) for c in v)
+    return v, a
@@ -0,0 +1,173 @@
+"""Ayudas de dibujo sobre matplotlib.
+
+matplotlib se importa dentro de cada función, de modo que importar este
+módulo sigue costando solo numpy.
+"""
+import numpy as np
+
+from .perfil import perfilar
+
+
+def segmentos(x, y, z):
+    """Arreglo (n-1, 2, 3) con los segmentos consecutivos de una trayectoria."""
+    puntos = np.stack([x, y, z], axis=-1)
+    return np.stack([puntos[:-1], puntos[1:]], axis=1)
+
+
+def linea_coloreada(ax, x, y, z, valores, cmap='plasma', vmin=None, vmax=None, **kwargs):
+    """Dibuja una trayectoria 3D coloreada por un escalar con un solo artista.
+
+    `valores` tiene un valor por punto (energía, curvatura, T, V, L...); cada
+    segmento toma el color de su punto inicial. Todos los segmentos van en
+    un único `Line3DCollection` y el mapa de color se aplica de una vez.
+    Sin `vmin`/`vmax` la escala va del mínimo al máximo de `valores`.
+    """
+    from matplotlib import rcParams
+    from matplotlib.colors import Normalize
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+    # Mismo grosor que una línea de `ax.plot`
+    kwargs.setdefault('linewidth', rcParams['lines.linewidth'])
+    valores = np.asarray(valores)
+    habia_datos = ax.has_data()
+    coleccion = Line3DCollection(segmentos(x, y, z), cmap=cmap,
+                                 norm=Normalize(vmin, vmax), **kwargs)
+    coleccion.set_array(valores[:-1])
+    ax.add_collection3d(coleccion)
+    ax.auto_scale_xyz(x, y, z, had_data=habia_datos)
+    return coleccion
+
+
+def mover_puntos(coleccion, x, y, z):
+    """Mueve los puntos de un `scatter` 3D sin crear un artista nuevo."""
+    coleccion.set_offsets(np.column_stack([np.atleast_1d(x), np.atleast_1d(y)]))
+    coleccion.set_3d_properties(np.atleast_1d(z), 'z')
+
+
+def limitar(canvas, funcion, intervalo=1 / 30):
+    """Limita un callback de slider a una ejecución cada `intervalo` segundos.
+
+    Los eventos que llegan antes de tiempo se agrupan y se atienden una sola
+    vez al vencer el plazo, con el último valor de los sliders (el callback
+    los lee directamente). Con `intervalo <= 0` devuelve `funcion` tal cual.
+    """
+    if intervalo <= 0:
+        return funcion
+    import time
+
+    estado = {'ultimo': -np.inf, 'pendiente': False}
+    temporizador = canvas.new_timer(interval=max(1, int(intervalo * 1000)))
+    temporizador.single_shot = True
+
+    def ejecutar():
+        estado['pendiente'] = False
+        estado['ultimo'] = time.perf_counter()
+        funcion(None)
+
+    temporizador.add_callback(ejecutar)
+
+    def limitada(val):
+        if time.perf_counter() - estado['ultimo'] >= intervalo:
+            ejecutar()
+        elif not estado['pendiente']:
+            estado['pendiente'] = True
+            temporizador.start()
+
+    return limitada
+
+
+class RedibujoRapido:
+    """Redibuja solo los artistas que cambian en cada tick (blitting).
+
+    Los artistas se marcan como animados: el dibujo completo de la figura
+    guarda un fondo sin ellos y cada `actualizar()` restaura ese fondo y
+    pinta encima solo los artistas. Rotar la vista o cambiar el tamaño
+    provoca un dibujo completo, que renueva el fondo. Si el canvas no admite
+    blitting se recurre a `draw_idle`.
+
+    `controles` son ejes (los de los sliders) que también se repintan en
+    cada tick, de modo que los sliders no necesitan su propio `draw_idle`.
+    """
+
+    def __init__(self, fig, artistas, controles=()):
+        self.fig = fig
+        self.artistas = list(artistas)
+        self.controles = list(controles)
+        self.fondo = None
+        for artista in self.artistas:
+            artista.set_animated(True)
+
+        def al_dibujar(evento):
+            # Al guardar (PNG a otra resolución, SVG, PDF) el fondo no sirve
+            # para la pantalla: solo se pintan los artistas en el archivo
+            if not evento.canvas.is_saving() and evento.canvas.supports_blit:
+                self.fondo = evento.canvas.copy_from_bbox(fig.bbox)
+            self._dibujar_artistas(evento.renderer)
+
+        fig.canvas.mpl_connect('draw_event', al_dibujar)
+
+    def _dibujar_artistas(self, renderer):
+        for artista in self.artistas:
+            if hasattr(artista, 'do_3d_projection'):
+                artista.do_3d_projection()
+            artista.draw(renderer)
+
+    def _dibujar_controles(self):
+        for eje in self.controles:
+            self.fig.draw_artist(eje)
+
+    @perfilar('graficos.redibujo')
+    def actualizar(self):
+        canvas = self.fig.canvas
+        if self.fondo is None or not canvas.supports_blit:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self.fondo)
+        self._dibujar_controles()
+        self._dibujar_artistas(canvas.get_renderer())
+        canvas.blit(self.fig.bbox)
+
+
+def escala_pantalla(ax, extension=None):
+    """Píxeles por unidad de datos de `ax`, por exceso.
+
+    `extension` son los lados del recuadro de datos que se va a mostrar;
+    sin ella se usan los límites actuales de los ejes. Se toma el lado
+    mayor de los ejes en pantalla sobre el menor lado de datos, de modo que
+    las tolerancias en píxeles que se deriven de ella quedan del lado
+    seguro en cualquier dirección.
+    """
+    if extension is None:
+        limites = [ax.get_xlim(), ax.get_ylim()]
+        if hasattr(ax, 'get_zlim'):
+            limites.append(ax.get_zlim())
+        extension = [b - a for a, b in limites]
+    lados = np.abs(np.asarray(extension, dtype=float))
+    lados = lados[lados > 0]
+    if len(lados) == 0:
+        return 1.0
+    return max(ax.bbox.width, ax.bbox.height) / lados.min()
+
+
+def curvas_decimadas(ax, curvas, colores=None, tolerancia=None, **kwargs):
+    """Dibuja un conjunto (M, n, 3) de curvas como un único `Line3DCollection`.
+
+    Cada curva se reduce antes con `detalle.decimar`, sin apartarse más de
+    `tolerancia` píxeles (por defecto `detalle.TOLERANCIA_PX`) de la
+    original al tamaño de `ax`. `colores` da un color por curva.
+    """
+    from matplotlib import rcParams
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+    from .detalle import TOLERANCIA_PX, decimar
+
+    curvas = np.asarray(curvas)
+    puntos = curvas.reshape(-1, 3)
+    escala = escala_pantalla(ax, np.ptp(puntos, axis=0))
+    tolerancia = TOLERANCIA_PX if tolerancia is None else tolerancia
+    kwargs.setdefault('linewidth', rcParams['lines.linewidth'])
+    habia_datos = ax.has_data()
+    coleccion = Line3DCollection(decimar(curvas, tolerancia / escala), colors=colores, **kwargs)
+    ax.add_collection3d(coleccion)
+    ax.auto_scale_xyz(*puntos.T, had_data=habia_datos)
+    return coleccion
@@ -0,0 +1,139 @@
+"""Lagrangiano estructural L = T - V de una proyección helicoidal (solo numpy)."""
+import numpy as np
+
+from .geometria import curvatura_helice, derivadas_helice
+from .perfil import perfilar
+
+# Valores por defecto de la simulación de derivadas fundamentales
+MASA_D = 4.2e-31
+T_D = np.linspace(0, 1.5e-15, 1200)
+
+
+def hbar_estructural(masa, r, omega):
+    """Momento angular estructural I·ω de una esfera uniforme de radio r."""
+    I = (2/5) * masa * r**2   # momento de inercia de una esfera uniforme
+    return I * omega
+
+
+def energia_estructural(masa, r, omega, theta):
+    """Energía estructural simulada como variación a lo largo de la hélice."""
+    return 0.5 * masa * omega**2 * r**2 * (1 + 0.1 * np.sin(3 * theta))
+
+
+@perfilar
+def lagrangiano_direccional(masa, r, b, omega, t):
+    """T, V y L con V basada en el cambio de dirección de la velocidad."""
+    vx = -r * omega * np.sin(omega * t)
+    vy = r * omega * np.cos(omega * t)
+    vz = b * omega * np.ones_like(t)
+
+    # Energía cinética real
+    T = 0.5 * masa * (vx**2 + vy**2 + vz**2)
+
+    # Curvatura = cambio en dirección = torsión proyectiva estructural
+    curvatura = np.abs(np.gradient(np.arctan2(vy, vx)))
+    curvatura_norm = (curvatura - curvatura.min()) / (curvatura.max() - curvatura.min())
+
+    # V es alta donde hay más cambio de dirección → más torsión
+    V = T.max() * curvatura_norm**2
+    return T, V, T - V
+
+
+def _normalizar(valores):
+    # Por filas (última dimensión). Una curvatura constante (la de una
+    # hélice) está en su máximo en todo punto
+    minimo = np.min(valores, axis=-1, keepdims=True)
+    maximo = np.max(valores, axis=-1, keepdims=True)
+    rango = maximo - minimo
+    constante = rango <= 1e-12 * np.abs(maximo)
+    return np.where(constante, 1.0, (valores - minimo) / np.where(constante, 1.0, rango))
+
+
+def _compacta(valores):
+    # Una vista difundida a lo largo de la última dimensión equivale a su
+    # primera muestra
+    return valores[..., :1] if valores.strides[-1] == 0 else valores
+
+
+def _potencial_curvatura(T, r, b):
+    # V crece con el cuadrado de la curvatura normalizada. La curvatura de
+    # la hélice no depende de t: se normaliza una sola muestra por fila y
+    # el resultado es una vista de solo lectura con la forma de T
+    curvatura = np.reshape(curvatura_helice(r, b), np.shape(T)[:-1] + (1,))
+    V = np.max(_compacta(T), axis=-1, keepdims=True) * _normalizar(curvatura)**2
+    return np.broadcast_to(V, np.shape(T))
+
+
+@perfilar
+def lagrangiano_estructural(masa, r, b, omega, t, fase=0.0):
+    """T, V y L con V basada en la curvatura de Frenet de la trayectoria."""
+    (vx, vy, vz), _, _ = derivadas_helice(omega * t, r, b, fase, omega)
+    T = 0.5 * masa * (vx**2 + vy**2 + vz**2)
+    V = np.array(_potencial_curvatura(T, r, b))
+    return T, V, T - V
+
+
+@perfilar
+def calcular_derivadas(r, b, omega, t=T_D, masa=MASA_D):
+    """T, V, L junto con la velocidad y la aceleración analíticas de la hélice."""
+    (dx, dy, dz), (ddx, ddy, ddz), _ = derivadas_helice(omega * t, r, b, omega=omega)
+    T = 0.5 * masa * (dx**2 + dy**2 + dz**2)
+    V = np.array(_potencial_curvatura(T, r, b))
+    L = T - V
+    return T, V, L, dx, dy, dz, ddx, ddy, ddz
+
+
+# Temporales de tamaño (filas, len(t)) que mantiene vivos un bloque del barrido
+_TEMPORALES_BARRIDO = 8
+
+_RESUMEN = ('accion', 'T_min', 'T_max', 'V_min', 'V_max', 'L_min', 'L_max')
+
+
+@perfilar
+def barrido_lagrangiano(r, b, omega, masa=MASA_D, t=T_D, memoria=256 * 2**20, curvas=False):
+    """T, V y L de `calcular_derivadas` sobre rejillas completas de parámetros.
+
+    `r`, `b`, `omega` y `masa` se combinan por broadcasting (por ejemplo,
+    con `np.meshgrid` o `np.ix_`) en una forma común P. Los puntos se
+    evalúan en bloques vectorizados cuyo consumo de temporales no supera
+    `memoria` bytes.
+
+    Devuelve un diccionario con la acción 'accion' = ∫L dt (regla del
+    trapecio) y los extremos 'T_min', 'T_max', 'V_min', 'V_max', 'L_min',
+    'L_max', todos de forma P. Con `curvas=True` incluye también 'T', 'V'
+    y 'L' completos, de forma P + (len(t),).
+    """
+    t = np.asarray(t, dtype=float)
+    r, b, omega, masa = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                              for x in (r, b, omega, masa)))
+    forma = r.shape
+    r, b, omega, masa = (x.ravel() for x in (r, b, omega, masa))
+    n, nt = r.size, t.size
+
+    # Pesos de la regla del trapecio: la acción es un producto matriz-vector
+    dt = np.diff(t)
+    pesos = np.zeros(nt)
+    pesos[:-1] += dt / 2
+    pesos[1:] += dt / 2
+
+    resultado = {clave: np.empty(n) for clave in _RESUMEN}
+    if curvas:
+        resultado.update((clave, np.empty((n, nt))) for clave in 'TVL')
+    filas = max(1, int(memoria // (_TEMPORALES_BARRIDO * nt * 8)))
+    for inicio in range(0, n, filas):
+        bloque = slice(inicio, inicio + filas)
+        rb, bb, wb, mb = (x[bloque, None] for x in (r, b, omega, masa))
+        # |v|² = ω²(r² + b²) en toda la hélice: T no necesita senos ni cosenos
+        T = np.broadcast_to(0.5 * mb * wb**2 * (rb**2 + bb**2), (rb.shape[0], nt))
+        # Las curvas constantes en t se reducen a una muestra por fila
+        T, V = _compacta(T), _compacta(_potencial_curvatura(T, rb, bb))
+        L = T - V
+        resultado['accion'][bloque] = L @ pesos if L.shape[-1] == nt else L[:, 0] * pesos.sum()
+        for nombre, valores in (('T', T), ('V', V), ('L', L)):
+            resultado[nombre + '_min'][bloque] = valores.min(axis=-1)
+            resultado[nombre + '_max'][bloque] = valores.max(axis=-1)
+            if curvas:
+                resultado[nombre][bloque] = valores
+    for clave, valores in resultado.items():
+        resultado[clave] = valores.reshape(forma + valores.shape[1:])
+    return resultado
@@ -0,0 +1,119 @@
+"""Memoria LRU para trayectorias y acoplamientos.
+
+Las claves se forman con los argumentos cuantizados a una tolerancia
+relativa: valores que difieren menos que ella (lo habitual al arrastrar
+un slider o al repetir un barrido) reutilizan el mismo resultado. La
+tolerancia es relativa porque los parámetros van de radianes a metros
+del orden de 1e-12.
+"""
+from collections import OrderedDict
+from functools import wraps
+import math
+
+import numpy as np
+
+
+def cuantizar(valor, tolerancia=1e-9):
+    """Clave hashable de `valor` con los números redondeados a `tolerancia` relativa.
+
+    Admite números, cadenas, None, arreglos de numpy y tuplas, listas o
+    diccionarios de ellos.
+    """
+    if valor is None or isinstance(valor, (bool, str, bytes)):
+        return valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        valor = float(valor)
+        if not math.isfinite(valor):
+            return valor
+        mantisa, exponente = math.frexp(valor)
+        return round(mantisa / tolerancia), exponente
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.kind == 'f':
+            mantisa, exponente = np.frexp(valor)
+            datos = np.round(mantisa / tolerancia).tobytes() + exponente.tobytes()
+        else:
+            datos = valor.tobytes()
+        return valor.shape, valor.dtype.str, datos
+    if isinstance(valor, (tuple, list)):
+        return tuple(cuantizar(v, tolerancia) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((k, cuantizar(v, tolerancia)) for k, v in valor.items()))
+    raise TypeError(f"no se puede cuantizar un {type(valor).__name__}")
+
+
+def _congelar(resultado):
+    # Los resultados se comparten entre llamadas: nadie debe modificarlos
+    if isinstance(resultado, np.ndarray):
+        resultado.setflags(write=False)
+    elif isinstance(resultado, (tuple, list)):
+        for elemento in resultado:
+            _congelar(elemento)
+    elif isinstance(resultado, dict):
+        _congelar(list(resultado.values()))
+    return resultado
+
+
+class CacheLRU:
+    """Caché acotada que desaloja la entrada usada hace más tiempo.
+
+    `aciertos` y `fallos` cuentan las consultas desde la creación o desde
+    el último `limpiar()`.
+    """
+
+    def __init__(self, max_entradas=128):
+        if max_entradas < 1:
+            raise ValueError(f"max_entradas debe ser positivo, no {max_entradas}")
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, clave, calcular):
+        """Valor guardado bajo `clave`, o `calcular()` si no está."""
+        try:
+            valor = self._entradas[clave]
+        except KeyError:
+            self.fallos += 1
+            valor = self._entradas[clave] = calcular()
+            if len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+            return valor
+        self.aciertos += 1
+        self._entradas.move_to_end(clave)
+        return valor
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.aciertos = self.fallos = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'entradas': len(self._entradas),
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+        }
+
+
+def memorizar(funcion=None, *, tolerancia=1e-9, max_entradas=128):
+    """Envuelve `funcion` con una `CacheLRU` indexada por sus argumentos cuantizados.
+
+    Se usa como `memorizar(f)` o como decorador `@memorizar(tolerancia=1e-6)`.
+    Los arreglos devueltos quedan de solo lectura, porque se comparten
+    entre llamadas. La caché queda accesible en el atributo `cache`.
+    """
+    if funcion is None:
+        return lambda f: memorizar(f, tolerancia=tolerancia, max_entradas=max_entradas)
+    cache = CacheLRU(max_entradas)
+
+    @wraps(funcion)
+    def memorizada(*args, **kwargs):
+        clave = (cuantizar(args, tolerancia), cuantizar(kwargs, tolerancia))
+        return cache.obtener(clave, lambda: _congelar(funcion(*args, **kwargs)))
+
+    memorizada.cache = cache
+    return memorizada
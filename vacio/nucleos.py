@@ -0,0 +1,266 @@
+"""Núcleos de cálculo intensivo con un backend compilado opcional (Numba).
+
+Cuatro operaciones concentran el tiempo de los conjuntos grandes: generar
+hélices proyectivas, buscar la mínima distancia entre pares de curvas
+(muestras del mismo índice), el acoplamiento por índice de pares de
+hélices sin generarlas y la curvatura de Frenet. Cada una tiene aquí
+una versión numpy, que es la de referencia, y otra compilada con
+`numba.njit` que recorre los datos en una sola pasada, sin temporales
+intermedios y repartida entre núcleos.
+
+Numba es opcional y el backend por defecto es numpy. Se elige en tiempo
+de ejecución con `usar_backend('numba' | 'numpy' | 'auto')` o, al
+importar, con la variable de entorno VACIO_BACKEND; al activar Numba se
+comprueba contra numpy con `verificar('numba')` antes de usarlo.
+"""
+import os
+
+import numpy as np
+
+from .acoplamiento import acoplamientos_indice as _acoplamientos_numpy
+from .geometria import curvatura
+from .trayectorias import helices_proyectivas
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numpy', 'numba')
+
+# Error relativo que admite `usar_backend` al verificar Numba (float64)
+_TOLERANCIA = 1e-9
+
+
+def _distancia_minima_numpy(curvas1, curvas2, chunk=4096):
+    m = len(curvas1)
+    indices = np.empty(m, dtype=np.intp)
+    distancias = np.empty(m)
+    for inicio in range(0, m, chunk):
+        d2 = ((curvas1[inicio:inicio + chunk] - curvas2[inicio:inicio + chunk])**2).sum(-1)
+        k = np.argmin(d2, axis=1)
+        indices[inicio:inicio + chunk] = k
+        distancias[inicio:inicio + chunk] = np.sqrt(d2[np.arange(len(k)), k])
+    return indices, distancias
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _helices_numba(params, theta, salida):
+        # theta vacío: cada hélice recorre su propio eje de S giros, como
+        # np.linspace(0, 2πS, n)
+        n = salida.shape[1]
+        for k in numba.prange(params.shape[0]):
+            radio = np.cos(params[k, 0])
+            fin = params[k, 1] * 2 * np.pi
+            paso = fin / (n - 1) if n > 1 else 0.0
+            for i in range(n):
+                if theta.shape[0]:
+                    t = theta[i]
+                elif i == n - 1:
+                    t = fin
+                else:
+                    t = i * paso
+                salida[k, i, 0] = radio * np.cos(t + params[k, 2])
+                salida[k, i, 1] = radio * np.sin(t + params[k, 2])
+                salida[k, i, 2] = params[k, 3] * t
+
+    @numba.njit(parallel=True, cache=True)
+    def _distancia_minima_numba(curvas1, curvas2, indices, distancias):
+        for k in numba.prange(curvas1.shape[0]):
+            mejor = np.inf
+            indice = 0
+            for i in range(curvas1.shape[1]):
+                dx = curvas1[k, i, 0] - curvas2[k, i, 0]
+                dy = curvas1[k, i, 1] - curvas2[k, i, 1]
+                dz = curvas1[k, i, 2] - curvas2[k, i, 2]
+                d2 = dx * dx + dy * dy + dz * dz
+                if d2 < mejor:
+                    mejor = d2
+                    indice = i
+            indices[k] = indice
+            distancias[k] = np.sqrt(mejor)
+
+    @numba.njit(parallel=True, cache=True)
+    def _acoplamientos_numba(helices1, helices2, theta, indices, distancias, puntos):
+        # Forma cerrada de `acoplamiento.acoplamientos_indice`, par a par
+        n = theta.shape[0]
+        for k in numba.prange(helices1.shape[0]):
+            r1, f1, p1, z1 = helices1[k, 0], helices1[k, 1], helices1[k, 2], helices1[k, 3]
+            r2, f2, p2, z2 = helices2[k, 0], helices2[k, 1], helices2[k, 2], helices2[k, 3]
+            dp = p1 - p2
+            dz = z1 - z2
+            seno = np.sin((f1 - f2) / 2)
+            plano2 = (r1 - r2)**2 + 4 * r1 * r2 * seno * seno
+            derecha = np.searchsorted(theta, -dz / dp) if dp != 0 else 0
+            derecha = min(derecha, n - 1)
+            izquierda = max(derecha - 1, 0)
+            altura_izq = (dp * theta[izquierda] + dz)**2
+            altura_der = (dp * theta[derecha] + dz)**2
+            if altura_izq <= altura_der:
+                indice, altura = izquierda, altura_izq
+            else:
+                indice, altura = derecha, altura_der
+            t = theta[indice]
+            indices[k] = indice
+            distancias[k] = np.sqrt(plano2 + altura)
+            puntos[k, 0] = (r1 * np.cos(t + f1) + r2 * np.cos(t + f2)) / 2
+            puntos[k, 1] = (r1 * np.sin(t + f1) + r2 * np.sin(t + f2)) / 2
+            puntos[k, 2] = ((p1 + p2) * t + z1 + z2) / 2
+
+    @numba.njit(parallel=True, cache=True)
+    def _curvatura_numba(vx, vy, vz, ax, ay, az, salida):
+        for i in numba.prange(salida.shape[0]):
+            cx = vy[i] * az[i] - vz[i] * ay[i]
+            cy = vz[i] * ax[i] - vx[i] * az[i]
+            cz = vx[i] * ay[i] - vy[i] * ax[i]
+            rapidez = np.sqrt(vx[i] * vx[i] + vy[i] * vy[i] + vz[i] * vz[i])
+            den = rapidez * rapidez * rapidez
+            salida[i] = np.sqrt(cx * cx + cy * cy + cz * cz) / den if den > 0 else 0.0
+
+
+def usar_backend(nombre='auto', verificar_numba=True):
+    """Elige el backend ('numpy', 'numba' o 'auto') y lo devuelve.
+
+    'auto' usa Numba si está instalado. Al elegir Numba se comprueban sus
+    núcleos con `verificar('numba')` y, si no coinciden con numpy, se lanza
+    RuntimeError y se sigue con el backend anterior.
+    """
+    global _backend
+    if nombre == 'auto':
+        nombre = 'numba' if numba is not None else 'numpy'
+    if nombre not in BACKENDS:
+        raise ValueError(f"backend desconocido: {nombre!r} (use {', '.join(BACKENDS)} o auto)")
+    if nombre == 'numba':
+        if numba is None:
+            raise ImportError("el backend 'numba' requiere el paquete numba")
+        if verificar_numba:
+            errores = verificar('numba')
+            if any(error > _TOLERANCIA for error in errores.values()):
+                raise RuntimeError(f"los núcleos de Numba no coinciden con numpy: {errores}")
+    _backend = nombre
+    return nombre
+
+
+def backend():
+    """Backend en uso: 'numpy' o 'numba'."""
+    return _backend
+
+
+def helices(params, n=1000, theta=None, dtype=np.float64):
+    """Hélices proyectivas (N, n, 3) de un arreglo (N, 4) de (A, S, W, B).
+
+    Mismo resultado que `helices_proyectivas`.
+    """
+    if _backend == 'numpy':
+        return helices_proyectivas(params, n, theta=theta, dtype=dtype)
+    params = np.asarray(params, dtype=float)
+    if params.ndim != 2 or params.shape[1] != 4:
+        raise ValueError(f"params debe tener forma (N, 4), no {params.shape}")
+    theta = np.empty(0) if theta is None else np.asarray(theta, dtype=float)
+    salida = np.empty((len(params), len(theta) or n, 3), dtype=dtype)
+    _helices_numba(params, theta, salida)
+    return salida
+
+
+def distancia_minima(curvas1, curvas2):
+    """Mínima distancia entre muestras del mismo índice de M pares de curvas.
+
+    `curvas1` y `curvas2` son arreglos (M, n, 3). Devuelve `(indices,
+    distancias)`, de forma (M,), como `acoplamiento_indice` par a par.
+    """
+    curvas1, curvas2 = np.asarray(curvas1), np.asarray(curvas2)
+    if curvas1.shape != curvas2.shape or curvas1.ndim != 3 or curvas1.shape[2] != 3:
+        raise ValueError(f"se esperaban dos arreglos (M, n, 3) iguales, no "
+                         f"{curvas1.shape} y {curvas2.shape}")
+    if _backend == 'numpy':
+        return _distancia_minima_numpy(curvas1, curvas2)
+    indices = np.empty(len(curvas1), dtype=np.intp)
+    distancias = np.empty(len(curvas1))
+    _distancia_minima_numba(curvas1, curvas2, indices, distancias)
+    return indices, distancias
+
+
+def acoplamientos_indice(helices1, helices2, theta):
+    """Acoplamiento por índice de M pares de hélices sobre el eje `theta`.
+
+    Mismo resultado que `acoplamiento.acoplamientos_indice`: `(indices,
+    distancias, puntos)` de formas (M,), (M,) y (M, 3).
+    """
+    if _backend == 'numpy':
+        return _acoplamientos_numpy(helices1, helices2, theta)
+    helices1 = np.ascontiguousarray(np.asarray(helices1, dtype=float)[:, :4])
+    helices2 = np.ascontiguousarray(np.asarray(helices2, dtype=float)[:, :4])
+    theta = np.asarray(theta, dtype=float)
+    m = len(helices1)
+    indices = np.empty(m, dtype=np.intp)
+    distancias = np.empty(m)
+    puntos = np.empty((m, 3))
+    _acoplamientos_numba(helices1, helices2, theta, indices, distancias, puntos)
+    return indices, distancias, puntos
+
+
+def curvatura_frenet(v, a):
+    """Curvatura de Frenet |v × a| / |v|³ a partir de tuplas (x, y, z).
+
+    Mismo resultado que `geometria.curvatura`.
+    """
+    if _backend == 'numpy':
+        return curvatura(v, a)
+    forma = np.broadcast_shapes(*(np.shape(c) for c in (*v, *a)))
+    componentes = [np.broadcast_to(np.asarray(c, dtype=float), forma).reshape(-1)
+                   for c in (*v, *a)]
+    salida = np.empty(int(np.prod(forma)))
+    _curvatura_numba(*componentes, salida)
+    return salida.reshape(forma)
+
+
+def verificar(backend=None, n_curvas=64, n=257, seed=0):
+    """Máximo error relativo de cada núcleo de `backend` frente a numpy.
+
+    Por defecto se comprueba el backend actual; con 'numpy' todos los
+    errores son 0. Los índices de `distancia_minima` y de
+    `acoplamientos_indice` se comparan a través de sus distancias, porque
+    dos muestras casi empatadas pueden intercambiarse.
+    """
+    backend = backend or _backend
+    if backend not in BACKENDS:
+        raise ValueError(f"backend desconocido: {backend!r} (use {', '.join(BACKENDS)})")
+    rng = np.random.default_rng(seed)
+    params = np.column_stack([
+        rng.uniform(0.1, 1.5, n_curvas), rng.uniform(1, 4, n_curvas),
+        rng.uniform(0, 2 * np.pi, n_curvas), rng.uniform(0.1, 0.35, n_curvas)])
+    theta = np.linspace(0, 4 * np.pi, n)
+    radios = np.column_stack([np.cos(params[:, 0]), params[:, 2], params[:, 3],
+                              rng.uniform(-1, 1, n_curvas)])
+    t = rng.uniform(0, 10, n)
+    v = (np.cos(t), np.sin(2 * t), np.full(n, 0.3))
+    a = (-np.sin(t), 2 * np.cos(2 * t), np.zeros(n))
+
+    def calcular(nombre):
+        global _backend
+        anterior, _backend = _backend, nombre
+        try:
+            curvas = helices(params, n)
+            comunes = helices(params, theta=theta)
+            _, distancias = distancia_minima(comunes[::2], comunes[1::2])
+            _, acopladas, puntos = acoplamientos_indice(radios[::2], radios[1::2], theta)
+            return {'helices': curvas, 'helices_theta': comunes,
+                    'distancia_minima': distancias, 'acoplamientos_distancia': acopladas,
+                    'acoplamientos_punto': puntos, 'curvatura': curvatura_frenet(v, a)}
+        finally:
+            _backend = anterior
+
+    actual = calcular(backend)
+    referencia = calcular('numpy')
+
+    def error(x, y):
+        escala = max(np.abs(y).max(), np.finfo(float).tiny)
+        return float(np.abs(x - y).max() / escala)
+
+    return {nombre: error(actual[nombre], referencia[nombre]) for nombre in actual}
+
+
+_backend = 'numpy'
+if os.environ.get('VACIO_BACKEND'):
+    usar_backend(os.environ['VACIO_BACKEND'])
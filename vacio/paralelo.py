@@ -0,0 +1,121 @@
+"""Generación de conjuntos grandes de partículas en varios procesos.
+
+La población se divide en bloques fijos de partículas que se reparten
+entre los procesos de un `ProcessPoolExecutor`. Cada bloque escribe sus
+parámetros y trayectorias directamente en memoria compartida, así que
+nada vuelve a este proceso serializado; con `directorio` escriben en un
+`AlmacenTrayectorias` en disco. El generador de cada bloque sale de
+`np.random.SeedSequence(seed).spawn(...)`: el resultado depende solo de
+`seed` y del tamaño de bloque, no del número de procesos.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from .almacen import AlmacenTrayectorias
+from .trayectorias import helices_proyectivas, parametros_aleatorios
+
+
+class ConjuntoCompartido:
+    """Parámetros (N, 4) y trayectorias (N, n, 3) en un bloque de memoria compartida.
+
+    Los arreglos `params` y `trayectorias` son vistas de esa memoria:
+    antes de `cerrar()` hay que soltar las vistas derivadas de ellos y
+    copiar lo que haga falta conservar. Se usa como gestor de contexto.
+    """
+
+    def __init__(self, n_particulas, n_puntos, dtype=np.float32, nombre=None):
+        self.dtype = np.dtype(dtype)
+        self.forma = (n_particulas, n_puntos)
+        bytes_params = n_particulas * 4 * 8
+        tamano = bytes_params + n_particulas * n_puntos * 3 * self.dtype.itemsize
+        self._propio = nombre is None
+        if self._propio:
+            self._memoria = shared_memory.SharedMemory(create=True, size=max(tamano, 1))
+        else:
+            self._memoria = shared_memory.SharedMemory(name=nombre)
+        self.params = np.ndarray((n_particulas, 4), dtype=np.float64,
+                                 buffer=self._memoria.buf)
+        self.trayectorias = np.ndarray((n_particulas, n_puntos, 3), dtype=self.dtype,
+                                       buffer=self._memoria.buf, offset=bytes_params)
+
+    @property
+    def nombre(self):
+        return self._memoria.name
+
+    def cerrar(self):
+        """Suelta las vistas y libera la memoria (si este objeto la creó)."""
+        self.params = self.trayectorias = None
+        self._memoria.close()
+        if self._propio:
+            self._memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def _escribir_bloque(conjunto, inicio, fin, semilla, rangos):
+    # Sortea y escribe las partículas [inicio, fin) del conjunto
+    params = parametros_aleatorios(fin - inicio, np.random.default_rng(semilla), **rangos)
+    conjunto.params[inicio:fin] = params
+    helices_proyectivas(params, n=conjunto.forma[1], dtype=conjunto.dtype,
+                        out=conjunto.trayectorias[inicio:fin])
+
+
+def _generar_bloque(abrir, destino, inicio, fin, semilla, rangos):
+    # Se ejecuta en cada proceso: `abrir(*destino)` se adjunta a la memoria
+    # compartida o al almacén del conjunto
+    conjunto = abrir(*destino)
+    try:
+        _escribir_bloque(conjunto, inicio, fin, semilla, rangos)
+    finally:
+        conjunto.cerrar()
+    return fin - inicio
+
+
+def generar_conjunto(n, seed=42, n_puntos=1000, procesos=None, bloque=4096,
+                     dtype=np.float32, directorio=None, **rangos):
+    """`n` partículas aleatorias con sus hélices proyectivas, en paralelo.
+
+    Los parámetros se sortean como en `parametros_aleatorios` (admite los
+    mismos `rango_*`), pero con un generador por bloque de `bloque`
+    partículas derivado de `seed`. `procesos=1` trabaja en este mismo
+    proceso; por defecto se usan todos los núcleos. Devuelve un
+    `ConjuntoCompartido` que hay que cerrar o, con `directorio`, el
+    `AlmacenTrayectorias` creado allí (para poblaciones que no caben en
+    memoria).
+    """
+    procesos = procesos or os.cpu_count()
+    if directorio is None:
+        conjunto = ConjuntoCompartido(n, n_puntos, dtype)
+        abrir = ConjuntoCompartido
+        destino = (n, n_puntos, conjunto.dtype.str, conjunto.nombre)
+    else:
+        conjunto = AlmacenTrayectorias.crear(directorio, n, n_puntos, dtype, seed=seed,
+                                             bloque=bloque, rangos=rangos)
+        abrir = AlmacenTrayectorias.abrir
+        destino = (directorio, 'r+')
+    inicios = range(0, n, bloque)
+    semillas = np.random.SeedSequence(seed).spawn(len(inicios))
+    tareas = [(inicio, min(inicio + bloque, n), semilla, rangos)
+              for inicio, semilla in zip(inicios, semillas)]
+    try:
+        if procesos <= 1 or len(tareas) <= 1:
+            for tarea in tareas:
+                _escribir_bloque(conjunto, *tarea)
+        else:
+            with ProcessPoolExecutor(min(procesos, len(tareas))) as pool:
+                futuros = [pool.submit(_generar_bloque, abrir, destino, *tarea)
+                           for tarea in tareas]
+                # result() propaga la primera excepción de cualquier bloque
+                for futuro in futuros:
+                    futuro.result()
+    except BaseException:
+        conjunto.cerrar()
+        raise
+    return conjunto
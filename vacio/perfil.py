@@ -0,0 +1,175 @@
+"""Instrumentación opcional por etapas: tiempo, llamadas y memoria máxima.
+
+Las funciones marcadas con `@perfilar` y los bloques `with seccion(nombre)`
+se registran solo mientras el perfil está activo (`activar()`); apagado,
+cada llamada cuesta una comprobación de un booleano. De cada etapa se
+acumulan las llamadas, el tiempo total, el propio (sin las etapas
+anidadas) y el máximo de una llamada; con `activar(memoria=True)` también
+el pico de memoria reservada durante la etapa, medido con `tracemalloc`
+(que incluye los arreglos de numpy, pero ralentiza todo el programa).
+
+`resumen()` da la tabla de etapas y `guardar_traza(ruta)` escribe cada
+llamada en el formato de trazas de Chrome (chrome://tracing, Perfetto).
+El registro es por proceso: `registro()` lo devuelve serializable y
+`combinar()` suma el de otro proceso al de este.
+"""
+from contextlib import nullcontext
+from functools import wraps
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_activo = False
+_memoria = False
+# tracemalloc lo arrancó `activar` (y lo detiene `desactivar`)
+_tracemalloc_propio = False
+# nombre -> [llamadas, total, propio, máximo (ns), memoria máxima (bytes)]
+_estadisticas = {}
+# Llamadas completas: (nombre, pid, tid, inicio, duración (ns), memoria)
+_eventos = []
+# Secciones abiertas: [inicio (ns), ns en hijas, memoria inicial, pico de hijas]
+_pila = []
+_NULA = nullcontext()
+
+
+def activar(memoria=False):
+    """Empieza a registrar; con `memoria` también el pico de cada etapa."""
+    global _activo, _memoria, _tracemalloc_propio
+    _memoria = memoria
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_propio = True
+    _activo = True
+
+
+def desactivar():
+    """Deja de registrar; lo acumulado se conserva hasta `reiniciar()`."""
+    global _activo, _memoria, _tracemalloc_propio
+    _activo = _memoria = False
+    if _tracemalloc_propio:
+        tracemalloc.stop()
+        _tracemalloc_propio = False
+
+
+def activo():
+    return _activo
+
+
+def reiniciar():
+    """Borra las estadísticas y los eventos registrados."""
+    _estadisticas.clear()
+    _eventos.clear()
+
+
+class _Seccion:
+    __slots__ = ('nombre',)
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        base = 0
+        if _memoria:
+            base, pico = tracemalloc.get_traced_memory()
+            # El pico de la sección que la contiene se pierde al reiniciarlo
+            if _pila:
+                _pila[-1][3] = max(_pila[-1][3], pico)
+            tracemalloc.reset_peak()
+        _pila.append([time.perf_counter_ns(), 0, base, 0])
+        return self
+
+    def __exit__(self, *excepcion):
+        fin = time.perf_counter_ns()
+        inicio, hijas, base, pico_hijas = _pila.pop()
+        duracion = fin - inicio
+        memoria = 0
+        if _memoria:
+            pico = max(tracemalloc.get_traced_memory()[1], pico_hijas)
+            memoria = max(pico - base, 0)
+            if _pila:
+                _pila[-1][3] = max(_pila[-1][3], pico)
+        if _pila:
+            _pila[-1][1] += duracion
+
+        datos = _estadisticas.get(self.nombre)
+        if datos is None:
+            datos = _estadisticas[self.nombre] = [0, 0, 0, 0, 0]
+        datos[0] += 1
+        datos[1] += duracion
+        datos[2] += duracion - hijas
+        datos[3] = max(datos[3], duracion)
+        datos[4] = max(datos[4], memoria)
+        _eventos.append((self.nombre, os.getpid(), threading.get_ident(), inicio, duracion, memoria))
+        return False
+
+
+def seccion(nombre):
+    """Gestor de contexto que registra el bloque como la etapa `nombre`."""
+    return _Seccion(nombre) if _activo else _NULA
+
+
+def perfilar(nombre=None):
+    """Decorador que registra cada llamada a la función como una etapa.
+
+    Se usa como `@perfilar` (la etapa se llama `módulo.función`) o como
+    `@perfilar('nombre')`.
+    """
+    if callable(nombre):
+        return perfilar()(nombre)
+
+    def decorar(funcion):
+        etiqueta = nombre or f"{funcion.__module__.rpartition('.')[2]}.{funcion.__qualname__}"
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            with _Seccion(etiqueta):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorar
+
+
+def registro():
+    """Estadísticas y eventos de este proceso, listos para enviarse a otro."""
+    return {'estadisticas': {k: list(v) for k, v in _estadisticas.items()},
+            'eventos': list(_eventos)}
+
+
+def combinar(otro):
+    """Suma a este proceso el `registro()` de otro."""
+    for nombre, (llamadas, total, propio, maximo, memoria) in otro['estadisticas'].items():
+        datos = _estadisticas.setdefault(nombre, [0, 0, 0, 0, 0])
+        datos[0] += llamadas
+        datos[1] += total
+        datos[2] += propio
+        datos[3] = max(datos[3], maximo)
+        datos[4] = max(datos[4], memoria)
+    _eventos.extend(tuple(evento) for evento in otro['eventos'])
+
+
+def resumen():
+    """Tabla de etapas ordenada por tiempo propio."""
+    filas = sorted(_estadisticas.items(), key=lambda item: -item[1][2])
+    ancho = max([len(nombre) for nombre in _estadisticas] + [5])
+    lineas = [f"{'etapa':<{ancho}} {'llamadas':>9} {'total (s)':>10} {'propio (s)':>10} "
+              f"{'media (ms)':>10} {'máx (ms)':>10} {'memoria (MB)':>12}"]
+    for nombre, (llamadas, total, propio, maximo, memoria) in filas:
+        memoria = f"{memoria / 2**20:12.1f}" if memoria else f"{'-':>12}"
+        lineas.append(f"{nombre:<{ancho}} {llamadas:>9} {total * 1e-9:10.4f} {propio * 1e-9:10.4f} "
+                      f"{total * 1e-6 / llamadas:10.3f} {maximo * 1e-6:10.3f} {memoria}")
+    return '\n'.join(lineas)
+
+
+def guardar_traza(ruta):
+    """Escribe los eventos registrados como traza de Chrome en `ruta`."""
+    eventos = [{'name': nombre, 'cat': nombre.partition('.')[0], 'ph': 'X',
+                'pid': pid, 'tid': tid, 'ts': inicio / 1000, 'dur': duracion / 1000,
+                'args': {'memoria_MB': memoria / 2**20}}
+               for nombre, pid, tid, inicio, duracion, memoria in _eventos]
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({'traceEvents': eventos, 'displayTimeUnit': 'ms'}, archivo)
@@ -0,0 +1,200 @@
+"""Trayectorias estructurales proyectadas desde ε₀.
+
+Solo depende de numpy: ninguna función de este módulo dibuja ni importa
+matplotlib, de modo que puede usarse en procesos sin pantalla.
+"""
+import numpy as np
+
+from .perfil import perfilar
+
+
+def eje_angular(S, n=1000):
+    """Eje angular que simula el tiempo de proyección (S giros completos)."""
+    return np.linspace(0, S * 2 * np.pi, n)
+
+
+@perfilar
+def helice_proyectiva(theta, A, W, B):
+    """Hélice proyectiva de ángulo de salida A, fase W y torsión B."""
+    x = np.cos(theta + W) * np.cos(A)
+    y = np.sin(theta + W) * np.cos(A)
+    z = B * theta  # torsión vertical
+    return x, y, z
+
+
+@perfilar
+def helices_proyectivas(params, n=1000, theta=None, dtype=np.float64, chunk=4096, out=None):
+    """Lote de hélices proyectivas a partir de un arreglo (N, 4) de (A, S, W, B).
+
+    Devuelve un arreglo (N, n, 3) con las coordenadas x, y, z de cada hélice.
+    Cada hélice recorre su propio eje angular de S giros, salvo que se pase
+    un `theta` común (como en el acoplamiento, donde ambas partículas
+    comparten el mismo eje). `dtype=np.float32` reduce a la mitad la memoria
+    del resultado; las filas se procesan en bloques de `chunk` para acotar
+    los temporales. Con `out` las hélices se escriben en ese arreglo
+    (N, n, 3) en lugar de uno nuevo.
+    """
+    params = np.asarray(params, dtype=dtype)
+    if params.ndim != 2 or params.shape[1] != 4:
+        raise ValueError(f"params debe tener forma (N, 4), no {params.shape}")
+    if theta is not None:
+        theta = np.asarray(theta, dtype=dtype)
+        n = theta.shape[0]
+
+    if out is None:
+        salida = np.empty((params.shape[0], n, 3), dtype=dtype)
+    elif out.shape != (params.shape[0], n, 3):
+        raise ValueError(f"out debe tener forma {(params.shape[0], n, 3)}, no {out.shape}")
+    else:
+        salida = out
+    for inicio in range(0, params.shape[0], chunk):
+        bloque = params[inicio:inicio + chunk]
+        A, S, W, B = (bloque[:, k, None] for k in range(4))
+        if theta is None:
+            theta_b = np.linspace(0, S[:, 0] * 2 * np.pi, n, axis=-1, dtype=dtype)
+        else:
+            theta_b = theta[None, :]
+        fase = theta_b + W
+        cos_A = np.cos(A)
+        out = salida[inicio:inicio + chunk]
+        np.cos(fase, out=out[..., 0])
+        out[..., 0] *= cos_A
+        np.sin(fase, out=out[..., 1])
+        out[..., 1] *= cos_A
+        np.multiply(B, theta_b, out=out[..., 2])  # torsión vertical
+    return salida
+
+
+@perfilar
+def helice_real(theta, r, b, fase=0.0, z0=0.0):
+    """Hélice de radio r y paso b, desfasada y desplazada en Z."""
+    x = r * np.cos(theta + fase)
+    y = r * np.sin(theta + fase)
+    z = b * theta + z0
+    return x, y, z
+
+
+@perfilar
+def rotacion_doble(theta, r, b, subspin, desfase=0.0):
+    """Giro toroidal con un pequeño giro sobre su propio eje (subspin)."""
+    giro = subspin * theta + desfase
+    radio = r + 0.1 * np.cos(giro)
+    x = radio * np.cos(theta)
+    y = radio * np.sin(theta)
+    z = b * theta + 0.05 * np.sin(giro)
+    return x, y, z
+
+
+@perfilar
+def trayectoria_modificada(theta_post, A, W, B, origen):
+    """Traza de una partícula que parte del punto de acoplamiento `origen`.
+
+    Sirve tanto para la modificación de torsión posterior al acoplamiento
+    como para las trayectorias dispersas.
+    """
+    x0, y0, z0 = origen
+    x = np.cos(theta_post + W) * np.cos(A) + x0
+    y = np.sin(theta_post + W) * np.cos(A) + y0
+    z = B * theta_post + z0
+    return x, y, z
+
+
+def parametros_aleatorios(n, seed, rango_A=(10, 80), rango_S=(1, 4),
+                          rango_W=(0, 2 * np.pi), rango_B=(0.1, 0.35)):
+    """Parámetros (A, S, W, B) de `n` partículas, con A en radianes.
+
+    Reproduce exactamente la secuencia de `np.random.seed(seed)` seguida de
+    cuatro `np.random.uniform` por partícula, sin tocar el estado global.
+    `seed` también puede ser un generador ya creado, que se sigue consumiendo
+    en orden (así se sortea una población por bloques).
+    """
+    if isinstance(seed, (np.random.Generator, np.random.RandomState)):
+        rng = seed
+    else:
+        rng = np.random.RandomState(seed)
+    rangos = np.array([rango_A, rango_S, rango_W, rango_B], dtype=float)
+    # Una sola llamada consume la secuencia en el mismo orden fila a fila
+    params = rng.uniform(rangos[:, 0], rangos[:, 1], size=(n, 4))
+    params[:, 0] = np.radians(params[:, 0])
+    return params
+
+
+def parametros_dispersion(num_ramas, seed=123, spin=None, torsion=None):
+    """Parámetros (phi_dir, theta_dir, torsión, spin) de cada rama dispersa.
+
+    `phi_dir` y `theta_dir` son la dirección polar y azimutal de salida,
+    en radianes. Todo se sortea en una sola llamada al generador. Si
+    `spin` y `torsion` se fijan, solo se sortea la dirección (dos valores
+    por rama); si no, cuatro valores por rama. `seed` puede ser un entero,
+    que reproduce exactamente la secuencia de `np.random.seed(seed)` del
+    script original, o un `numpy.random.Generator`.
+    """
+    if isinstance(seed, (np.random.Generator, np.random.RandomState)):
+        rng = seed
+    else:
+        rng = np.random.RandomState(seed)
+    if spin is None or torsion is None:
+        rangos = np.array([(10, 170), (0, 2 * np.pi), (0.15, 0.35), (1, 4)], dtype=float)
+    else:
+        rangos = np.array([(10, 170), (0, 2 * np.pi)], dtype=float)
+    # Una sola llamada consume la secuencia en el mismo orden rama a rama
+    sorteo = rng.uniform(rangos[:, 0], rangos[:, 1], size=(num_ramas, len(rangos)))
+    params = np.empty((num_ramas, 4))
+    params[:, 0] = np.radians(sorteo[:, 0])
+    params[:, 1] = sorteo[:, 1]
+    if len(rangos) == 4:
+        params[:, 2:] = sorteo[:, 2:]
+    else:
+        params[:, 2], params[:, 3] = torsion, spin
+    return params
+
+
+@perfilar
+def ramas_dispersion(theta_vals, params, origen, dtype=np.float64, chunk=4096):
+    """Lote de ramas dispersas desde `origen` como un arreglo (n_ramas, n, 3).
+
+    `params` es el arreglo (n_ramas, 4) de `parametros_dispersion`. La
+    rama i arranca con fase i, como en la figura original. Las ramas se
+    procesan en bloques de `chunk` y se escriben sobre el resultado.
+    """
+    params = np.asarray(params, dtype=float)
+    if params.ndim != 2 or params.shape[1] != 4:
+        raise ValueError(f"params debe tener forma (N, 4), no {params.shape}")
+    theta_vals = np.asarray(theta_vals, dtype=dtype)
+    x0, y0, z0 = origen
+    salida = np.empty((params.shape[0], theta_vals.shape[0], 3), dtype=dtype)
+    for inicio in range(0, params.shape[0], chunk):
+        bloque = params[inicio:inicio + chunk]
+        phi_dir, theta_dir, torsion, spin = (bloque[:, k, None].astype(dtype) for k in range(4))
+        indice = np.arange(inicio, inicio + len(bloque), dtype=dtype)[:, None]
+        # Dirección vectorial de salida proyectiva
+        dir_x = np.sin(phi_dir) * np.cos(theta_dir)
+        dir_y = np.sin(phi_dir) * np.sin(theta_dir)
+        dir_z = np.cos(phi_dir)
+
+        # Trayectorias helicoidales en esas direcciones
+        fase = spin * theta_vals + indice
+        out = salida[inicio:inicio + chunk]
+        np.cos(fase, out=out[..., 0])
+        out[..., 0] *= dir_x
+        out[..., 0] += x0
+        np.sin(fase, out=out[..., 1])
+        out[..., 1] *= dir_y
+        out[..., 1] += y0
+        np.multiply(dir_z * torsion, theta_vals, out=out[..., 2])
+        out[..., 2] += z0
+    return salida
+
+
+def dispersion_toroidal(theta_vals, num_ramas, origen, seed=123,
+                        spin=None, torsion=None):
+    """Ramas helicoidales dispersas en direcciones aleatorias desde `origen`.
+
+    Si `spin` y `torsion` no se fijan, se sortean por rama junto con la
+    dirección (como en la figura estática); si se fijan, solo se sortea la
+    dirección (como en la versión interactiva). Devuelve una lista de
+    tuplas (x, y, z); `ramas_dispersion` da el mismo resultado como un
+    único arreglo.
+    """
+    params = parametros_dispersion(num_ramas, seed, spin, torsion)
+    return [tuple(rama.T) for rama in ramas_dispersion(theta_vals, params, origen)]